@@ -5,41 +5,1350 @@ analytics_report.py - Weekly metrics and insights for newsletter performance
 Usage:
     python analytics_report.py --period=week --output=markdown
     python analytics_report.py --period=month --compare=true
+    python analytics_report.py --period=month --month=2025-03
+    python analytics_report.py --period=quarter
+    python analytics_report.py --period=custom --start=2025-01-01 --end=2025-06-30
+    python analytics_report.py --ingest=exports/events.csv
+    python analytics_report.py --ingest-subscribers=exports/subscribers.csv
+    python analytics_report.py --period=cohort
+    python analytics_report.py --output=parquet --table=issues --file=issues.parquet
+    python analytics_report.py --period=week --fixture=tests/fixtures/metrics_providers/beehiiv.json
 """
 
 import argparse
+import base64
+import contextlib
+import csv
+import hashlib
+import hmac
+import html
 import json
-from datetime import datetime, timedelta
+import logging
+import math
+import os
+import sqlite3
+import time
+import zlib
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+import requests
+
 
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / "data"
 ANALYTICS_FILE = DATA_DIR / "analytics_history.json"
+STORE_SUFFIX = ".db"
+
+# Flat metric columns kept alongside each full JSON record, by (section, field)
+METRIC_COLUMNS = {
+    'subscribers_total': ('subscribers', 'total'),
+    'new_this_week': ('subscribers', 'new_this_week'),
+    'unsubscribed': ('subscribers', 'unsubscribed'),
+    'net_growth': ('subscribers', 'net_growth'),
+    'open_rate': ('engagement', 'open_rate'),
+    'click_through_rate': ('engagement', 'click_through_rate'),
+    'total_opens': ('engagement', 'total_opens'),
+    'total_clicks': ('engagement', 'total_clicks'),
+    'revenue_recurring': ('revenue', 'monthly_recurring'),
+    'revenue_sponsors': ('revenue', 'sponsors'),
+    'revenue_total': ('revenue', 'total'),
+}
+
+# Rolling statistics
+ROLLING_WINDOW = 4
+EWMA_SPAN = 4
+
+PERIOD_FREQUENCIES = {'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+
+PERIOD_TITLES = {
+    'week': 'Weekly',
+    'month': 'Monthly',
+    'quarter': 'Quarterly',
+    'year': 'Yearly',
+    'custom': 'Custom Range',
+    'cohort': 'Cohort Retention',
+}
+
+STORE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    {', '.join(f'{column} REAL' for column in METRIC_COLUMNS)},
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metrics_date ON metrics (date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS rollup_weeks (
+    period TEXT NOT NULL,
+    key TEXT NOT NULL,
+    week TEXT NOT NULL,
+    date TEXT NOT NULL,
+    new_subscribers REAL,
+    unsubscribed REAL,
+    revenue REAL,
+    open_rate REAL,
+    click_through_rate REAL,
+    subscribers_total REAL,
+    PRIMARY KEY (period, key, week)
+);
+CREATE TABLE IF NOT EXISTS rollups (
+    period TEXT NOT NULL,
+    key TEXT NOT NULL,
+    weeks INTEGER NOT NULL,
+    new_subscribers REAL NOT NULL,
+    unsubscribed REAL NOT NULL,
+    revenue REAL NOT NULL,
+    open_rate_sum REAL NOT NULL,
+    open_rate_n INTEGER NOT NULL,
+    ctr_sum REAL NOT NULL,
+    ctr_n INTEGER NOT NULL,
+    first_date TEXT,
+    first_total REAL,
+    first_open_rate REAL,
+    last_date TEXT,
+    last_total REAL,
+    last_open_rate REAL,
+    PRIMARY KEY (period, key)
+);
+CREATE TABLE IF NOT EXISTS issue_days (
+    issue TEXT NOT NULL,
+    day TEXT NOT NULL,
+    opens INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    read_seconds REAL NOT NULL,
+    reads INTEGER NOT NULL,
+    PRIMARY KEY (issue, day)
+);
+CREATE INDEX IF NOT EXISTS issue_days_day ON issue_days (day);
+CREATE TABLE IF NOT EXISTS issue_links (
+    issue TEXT NOT NULL,
+    day TEXT NOT NULL,
+    url TEXT NOT NULL,
+    clicks INTEGER NOT NULL,
+    PRIMARY KEY (issue, day, url)
+);
+CREATE INDEX IF NOT EXISTS issue_links_day ON issue_links (day);
+CREATE TABLE IF NOT EXISTS reader_sketches (
+    issue TEXT NOT NULL,
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    registers BLOB NOT NULL,
+    PRIMARY KEY (issue, day, kind)
+);
+CREATE INDEX IF NOT EXISTS reader_sketches_day ON reader_sketches (kind, day);
+CREATE TABLE IF NOT EXISTS subscribers (
+    subscriber TEXT PRIMARY KEY,
+    first_joined REAL,
+    last_joined REAL,
+    last_left REAL
+);
+CREATE TABLE IF NOT EXISTS cohort_exits (
+    cohort INTEGER NOT NULL,
+    exit INTEGER NOT NULL,
+    subscribers INTEGER NOT NULL,
+    PRIMARY KEY (cohort, exit)
+);
+CREATE TABLE IF NOT EXISTS event_imports (
+    digest TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    events INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS report_cache (
+    period TEXT NOT NULL,
+    range TEXT NOT NULL,
+    output TEXT NOT NULL,
+    data_version TEXT NOT NULL,
+    render_version TEXT NOT NULL,
+    rendered TEXT NOT NULL,
+    PRIMARY KEY (period, range, output)
+);
+CREATE TABLE IF NOT EXISTS provider_cache (
+    name TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+STORE_SCHEMA_VERSION = '1'
+
+# Raw engagement event exports: columns read, required columns, rows per chunk
+EVENT_FIELDS = ['type', 'issue', 'timestamp', 'url', 'read_seconds', 'subscriber']
+EVENT_REQUIRED = ('type', 'issue', 'timestamp')
+# Identifier columns, read as text so "12" never turns into "12.0" beside a blank
+EVENT_KEY_FIELDS = ('issue', 'url', 'subscriber')
+EVENT_CHUNK_ROWS = 100_000
+
+# Subscriber lifecycle exports (all required), cohorts shown by default,
+# exit week recorded for subscribers still subscribed, and ids per SQL IN query
+SUBSCRIBER_EVENT_FIELDS = ['type', 'subscriber', 'timestamp']
+COHORT_WEEKS = 12
+COHORT_ACTIVE = -1
+SQL_BATCH = 500
+
+# HyperLogLog unique-reader sketches: 2**14 registers, ~0.8% standard error
+HLL_PRECISION = 14
+HLL_REGISTERS = 1 << HLL_PRECISION
+# Decoded sketches held during an import before writing back (16 KB each, 32 MB at most)
+HLL_PENDING_LIMIT = 2048
+
+# Bump to invalidate cached report renders when their format changes
+REPORT_RENDER_VERSION = '1'
+# Appended to the **Generated:** line of a markdown render served from cache
+CACHED_NOTE = " (cached: no new data since)"
+
+# Tables streamed by the CSV/HTML/Parquet exporters:
+# name -> (store table, date column, [(column, Arrow type)])
+EXPORT_TABLES = {
+    'metrics': (
+        'metrics', 'date', [('date', 'string')] + [(column, 'float64') for column in METRIC_COLUMNS]
+    ),
+    'issues': (
+        'issue_days', 'day', [
+            ('issue', 'string'), ('day', 'string'), ('opens', 'int64'), ('clicks', 'int64'),
+            ('read_seconds', 'float64'), ('reads', 'int64'),
+        ]
+    ),
+}
+EXPORT_BATCH_ROWS = 10_000
+
+# Metrics providers: seconds per fetch, and seconds a cached payload is fresh
+PROVIDER_TIMEOUT = 10
+PROVIDER_CACHE_TTL = 15 * 60
+# Failures a provider can cause (network, HTTP status, unexpected payloads);
+# anything else is a bug and is logged with its traceback
+PROVIDER_ERRORS = (requests.RequestException, KeyError, TypeError, ValueError)
+
+# Calendar rollups kept up to date on every append
+ROLLUP_PERIODS = ('month', 'quarter', 'year')
+# Per-week contribution to a rollup: rollup_weeks column -> metric column
+ROLLUP_FIELDS = {
+    'new_subscribers': 'new_this_week',
+    'unsubscribed': 'unsubscribed',
+    'revenue': 'revenue_total',
+    'open_rate': 'open_rate',
+    'click_through_rate': 'click_through_rate',
+    'subscribers_total': 'subscribers_total',
+}
+
+logger = logging.getLogger("analytics_report")
+
+
+def analytics_store_path():
+    """Time-series store location for ANALYTICS_FILE (stored alongside it)"""
+    return Path(ANALYTICS_FILE).with_suffix(STORE_SUFFIX)
+
+
+def _get_meta(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def _bump_data_version(conn):
+    """Advance the data version that keys cached report renders, dropping stale renders"""
+    conn.execute(
+        """
+        INSERT INTO meta (key, value) VALUES ('data_version', '1')
+        ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+        """
+    )
+    conn.execute(
+        """
+        DELETE FROM report_cache
+        WHERE data_version != (SELECT value FROM meta WHERE key = 'data_version')
+            OR render_version != ?
+        """,
+        (REPORT_RENDER_VERSION,)
+    )
+
+
+def _metric_values(record):
+    """Flat metric column values of a record, None where missing"""
+    return {
+        column: record.get(section, {}).get(field)
+        for column, (section, field) in METRIC_COLUMNS.items()
+    }
+
+
+def rollup_key(period, when):
+    """
+    Rollup bucket for a date
+
+    Args:
+        period (str): 'month', 'quarter' or 'year'
+        when (datetime): Record date
+
+    Returns:
+        str: '2025-03', '2025-Q1' or '2025'
+    """
+    if period == 'month':
+        return f"{when.year}-{when.month:02d}"
+    if period == 'quarter':
+        return f"{when.year}-Q{(when.month - 1) // 3 + 1}"
+    return str(when.year)
+
+
+def _update_rollups(conn, date, values):
+    """
+    Fold one record into the month, quarter and year rollups
+
+    Rollups count the latest record of each calendar week inside the
+    period, like one_per_week(). A later record in an already counted week
+    replaces that week's contribution; an earlier one is ignored.
+    """
+    try:
+        when = datetime.fromisoformat(date)
+    except (TypeError, ValueError):
+        return
+
+    week = (when.date() - timedelta(days=when.weekday())).isoformat()
+    new = {column: values[metric] for column, metric in ROLLUP_FIELDS.items()}
+
+    for period in ROLLUP_PERIODS:
+        key = rollup_key(period, when)
+        old = conn.execute(
+            f"SELECT date, {', '.join(ROLLUP_FIELDS)} FROM rollup_weeks "
+            "WHERE period = ? AND key = ? AND week = ?",
+            (period, key, week)
+        ).fetchone()
+        if old is not None and date < old[0]:
+            continue
+
+        conn.execute(
+            f"INSERT OR REPLACE INTO rollup_weeks "
+            f"(period, key, week, date, {', '.join(ROLLUP_FIELDS)}) "
+            f"VALUES (?, ?, ?, ?, {', '.join('?' * len(ROLLUP_FIELDS))})",
+            (period, key, week, date, *new.values())
+        )
+
+        row = conn.execute(
+            "SELECT weeks, new_subscribers, unsubscribed, revenue, open_rate_sum, open_rate_n, "
+            "ctr_sum, ctr_n, first_date, first_total, first_open_rate, last_date, last_total, "
+            "last_open_rate FROM rollups WHERE period = ? AND key = ?",
+            (period, key)
+        ).fetchone()
+        (weeks, new_subs, unsub, revenue, open_sum, open_n, ctr_sum, ctr_n,
+         first_date, first_total, first_open, last_date, last_total, last_open) = \
+            row or (0, 0.0, 0.0, 0.0, 0.0, 0, 0.0, 0, None, None, None, None, None, None)
+
+        contributions = [(new, 1)]
+        if old is None:
+            weeks += 1
+        else:
+            contributions.append((dict(zip(ROLLUP_FIELDS, old[1:])), -1))
+
+        for values_, sign in contributions:
+            new_subs += sign * (values_['new_subscribers'] or 0)
+            unsub += sign * (values_['unsubscribed'] or 0)
+            revenue += sign * (values_['revenue'] or 0)
+            if values_['open_rate'] is not None:
+                open_sum += sign * values_['open_rate']
+                open_n += sign
+            if values_['click_through_rate'] is not None:
+                ctr_sum += sign * values_['click_through_rate']
+                ctr_n += sign
+
+        # A replaced week keeps its place; the new record inherits first/last
+        replaced_first = old is not None and old[0] == first_date
+        if first_date is None or date < first_date or replaced_first:
+            first_date, first_total, first_open = date, new['subscribers_total'], new['open_rate']
+        if last_date is None or date >= last_date:
+            last_date, last_total, last_open = date, new['subscribers_total'], new['open_rate']
+
+        conn.execute(
+            "INSERT OR REPLACE INTO rollups "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (period, key, weeks, new_subs, unsub, revenue, open_sum, open_n, ctr_sum, ctr_n,
+             first_date, first_total, first_open, last_date, last_total, last_open)
+        )
+
+
+def _insert_metrics(conn, records):
+    placeholders = ", ".join("?" * (len(METRIC_COLUMNS) + 2))
+    for record in records:
+        values = _metric_values(record)
+        conn.execute(
+            f"INSERT INTO metrics (date, {', '.join(METRIC_COLUMNS)}, record) "
+            f"VALUES ({placeholders})",
+            (record.get('date', ''), *values.values(), json.dumps(record))
+        )
+        _update_rollups(conn, record.get('date', ''), values)
+    if records:
+        _bump_data_version(conn)
+
+
+def open_analytics_store():
+    """
+    Open the analytics time-series store, creating it on first use
+
+    A new store imports ``newsletter.metrics`` from ANALYTICS_FILE once, so
+    existing JSON history carries over. Afterwards the JSON file is only
+    written by save_analytics_history() as an export. Month, quarter and
+    year rollups are maintained on every insert.
+
+    Returns:
+        sqlite3.Connection: Open connection (caller closes it)
+    """
+    store_path = analytics_store_path()
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(store_path)
+    conn.executescript(STORE_SCHEMA)
+
+    if _get_meta(conn, 'schema_version') is None:
+        with conn:
+            if Path(ANALYTICS_FILE).exists():
+                with open(ANALYTICS_FILE, 'r') as f:
+                    newsletter = json.load(f).get('newsletter', {})
+                _insert_metrics(conn, newsletter.get('metrics', []))
+                if newsletter.get('last_updated'):
+                    _set_meta(conn, 'last_updated', newsletter['last_updated'])
+            _set_meta(conn, 'schema_version', STORE_SCHEMA_VERSION)
+
+    return conn
+
+
+def append_metrics(record):
+    """
+    Append one metrics record to the store
+
+    Args:
+        record (dict): Metrics record with an ISO ``date``
+    """
+    with contextlib.closing(open_analytics_store()) as conn, conn:
+        _insert_metrics(conn, [record])
+        _set_meta(conn, 'last_updated', datetime.now().isoformat())
+
+
+def _window_sql(columns, start=None, end=None, last=None):
+    """SELECT over a date window, newest first, with its parameters"""
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("date >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("date < ?")
+        params.append(end)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    sql = f"SELECT {columns} FROM metrics {where} ORDER BY date DESC, id DESC"
+    if last is not None:
+        sql += " LIMIT ?"
+        params.append(last)
+    return sql, params
+
+
+def query_metrics(start=None, end=None, last=None):
+    """
+    Read metrics records in date order through the date index
+
+    Args:
+        start (str): Earliest ISO date to include
+        end (str): ISO date to stop before (exclusive)
+        last (int): Only return the most recent ``last`` matching records
+
+    Returns:
+        list: Metrics records, oldest first
+    """
+    sql, params = _window_sql("record", start, end, last)
+    with contextlib.closing(open_analytics_store()) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return [json.loads(row[0]) for row in reversed(rows)]
+
+
+def load_metrics_frame(start=None, end=None, last=None):
+    """
+    Load a metrics window as columnar arrays
+
+    Only the flat metric columns are read, so whole-history frames stay
+    cheap. Missing values are NaN.
+
+    Args:
+        start (str): Earliest ISO date to include
+        end (str): ISO date to stop before (exclusive)
+        last (int): Only load the most recent ``last`` matching records
+
+    Returns:
+        pandas.DataFrame: One row per record indexed by date, oldest first
+    """
+    sql, params = _window_sql(f"date, {', '.join(METRIC_COLUMNS)}", start, end, last)
+    with contextlib.closing(open_analytics_store()) as conn:
+        frame = pd.read_sql_query(sql, conn, params=params)
+
+    frame = frame.iloc[::-1]
+    frame.index = pd.to_datetime(frame.pop('date'), format='ISO8601')
+    return frame.astype(float)
+
+
+def rolling_metrics(frame, window=ROLLING_WINDOW):
+    """
+    Rolling statistics over a metrics frame
+
+    Args:
+        frame (pandas.DataFrame): From load_metrics_frame()
+        window (int): Records per rolling window
+
+    Returns:
+        pandas.DataFrame: Rolling averages and sums, week-over-week
+        subscriber growth (%) and an EWMA of the open rate, per record
+    """
+    rolling = frame.rolling(window, min_periods=1)
+    return pd.DataFrame({
+        'avg_open_rate': rolling['open_rate'].mean(),
+        'avg_click_through_rate': rolling['click_through_rate'].mean(),
+        'new_subscribers': rolling['new_this_week'].sum(),
+        'revenue': rolling['revenue_total'].sum(),
+        'subscriber_growth': frame['subscribers_total'].pct_change(fill_method=None) * 100,
+        'open_rate_ewma': frame['open_rate'].ewm(span=EWMA_SPAN).mean(),
+    })
+
+
+def _rate(value):
+    """Rounded float for reports; NaN becomes None"""
+    return None if value is None or np.isnan(value) else round(float(value), 2)
+
+
+def _count(value):
+    """Integral totals as ints for reports; NaN becomes None"""
+    rate = _rate(value)
+    return int(rate) if rate is not None and rate.is_integer() else rate
+
+
+def distribution_stats(frame):
+    """
+    Open-rate percentiles, EWMA and trailing rolling window for a metrics window
+
+    These need the individual records, unlike the additive totals kept in
+    rollups. The rolling figures cover the last ROLLING_WINDOW records.
+
+    Args:
+        frame (pandas.DataFrame): From load_metrics_frame(), non-empty
+
+    Returns:
+        dict: open_rate_p50, open_rate_p90, open_rate_ewma,
+        rolling_open_rate and rolling_new_subscribers
+    """
+    open_rate = frame['open_rate'].to_numpy()
+    valid_open = open_rate[~np.isnan(open_rate)]
+    latest = rolling_metrics(frame).iloc[-1]
+    return {
+        'open_rate_p50': _rate(np.percentile(valid_open, 50)) if valid_open.size else None,
+        'open_rate_p90': _rate(np.percentile(valid_open, 90)) if valid_open.size else None,
+        'open_rate_ewma': _rate(latest['open_rate_ewma']),
+        'rolling_open_rate': _rate(latest['avg_open_rate']),
+        'rolling_new_subscribers': _count(latest['new_subscribers']),
+    }
+
+
+def summarize_metrics(frame):
+    """
+    Summary statistics and trends for a metrics window
+
+    Args:
+        frame (pandas.DataFrame): From load_metrics_frame(), non-empty
+
+    Returns:
+        tuple: (summary dict, trends dict)
+    """
+    open_rate = frame['open_rate'].dropna()
+    totals = frame['subscribers_total'].dropna()
+    total_new_subscribers = _count(frame['new_this_week'].sum())
+
+    summary = {
+        'avg_open_rate': _rate(frame['open_rate'].mean()),
+        'avg_click_through_rate': _rate(frame['click_through_rate'].mean()),
+        'total_new_subscribers': total_new_subscribers,
+        'total_revenue': _count(frame['revenue_total'].sum()),
+        'weeks': len(frame),
+        'subscriber_growth': _rate(calculate_growth_rate(totals.iloc[-1], totals.iloc[0]))
+                             if len(totals) > 1 else None,
+        **distribution_stats(frame),
+    }
+    trends = {
+        'open_rate_trend': 'increasing' if len(open_rate) and open_rate.iloc[-1] > open_rate.iloc[0]
+                           else 'decreasing',
+        'subscriber_trend': 'growing' if total_new_subscribers else 'stable'
+    }
+    return summary, trends
+
+
+def read_rollup(period, key):
+    """
+    Read one precomputed rollup row
+
+    Args:
+        period (str): 'month', 'quarter' or 'year'
+        key (str): Bucket from rollup_key()
+
+    Returns:
+        dict | None: Rollup columns, or None when the period has no data
+    """
+    with contextlib.closing(open_analytics_store()) as conn:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute(
+            "SELECT * FROM rollups WHERE period = ? AND key = ?", (period, key)
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def rollup_summary(rollup):
+    """
+    Summary and trends from a rollup row, matching summarize_metrics()
+
+    Args:
+        rollup (dict): Row from read_rollup()
+
+    Returns:
+        tuple: (summary dict, trends dict) without distribution stats
+    """
+    total_new_subscribers = _count(rollup['new_subscribers'])
+    growth = None
+    if rollup['first_date'] != rollup['last_date'] and \
+            rollup['first_total'] is not None and rollup['last_total'] is not None:
+        growth = _rate(calculate_growth_rate(rollup['last_total'], rollup['first_total']))
+
+    summary = {
+        'avg_open_rate': _rate(rollup['open_rate_sum'] / rollup['open_rate_n'])
+                         if rollup['open_rate_n'] else None,
+        'avg_click_through_rate': _rate(rollup['ctr_sum'] / rollup['ctr_n'])
+                                  if rollup['ctr_n'] else None,
+        'total_new_subscribers': total_new_subscribers,
+        'total_revenue': _count(rollup['revenue']),
+        'weeks': rollup['weeks'],
+        'subscriber_growth': growth,
+    }
+    first_open, last_open = rollup['first_open_rate'], rollup['last_open_rate']
+    trends = {
+        'open_rate_trend': 'increasing' if first_open is not None and last_open is not None
+                           and last_open > first_open else 'decreasing',
+        'subscriber_trend': 'growing' if total_new_subscribers else 'stable'
+    }
+    return summary, trends
+
+
+def compare_rollups(current, previous):
+    """
+    Period-over-period changes between two rollup rows
+
+    Args:
+        current (dict): Rollup for the reported period
+        previous (dict): Rollup for the period before it
+
+    Returns:
+        dict: previous key, growth (%) of new subscribers and revenue,
+        and the open-rate change in points
+    """
+    current_summary, _ = rollup_summary(current)
+    previous_summary, _ = rollup_summary(previous)
+    open_change = None
+    current_open = current_summary['avg_open_rate']
+    previous_open = previous_summary['avg_open_rate']
+    if current_open is not None and previous_open is not None:
+        open_change = _rate(current_open - previous_open)
+
+    return {
+        'previous': previous['key'],
+        'new_subscribers_growth': _rate(calculate_growth_rate(
+            current['new_subscribers'], previous['new_subscribers'])),
+        'revenue_growth': _rate(calculate_growth_rate(current['revenue'], previous['revenue'])),
+        'open_rate_change': open_change,
+    }
+
+
+class HyperLogLog:
+    """
+    Mergeable HyperLogLog sketch of distinct values
+
+    Uses HLL_REGISTERS one-byte registers. Values are hashed with pandas'
+    stable 64-bit hash, so sketches built in different runs can be merged
+    by taking the register-wise maximum. Counts within a few percent need
+    16 KB per sketch (less once compressed) however many readers there are.
+    """
+
+    def __init__(self, registers=None):
+        self.registers = (
+            np.zeros(HLL_REGISTERS, dtype=np.uint8) if registers is None else registers
+        )
+
+    @staticmethod
+    def hash_values(values):
+        """
+        Map values to (register index, rank) arrays
+
+        The top HLL_PRECISION hash bits pick the register; the rank is the
+        position of the first set bit in the rest.
+        """
+        hashes = pd.util.hash_pandas_object(
+            pd.Series(values, dtype=object).astype(str), index=False
+        ).to_numpy()
+        width = 64 - HLL_PRECISION
+        index = (hashes >> np.uint64(width)).astype(np.intp)
+        rest = hashes & np.uint64((1 << width) - 1)
+        # frexp is exact here: rest < 2**50 fits the float64 mantissa
+        _, exponent = np.frexp(rest.astype(np.float64))
+        ranks = (width + 1 - exponent).astype(np.uint8)
+        return index, ranks
+
+    def add_hashed(self, index, ranks):
+        """Fold (register index, rank) pairs from hash_values() into the sketch"""
+        np.maximum.at(self.registers, index, ranks)
+        return self
+
+    def add(self, values):
+        """Add an iterable of values"""
+        return self.add_hashed(*self.hash_values(list(values)))
+
+    def merge(self, other):
+        """Union another sketch into this one"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """Estimated number of distinct values added"""
+        m = HLL_REGISTERS
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def to_bytes(self):
+        """Compressed registers for storage"""
+        return zlib.compress(self.registers.tobytes())
+
+    @classmethod
+    def from_bytes(cls, blob):
+        """Sketch from to_bytes() output"""
+        return cls(np.frombuffer(zlib.decompress(blob), dtype=np.uint8).copy())
+
+
+def _event_chunks(path, chunk_rows, fields=EVENT_FIELDS, required=EVENT_REQUIRED):
+    """Yield DataFrame chunks of ``fields`` from a CSV or JSONL export"""
+    path = Path(path)
+    if path.suffix.lower() in ('.jsonl', '.ndjson'):
+        reader = pd.read_json(path, lines=True, chunksize=chunk_rows, dtype=False)
+    else:
+        reader = pd.read_csv(
+            path, chunksize=chunk_rows, usecols=lambda column: column in fields,
+            dtype={field: str for field in EVENT_KEY_FIELDS}
+        )
+    with reader:
+        for chunk in reader:
+            missing = [field for field in required if field not in chunk.columns]
+            if missing:
+                raise ValueError(f"{path.name}: missing event fields {', '.join(missing)}")
+            yield _integer_keys(chunk.reindex(columns=fields))
+
+
+def _integer_keys(chunk):
+    """
+    Undo the float upcast of numeric identifiers next to missing values
+
+    JSON numbers cannot be read as text, so an all-numeric id column with
+    a gap arrives as float; integral values are turned back into integers.
+    """
+    for field in EVENT_KEY_FIELDS:
+        column = chunk.get(field)
+        if column is not None and column.dtype.kind == 'f' and (column.dropna() % 1 == 0).all():
+            chunk[field] = column.astype('Int64').astype(str)
+    return chunk
+
+
+def _format_days(index):
+    """
+    ISO strings for the ``day`` level of a grouped index
+
+    Formatting the unique group keys instead of every row before grouping
+    keeps strftime off the per-event path.
+    """
+    return index.set_levels(index.levels[1].strftime('%Y-%m-%d'), level='day')
+
+
+def _aggregate_events(chunk):
+    """
+    Reduce one chunk of raw events to per-(issue, day) and per-(issue, day, link) counts
+
+    Returns:
+        tuple: (days DataFrame, links Series, sketch registers Series,
+                valid event count)
+    """
+    kind = chunk['type'].astype(str).str.lower()
+    when = pd.to_datetime(chunk['timestamp'], utc=True, errors='coerce', format='ISO8601')
+    valid = kind.isin(('open', 'click')) & when.notna() & chunk['issue'].notna()
+
+    events = pd.DataFrame({
+        'issue': chunk['issue'][valid].astype(str),
+        'day': when[valid].dt.normalize(),
+        'opens': (kind[valid] == 'open').astype(int),
+        'clicks': (kind[valid] == 'click').astype(int),
+        'read_seconds': pd.to_numeric(chunk['read_seconds'][valid], errors='coerce'),
+    })
+    days = events.groupby(['issue', 'day']).agg(
+        opens=('opens', 'sum'),
+        clicks=('clicks', 'sum'),
+        read_seconds=('read_seconds', 'sum'),
+        reads=('read_seconds', 'count'),
+    )
+    days.index = _format_days(days.index)
+
+    clicked = (kind == 'click') & valid & chunk['url'].notna()
+    links = pd.DataFrame({
+        'issue': chunk['issue'][clicked].astype(str),
+        'day': when[clicked].dt.normalize(),
+        'url': chunk['url'][clicked].astype(str),
+    }).groupby(['issue', 'day', 'url']).size()
+    links.index = _format_days(links.index)
+
+    # Highest rank per sketch register, for events that name a subscriber
+    readers = valid & chunk['subscriber'].notna()
+    index, ranks = HyperLogLog.hash_values(chunk['subscriber'][readers])
+    registers = pd.DataFrame({
+        'issue': chunk['issue'][readers].astype(str),
+        'day': when[readers].dt.normalize(),
+        'kind': kind[readers],
+        'register': index,
+        'rank': ranks,
+    }).groupby(['issue', 'day', 'kind', 'register'])['rank'].max()
+    registers.index = _format_days(registers.index)
+
+    return days, links, registers, int(valid.sum())
+
+
+def _load_sketch(conn, key):
+    """Stored sketch for an (issue, day, kind) key, or an empty one"""
+    row = conn.execute(
+        "SELECT registers FROM reader_sketches WHERE issue = ? AND day = ? AND kind = ?", key
+    ).fetchone()
+    return HyperLogLog.from_bytes(row[0]) if row else HyperLogLog()
+
+
+def _flush_sketches(conn, sketches):
+    """Write pending sketches back to the store and forget them"""
+    conn.executemany(
+        "INSERT OR REPLACE INTO reader_sketches (issue, day, kind, registers) VALUES (?, ?, ?, ?)",
+        [(*key, sketch.to_bytes()) for key, sketch in sketches.items()]
+    )
+    sketches.clear()
+
+
+def _merge_sketches(conn, sketches, registers):
+    """
+    Fold per-chunk register maxima into pending (issue, day, kind) sketches
+
+    Sketches stay decoded in ``sketches`` across chunks and are written
+    back once more than HLL_PENDING_LIMIT are held, bounding memory.
+    """
+    frame = registers.reset_index()
+    index, ranks = frame['register'].to_numpy(), frame['rank'].to_numpy()
+    for key, rows in frame.groupby(['issue', 'day', 'kind'], sort=False).indices.items():
+        if key not in sketches:
+            sketches[key] = _load_sketch(conn, key)
+        sketches[key].add_hashed(index[rows], ranks[rows])
+    if len(sketches) > HLL_PENDING_LIMIT:
+        _flush_sketches(conn, sketches)
+
+
+def _file_digest(path):
+    """SHA-256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def ingest_events(path, chunk_rows=EVENT_CHUNK_ROWS):
+    """
+    Stream a raw open/click event export into the analytics store
+
+    Events need ``type`` ('open' or 'click'), ``issue`` and ``timestamp``;
+    clicks may carry ``url`` and opens ``read_seconds``. The file is read
+    ``chunk_rows`` rows at a time and each chunk is reduced to per-issue,
+    per-day and per-link counts before being added to the store, so memory
+    stays bounded whatever the export size. Events with a ``subscriber``
+    also update per-issue, per-day HyperLogLog sketches of unique openers
+    and clickers. Rows with an unknown type or unparseable timestamp are
+    skipped.
+
+    The whole file is added in one transaction and recorded by content
+    hash, so an interrupted run leaves no partial counts and importing the
+    same export twice is a no-op.
+
+    Args:
+        path (str | Path): .csv, .jsonl or .ndjson export
+        chunk_rows (int): Rows per chunk
+
+    Returns:
+        dict: ``events`` ingested, ``skipped`` rows and ``duplicate`` flag
+    """
+    digest = _file_digest(path)
+    stats = {'events': 0, 'skipped': 0, 'duplicate': False}
+
+    with contextlib.closing(open_analytics_store()) as conn, conn:
+        if conn.execute("SELECT 1 FROM event_imports WHERE digest = ?", (digest,)).fetchone():
+            stats['duplicate'] = True
+            return stats
+
+        sketches = {}
+        for chunk in _event_chunks(path, chunk_rows):
+            days, links, registers, valid = _aggregate_events(chunk)
+            stats['events'] += valid
+            stats['skipped'] += len(chunk) - valid
+
+            conn.executemany(
+                """
+                INSERT INTO issue_days (issue, day, opens, clicks, read_seconds, reads)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (issue, day) DO UPDATE SET
+                    opens = opens + excluded.opens,
+                    clicks = clicks + excluded.clicks,
+                    read_seconds = read_seconds + excluded.read_seconds,
+                    reads = reads + excluded.reads
+                """,
+                [
+                    (issue, day, int(row.opens), int(row.clicks),
+                     float(row.read_seconds), int(row.reads))
+                    for (issue, day), row in zip(days.index, days.itertuples(index=False))
+                ]
+            )
+            conn.executemany(
+                """
+                INSERT INTO issue_links (issue, day, url, clicks) VALUES (?, ?, ?, ?)
+                ON CONFLICT (issue, day, url) DO UPDATE SET clicks = clicks + excluded.clicks
+                """,
+                [(issue, day, url, int(clicks)) for (issue, day, url), clicks in links.items()]
+            )
+            _merge_sketches(conn, sketches, registers)
+
+        _flush_sketches(conn, sketches)
+
+        conn.execute(
+            "INSERT INTO event_imports (digest, path, events, imported_at) VALUES (?, ?, ?, ?)",
+            (digest, str(path), stats['events'], datetime.now().isoformat())
+        )
+        _bump_data_version(conn)
+
+    return stats
+
+
+def issue_engagement(start=None, end=None):
+    """
+    Per-issue opens, clicks and read time from ingested events
+
+    Args:
+        start (str): First ISO day (inclusive)
+        end (str): Last ISO day (exclusive)
+
+    Returns:
+        list: Dicts with issue, opens, clicks, read_seconds and reads,
+              most opened first
+    """
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("day >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("day < ?")
+        params.append(end)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    with contextlib.closing(open_analytics_store()) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT issue, SUM(opens), SUM(clicks), SUM(read_seconds), SUM(reads)
+            FROM issue_days {where}
+            GROUP BY issue
+            ORDER BY SUM(opens) DESC, issue
+            """,
+            params
+        ).fetchall()
+    return [
+        dict(zip(('issue', 'opens', 'clicks', 'read_seconds', 'reads'), row)) for row in rows
+    ]
+
+
+def top_links(issue=None, limit=5, start=None, end=None):
+    """
+    Most clicked links from ingested events
+
+    Args:
+        issue (str): Restrict to one issue (default: all issues)
+        limit (int): Number of links
+        start (str): First ISO day (inclusive)
+        end (str): Last ISO day (exclusive)
+
+    Returns:
+        list: (url, clicks) tuples, most clicked first
+    """
+    clauses, params = [], []
+    if issue is not None:
+        clauses.append("issue = ?")
+        params.append(issue)
+    if start is not None:
+        clauses.append("day >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("day < ?")
+        params.append(end)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    with contextlib.closing(open_analytics_store()) as conn:
+        return conn.execute(
+            f"""
+            SELECT url, SUM(clicks) FROM issue_links {where}
+            GROUP BY url ORDER BY SUM(clicks) DESC, url LIMIT ?
+            """,
+            [*params, limit]
+        ).fetchall()
+
+
+def unique_readers(start=None, end=None, issue=None, kind='open'):
+    """
+    Estimated distinct subscribers who opened (or clicked) in a window
+
+    Merges the stored per-issue, per-day sketches, so a month or quarter
+    costs one register-wise maximum per sketch rather than a rescan of
+    the raw events.
+
+    Args:
+        start (str): First ISO day (inclusive)
+        end (str): Last ISO day (exclusive)
+        issue (str): Restrict to one issue (default: all issues)
+        kind (str): 'open' or 'click'
+
+    Returns:
+        int | None: Estimated unique readers, or None when no sketches
+                    fall in the window
+    """
+    clauses, params = ["kind = ?"], [kind]
+    for clause, value in (("day >= ?", start), ("day < ?", end), ("issue = ?", issue)):
+        if value is not None:
+            clauses.append(clause)
+            params.append(value)
+
+    merged = None
+    with contextlib.closing(open_analytics_store()) as conn:
+        rows = conn.execute(
+            f"SELECT registers FROM reader_sketches WHERE {' AND '.join(clauses)}", params
+        )
+        for (blob,) in rows:
+            sketch = HyperLogLog.from_bytes(blob)
+            merged = sketch if merged is None else merged.merge(sketch)
+    return merged.count() if merged is not None else None
+
+
+def _unique_reader_stats(start, end):
+    """Unique opener/clicker estimates for a report summary (empty without sketches)"""
+    openers = unique_readers(start, end, kind='open')
+    if openers is None:
+        return {}
+    return {
+        'unique_openers': openers,
+        'unique_clickers': unique_readers(start, end, kind='click') or 0
+    }
+
+
+def top_performing(start=None, end=None):
+    """
+    ``top_performing`` section computed from ingested events
+
+    Args:
+        start (str): First ISO day (inclusive)
+        end (str): Last ISO day (exclusive)
+
+    Returns:
+        dict: most_opened, most_clicked and avg_read_time, or None when
+              no events fall in the window
+    """
+    issues = issue_engagement(start, end)
+    if not issues:
+        return None
+
+    most_clicked = max(issues, key=lambda row: (row['clicks'], row['opens']))
+    reads = sum(row['reads'] for row in issues)
+    read_seconds = sum(row['read_seconds'] for row in issues)
+    return {
+        'most_opened': issues[0]['issue'],
+        'most_clicked': most_clicked['issue'],
+        'avg_read_time': f"{read_seconds / reads / 60:.1f} minutes" if reads else 'n/a'
+    }
+
+
+def _week_number(seconds):
+    """Monday-aligned week numbers for epoch seconds (week 0 starts 1969-12-29)"""
+    return np.floor((np.asarray(seconds, dtype=np.float64) / 86400 + 3) / 7)
+
+
+def week_start(week):
+    """ISO date of the Monday starting a week number from _week_number()"""
+    return (datetime(1970, 1, 1) + timedelta(days=int(week) * 7 - 3)).date().isoformat()
+
+
+def _cohort_cells(first_joined, last_joined, last_left):
+    """
+    (cohort week, exit week) per subscriber state, as float arrays
+
+    A subscriber belongs to the cohort of their first join and exits in the
+    week of their last leave, unless they joined again afterwards
+    (COHORT_ACTIVE). Subscribers with no join have a NaN cohort.
+    """
+    cohort = _week_number(first_joined)
+    left = ~np.isnan(last_left) & ~(last_joined > last_left)
+    exit_week = np.where(left, _week_number(last_left), COHORT_ACTIVE)
+    return cohort, exit_week
+
+
+def _cohort_deltas(cohort, exit_week, sign):
+    """Signed (cohort, exit) -> subscribers counts for known cohorts"""
+    known = ~np.isnan(cohort)
+    return pd.DataFrame({
+        'cohort': cohort[known].astype(np.int64),
+        'exit': exit_week[known].astype(np.int64),
+        'subscribers': sign,
+    })
+
+
+def _load_subscribers(conn, subscribers):
+    """Stored (first_joined, last_joined, last_left) for known subscribers, by id"""
+    stored = []
+    for start in range(0, len(subscribers), SQL_BATCH):
+        batch = subscribers[start:start + SQL_BATCH]
+        stored.extend(conn.execute(
+            f"""
+            SELECT subscriber, first_joined, last_joined, last_left FROM subscribers
+            WHERE subscriber IN ({', '.join('?' * len(batch))})
+            """,
+            batch
+        ).fetchall())
+    return pd.DataFrame(
+        stored, columns=['subscriber', 'first_joined', 'last_joined', 'last_left'], dtype=object
+    ).set_index('subscriber').astype(np.float64)
+
+
+def ingest_subscriber_events(path, chunk_rows=EVENT_CHUNK_ROWS):
+    """
+    Stream subscribe/unsubscribe events into the cohort store
+
+    Events need ``type`` ('subscribe' or 'unsubscribe'), ``subscriber`` and
+    ``timestamp``. Each chunk is reduced to one row per subscriber (first
+    and last join, last leave) and merged into the ``subscribers`` table
+    with min/max, so imports may overlap or arrive out of order. The
+    ``cohort_exits`` counts behind cohort_retention() are adjusted by the
+    difference between each subscriber's old and new cohort cell, so new
+    weeks of events never rescan earlier ones.
+
+    Args:
+        path (str | Path): .csv, .jsonl or .ndjson export
+        chunk_rows (int): Rows per chunk
+
+    Returns:
+        dict: ``events`` ingested and ``skipped`` rows
+    """
+    stats = {'events': 0, 'skipped': 0}
+    epoch = pd.Timestamp(0, tz='UTC')
+
+    with contextlib.closing(open_analytics_store()) as conn, conn:
+        latest = float(_get_meta(conn, 'cohort_latest') or 'nan')
+
+        for chunk in _event_chunks(path, chunk_rows, SUBSCRIBER_EVENT_FIELDS,
+                                   SUBSCRIBER_EVENT_FIELDS):
+            kind = chunk['type'].astype(str).str.lower()
+            when = pd.to_datetime(chunk['timestamp'], utc=True, errors='coerce', format='ISO8601')
+            valid = (kind.isin(('subscribe', 'unsubscribe')) & when.notna()
+                     & chunk['subscriber'].notna())
+            stats['events'] += int(valid.sum())
+            stats['skipped'] += int(len(chunk) - valid.sum())
+            if not valid.any():
+                continue
+
+            seconds = ((when[valid] - epoch) // pd.Timedelta(seconds=1)).astype(np.float64)
+            joins = seconds.where(kind[valid] == 'subscribe')
+            new = pd.DataFrame({
+                'subscriber': chunk['subscriber'][valid].astype(str),
+                'first_joined': joins,
+                'last_joined': joins,
+                'last_left': seconds.where(kind[valid] == 'unsubscribe'),
+            }).groupby('subscriber').agg(
+                {'first_joined': 'min', 'last_joined': 'max', 'last_left': 'max'}
+            )
+            latest = np.fmax(latest, seconds.max())
+
+            old = _load_subscribers(conn, list(new.index)).reindex(new.index)
+            merged = pd.DataFrame({
+                'first_joined': np.fmin(old['first_joined'], new['first_joined']),
+                'last_joined': np.fmax(old['last_joined'], new['last_joined']),
+                'last_left': np.fmax(old['last_left'], new['last_left']),
+            })
+
+            before = _cohort_cells(*(old[c].to_numpy() for c in merged.columns))
+            after = _cohort_cells(*(merged[c].to_numpy() for c in merged.columns))
+            deltas = pd.concat([
+                _cohort_deltas(*before, -1), _cohort_deltas(*after, 1)
+            ]).groupby(['cohort', 'exit'])['subscribers'].sum()
+            conn.executemany(
+                """
+                INSERT INTO cohort_exits (cohort, exit, subscribers) VALUES (?, ?, ?)
+                ON CONFLICT (cohort, exit) DO UPDATE SET
+                    subscribers = subscribers + excluded.subscribers
+                """,
+                [(int(c), int(e), int(n)) for (c, e), n in deltas[deltas != 0].items()]
+            )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO subscribers
+                    (subscriber, first_joined, last_joined, last_left)
+                VALUES (?, ?, ?, ?)
+                """,
+                merged.astype(object).where(merged.notna(), None).itertuples()
+            )
+
+        conn.execute("DELETE FROM cohort_exits WHERE subscribers = 0")
+        if not np.isnan(latest):
+            _set_meta(conn, 'cohort_latest', repr(float(latest)))
+        if stats['events']:
+            _bump_data_version(conn)
+
+    return stats
+
+
+def cohort_retention(weeks=None):
+    """
+    Weekly cohort retention matrix
+
+    Row ``c`` is the cohort of subscribers who first joined in week ``c``;
+    column ``k`` is the percentage of that cohort still subscribed at the
+    end of week ``c + k``. Weeks after the latest ingested event are NaN.
+    Built from the small ``cohort_exits`` table with array operations,
+    so its cost does not grow with the number of subscribers.
+
+    Args:
+        weeks (int): Keep only the latest ``weeks`` cohorts and ages
+
+    Returns:
+        tuple: (sizes Series, retention DataFrame), both indexed by cohort
+               week start; None when no cohorts exist
+    """
+    with contextlib.closing(open_analytics_store()) as conn:
+        latest = _get_meta(conn, 'cohort_latest')
+        cells = np.array(
+            conn.execute("SELECT cohort, exit, subscribers FROM cohort_exits").fetchall(),
+            dtype=np.int64
+        ).reshape(-1, 3)
+    if latest is None or not len(cells):
+        return None
+
+    latest_week = int(_week_number(float(latest)))
+    cohorts = np.unique(cells[:, 0])
+    if weeks is not None:
+        cohorts = cohorts[-weeks:]
+        cells = cells[np.isin(cells[:, 0], cohorts)]
+    ages = latest_week - int(cohorts[0]) + 1
+    if weeks is not None:
+        ages = min(ages, weeks)
+
+    # Exit age per cell: weeks from joining to leaving, capped at ``ages`` (retained throughout)
+    row = np.searchsorted(cohorts, cells[:, 0])
+    exit_age = np.where(cells[:, 1] == COHORT_ACTIVE, ages, cells[:, 1] - cells[:, 0])
+    exits = np.zeros((len(cohorts), ages + 1), dtype=np.int64)
+    np.add.at(exits, (row, np.clip(exit_age, 0, ages)), cells[:, 2])
+
+    sizes = exits.sum(axis=1)
+    retained = sizes[:, None] - np.cumsum(exits, axis=1)[:, :ages]
+    observed = np.arange(ages)[None, :] <= (latest_week - cohorts)[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        retention = np.where(observed, retained / sizes[:, None] * 100, np.nan)
+
+    index = pd.Index([week_start(week) for week in cohorts], name='cohort')
+    return (
+        pd.Series(sizes, index=index, name='size'),
+        pd.DataFrame(retention.round(1), index=index, columns=range(ages)),
+    )
+
+
+def generate_cohort_report(weeks=COHORT_WEEKS):
+    """
+    Generate a weekly cohort retention report
+
+    Args:
+        weeks (int): Number of latest cohorts (and weeks of age) to show
+
+    Returns:
+        dict: Cohort report, or None without subscriber events
+    """
+    print("\n" + "="*60)
+    print("COHORT RETENTION REPORT")
+    print("="*60 + "\n")
+
+    matrix = cohort_retention(weeks)
+    if matrix is None:
+        print("⚠ Insufficient data for cohort report")
+        return None
+    sizes, retention = matrix
+
+    # Size-weighted average over the cohorts observed at each age
+    observed = retention.notna()
+    weights = observed.mul(sizes, axis=0)
+    average = (retention.fillna(0).mul(sizes, axis=0).sum() / weights.sum()).round(1)
+
+    def cells(values):
+        return [None if pd.isna(value) else float(value) for value in values]
+
+    with contextlib.closing(open_analytics_store()) as conn:
+        latest = float(_get_meta(conn, 'cohort_latest'))
+    return {
+        'period': 'cohort',
+        'date': datetime.now().isoformat(),
+        'range': {
+            'start': sizes.index[0],
+            'end': (datetime.fromisoformat(week_start(_week_number(latest))) + timedelta(days=6))
+            .date().isoformat()
+        },
+        'cohorts': [
+            {'week': week, 'size': int(sizes[week]), 'retention': cells(retention.loc[week])}
+            for week in sizes.index
+        ],
+        'average_retention': cells(average.where(weights.sum() > 0))
+    }
 
 
 def load_analytics_history():
     """
     Load historical analytics data
 
+    Reads the whole store; reports use query_metrics() for their window.
+
     Returns:
         dict: Analytics history
     """
-    if ANALYTICS_FILE.exists():
-        with open(ANALYTICS_FILE, 'r') as f:
-            return json.load(f)
-    else:
-        return {
-            'newsletter': {
-                'metrics': [],
-                'last_updated': None
-            }
+    with contextlib.closing(open_analytics_store()) as conn:
+        last_updated = _get_meta(conn, 'last_updated')
+
+    return {
+        'newsletter': {
+            'metrics': query_metrics(),
+            'last_updated': last_updated
         }
+    }
 
 
 def save_analytics_history(data):
     """
-    Save analytics history to file
+    Export analytics history to ANALYTICS_FILE as JSON
+
+    The store is the source of truth; this writes the legacy JSON layout
+    for tools that still read it.
 
     Args:
         data (dict): Analytics data to save
@@ -50,51 +1359,449 @@ def save_analytics_history(data):
         json.dump(data, f, indent=2)
 
 
-def fetch_current_metrics():
+class MetricsUnavailableError(RuntimeError):
+    """No provider returned metrics, not even from its cache"""
+
+
+class MetricsProvider(ABC):
+    """
+    A newsletter platform that contributes part of the current metrics
+
+    Subclasses set ``name`` and implement request() (the raw API payload)
+    and parse() (payload -> partial metrics record using the sections of
+    METRIC_COLUMNS). Keeping the two apart lets a recorded payload be
+    replayed through parse() without network access.
+    """
+    name: str
+    # Seconds allowed for the whole fetch, and for each HTTP request
+    timeout = PROVIDER_TIMEOUT
+    # Seconds a cached payload counts as fresh (0 disables caching)
+    cache_ttl = PROVIDER_CACHE_TTL
+
+    @classmethod
+    def from_env(cls, env):
+        """Build the provider from environment variables, or None if unconfigured"""
+
+    @abstractmethod
+    def request(self):
+        """Fetch the raw payload from the platform API"""
+
+    @staticmethod
+    @abstractmethod
+    def parse(raw):
+        """Map a raw payload to a partial metrics record"""
+
+    def fetch(self):
+        """Fetch and parse, returning (raw, partial metrics)"""
+        raw = self.request()
+        return raw, self.parse(raw)
+
+
+PROVIDERS: dict[str, type[MetricsProvider]] = {}
+
+
+def register_provider(cls):
+    """Class decorator adding a provider to the PROVIDERS registry"""
+    PROVIDERS[cls.name] = cls
+    return cls
+
+
+@register_provider
+class MockProvider(MetricsProvider):
+    """Demonstration data, used when no platform is configured"""
+    name = 'mock'
+    cache_ttl = 0
+
+    def request(self):
+        return {
+            'subscribers': {
+                'total': 1250,
+                'new_this_week': 45,
+                'unsubscribed': 3,
+                'net_growth': 42
+            },
+            'engagement': {
+                'open_rate': 42.5,
+                'click_through_rate': 8.2,
+                'total_opens': 531,
+                'total_clicks': 103
+            },
+            'top_performing': {
+                'most_opened': 'AI Regulation Deep Dive',
+                'most_clicked': 'The Future of Remote Work',
+                'avg_read_time': '6.5 minutes'
+            },
+            'revenue': {
+                'monthly_recurring': 1200,
+                'sponsors': 500,
+                'total': 1700
+            }
+        }
+
+    @staticmethod
+    def parse(raw):
+        return raw
+
+
+@register_provider
+class BeehiivProvider(MetricsProvider):
+    """Beehiiv API v2 publication stats"""
+    name = 'beehiiv'
+    api_url = "https://api.beehiiv.com/v2"
+
+    def __init__(self, api_key, publication_id):
+        self.api_key = api_key
+        self.publication_id = publication_id
+
+    @classmethod
+    def from_env(cls, env):
+        if env.get('BEEHIIV_API_KEY') and env.get('BEEHIIV_PUBLICATION_ID'):
+            return cls(env['BEEHIIV_API_KEY'], env['BEEHIIV_PUBLICATION_ID'])
+        return None
+
+    def request(self):
+        response = requests.get(
+            f"{self.api_url}/publications/{self.publication_id}",
+            params={'expand[]': 'stats'},
+            headers={'Authorization': f"Bearer {self.api_key}"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def parse(raw):
+        stats = raw['data']['stats']
+        return {
+            'subscribers': {'total': stats.get('active_subscriptions')},
+            'engagement': {
+                'open_rate': stats.get('average_open_rate'),
+                'click_through_rate': stats.get('average_click_rate'),
+                'total_opens': stats.get('total_unique_opened'),
+                'total_clicks': stats.get('total_clicked'),
+            },
+        }
+
+
+@register_provider
+class GhostProvider(MetricsProvider):
+    """Ghost Admin API member counts"""
+    name = 'ghost'
+
+    def __init__(self, api_url, api_key):
+        self.api_url = api_url.rstrip('/')
+        self.api_key = api_key
+
+    @classmethod
+    def from_env(cls, env):
+        if env.get('GHOST_API_URL') and env.get('GHOST_API_KEY'):
+            return cls(env['GHOST_API_URL'], env['GHOST_API_KEY'])
+        return None
+
+    def _token(self):
+        """Short-lived Admin API JWT signed with the ``id:secret`` key"""
+        key_id, secret = self.api_key.split(':', 1)
+
+        def encode(part):
+            data = json.dumps(part, separators=(',', ':')).encode()
+            return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+        issued = int(time.time())
+        signing_input = b'.'.join([
+            encode({'alg': 'HS256', 'kid': key_id, 'typ': 'JWT'}),
+            encode({'iat': issued, 'exp': issued + 300, 'aud': '/admin/'}),
+        ])
+        signature = hmac.new(bytes.fromhex(secret), signing_input, hashlib.sha256).digest()
+        return (signing_input + b'.' + base64.urlsafe_b64encode(signature).rstrip(b'=')).decode()
+
+    def request(self):
+        headers = {'Authorization': f"Ghost {self._token()}"}
+        since = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
+        counts = {}
+        for key, params in (
+            ('total', {'limit': 1}),
+            ('new_this_week', {'limit': 1, 'filter': f"created_at:>'{since}'"}),
+        ):
+            response = requests.get(
+                f"{self.api_url}/ghost/api/admin/members/",
+                params=params,
+                headers=headers,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            counts[key] = response.json()
+        return counts
+
+    @staticmethod
+    def parse(raw):
+        return {
+            'subscribers': {
+                key: raw[key]['meta']['pagination']['total']
+                for key in ('total', 'new_this_week')
+            },
+        }
+
+
+@register_provider
+class ConvertKitProvider(MetricsProvider):
+    """ConvertKit API v3 subscriber totals"""
+    name = 'convertkit'
+    api_url = "https://api.convertkit.com/v3"
+
+    def __init__(self, api_secret):
+        self.api_secret = api_secret
+
+    @classmethod
+    def from_env(cls, env):
+        if env.get('CONVERTKIT_API_SECRET'):
+            return cls(env['CONVERTKIT_API_SECRET'])
+        return None
+
+    def request(self):
+        since = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+        counts = {}
+        for key, params in (
+            ('total', {}),
+            ('new_this_week', {'from': since}),
+            ('unsubscribed', {'updated_from': since, 'subscriber_state': 'cancelled'}),
+        ):
+            response = requests.get(
+                f"{self.api_url}/subscribers",
+                params={'api_secret': self.api_secret, **params},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            counts[key] = response.json()
+        return counts
+
+    @staticmethod
+    def parse(raw):
+        return {
+            'subscribers': {key: raw[key]['total_subscribers'] for key in raw},
+        }
+
+
+class FixtureProvider(MetricsProvider):
     """
-    Fetch current metrics from newsletter platform
+    Replays a recorded payload for offline runs and tests
+
+    The fixture is a JSON file ``{"provider": <name>, "response": <raw>}``;
+    the response goes through that provider's parse().
+    """
+    cache_ttl = 0
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'r') as f:
+            fixture = json.load(f)
+        self.name = fixture['provider']
+        self.response = fixture['response']
+
+    def request(self):
+        return self.response
 
-    In a real implementation, this would connect to:
-    - Substack API
-    - Ghost API
-    - Beehiiv API
-    - ConvertKit API
-    etc.
+    def parse(self, raw):
+        return PROVIDERS[self.name].parse(raw)
+
+
+def configured_providers(env=None):
+    """
+    Providers with credentials in the environment
+
+    Falls back to MockProvider when no platform is configured.
+
+    Args:
+        env (Mapping): Environment variables (default: os.environ)
 
     Returns:
-        dict: Current metrics
+        list: MetricsProvider instances
     """
-    print("Fetching current metrics from newsletter platform...")
+    env = os.environ if env is None else env
+    providers = [
+        provider for provider in (cls.from_env(env) for cls in PROVIDERS.values())
+        if provider is not None
+    ]
+    return providers or [MockProvider()]
 
-    # Mock data for demonstration
-    # In production, replace with actual API calls
-    metrics = {
-        'date': datetime.now().isoformat(),
+
+def _cached_payload(name):
+    """(fetched_at, raw) for a provider's last payload, or None"""
+    with contextlib.closing(open_analytics_store()) as conn:
+        row = conn.execute(
+            "SELECT fetched_at, payload FROM provider_cache WHERE name = ?", (name,)
+        ).fetchone()
+    return (row[0], json.loads(row[1])) if row else None
+
+
+def _cache_payload(name, raw):
+    with contextlib.closing(open_analytics_store()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO provider_cache (name, fetched_at, payload) VALUES (?, ?, ?)",
+            (name, time.time(), json.dumps(raw))
+        )
+
+
+def fetch_provider_metrics(providers):
+    """
+    Fetch all providers concurrently
+
+    Each provider gets its own deadline of ``provider.timeout`` seconds from
+    the start of the batch. A payload younger than ``cache_ttl`` is used
+    without a request; on a timeout or error the last cached payload, however
+    old, stands in. Providers with neither are skipped with a warning.
+
+    Args:
+        providers (list): MetricsProvider instances
+
+    Returns:
+        tuple: (partial metrics records in provider order, names of the
+        skipped providers)
+    """
+    parts = [None] * len(providers)
+    cached = {}
+    pending = {}
+
+    pool = ThreadPoolExecutor(max_workers=max(1, len(providers)))
+    started = time.monotonic()
+    try:
+        for i, provider in enumerate(providers):
+            if provider.cache_ttl > 0:
+                cached[i] = _cached_payload(provider.name)
+                if cached[i] and time.time() - cached[i][0] < provider.cache_ttl:
+                    parts[i] = provider.parse(cached[i][1])
+                    continue
+            pending[i] = pool.submit(provider.fetch)
+
+        for i, future in pending.items():
+            provider = providers[i]
+            remaining = provider.timeout - (time.monotonic() - started)
+            try:
+                raw, parts[i] = future.result(timeout=max(0, remaining))
+            except FuturesTimeout:
+                reason = 'timed out'
+            except PROVIDER_ERRORS as e:
+                reason = e
+            except Exception:
+                logger.exception("Unexpected error fetching %s", provider.name)
+                reason = 'unexpected error'
+            else:
+                if provider.cache_ttl > 0:
+                    _cache_payload(provider.name, raw)
+                continue
+
+            if cached.get(i):
+                print(f"⚠ {provider.name}: {reason}; using cached metrics")
+                parts[i] = provider.parse(cached[i][1])
+            else:
+                print(f"⚠ {provider.name}: {reason}; skipped")
+    finally:
+        # Don't wait on requests that overran their deadline
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    skipped = [provider.name for provider, part in zip(providers, parts) if part is None]
+    return [part for part in parts if part is not None], skipped
+
+
+def merge_metrics(parts):
+    """
+    Merge partial provider metrics into one metrics record
+
+    Counts and revenue are summed across platforms; rates are averaged
+    weighted by each platform's subscriber total. ``top_performing`` comes
+    from the first provider that reports it. Fields no provider reports
+    are None, so they are stored as NULL rather than as a zero reading.
+
+    Args:
+        parts (list): Partial metrics records
+
+    Returns:
+        dict: Metrics record without ``date``
+    """
+    def reported(*values):
+        return [value for value in values if value is not None]
+
+    def total(section, field):
+        values = reported(*(part.get(section, {}).get(field) for part in parts))
+        return sum(values) if values else None
+
+    def weighted_rate(field):
+        weights = [
+            (part['engagement'][field], part.get('subscribers', {}).get('total') or 0)
+            for part in parts if part.get('engagement', {}).get(field) is not None
+        ]
+        if not weights:
+            return None
+        weight_sum = sum(weight for _, weight in weights)
+        if weight_sum:
+            return round(sum(rate * weight for rate, weight in weights) / weight_sum, 2)
+        return round(sum(rate for rate, _ in weights) / len(weights), 2)
+
+    new_this_week = total('subscribers', 'new_this_week')
+    unsubscribed = total('subscribers', 'unsubscribed')
+    recurring = total('revenue', 'monthly_recurring')
+    sponsors = total('revenue', 'sponsors')
+    revenue = reported(recurring, sponsors)
+
+    return {
         'subscribers': {
-            'total': 1250,
-            'new_this_week': 45,
-            'unsubscribed': 3,
-            'net_growth': 42
+            'total': total('subscribers', 'total'),
+            'new_this_week': new_this_week,
+            'unsubscribed': unsubscribed,
+            'net_growth': new_this_week - unsubscribed
+                          if new_this_week is not None and unsubscribed is not None else None
         },
         'engagement': {
-            'open_rate': 42.5,
-            'click_through_rate': 8.2,
-            'total_opens': 531,
-            'total_clicks': 103
-        },
-        'top_performing': {
-            'most_opened': 'AI Regulation Deep Dive',
-            'most_clicked': 'The Future of Remote Work',
-            'avg_read_time': '6.5 minutes'
+            'open_rate': weighted_rate('open_rate'),
+            'click_through_rate': weighted_rate('click_through_rate'),
+            'total_opens': total('engagement', 'total_opens'),
+            'total_clicks': total('engagement', 'total_clicks')
         },
+        'top_performing': next(
+            (part['top_performing'] for part in parts if part.get('top_performing')), {}
+        ),
         'revenue': {
-            'monthly_recurring': 1200,
-            'sponsors': 500,
-            'total': 1700
+            'monthly_recurring': recurring,
+            'sponsors': sponsors,
+            'total': sum(revenue) if revenue else None
         }
     }
 
-    print("✓ Metrics fetched successfully")
+
+def fetch_current_metrics(providers=None):
+    """
+    Fetch current metrics from the configured newsletter platforms
+
+    Providers (Beehiiv, Ghost, ConvertKit) are fetched concurrently and
+    merged into one record; see configured_providers() for selection.
+    When some providers are skipped the record lists them under
+    ``partial``, since its totals undercount.
+
+    Args:
+        providers (list): MetricsProvider instances (default: configured_providers())
+
+    Returns:
+        dict: Current metrics
+
+    Raises:
+        MetricsUnavailableError: If no provider returned metrics
+    """
+    providers = configured_providers() if providers is None else providers
+    print(f"Fetching current metrics from {', '.join(p.name for p in providers)}...")
+
+    parts, skipped = fetch_provider_metrics(providers)
+    if not parts:
+        raise MetricsUnavailableError(
+            f"No metrics from {', '.join(skipped) or 'any provider'}; nothing recorded"
+        )
+
+    metrics = {'date': datetime.now().isoformat()}
+    metrics.update(merge_metrics(parts))
+
+    if skipped:
+        metrics['partial'] = skipped
+        print(f"⚠ Partial metrics: missing {', '.join(skipped)}")
+    else:
+        print("✓ Metrics fetched successfully")
     return metrics
 
 
@@ -115,25 +1822,35 @@ def calculate_growth_rate(current, previous):
     return ((current - previous) / previous) * 100
 
 
-def generate_weekly_report(compare=False):
+def generate_weekly_report(compare=False, providers=None):
     """
     Generate weekly analytics report
 
+    The current metrics are appended to the store unless they are
+    partial, so a provider outage cannot dent history, rollups or
+    growth rates.
+
     Args:
         compare (bool): Compare with previous week
+        providers (list): Metrics providers (default: configured_providers())
 
     Returns:
         dict: Weekly report
+
+    Raises:
+        MetricsUnavailableError: If no provider returned metrics
     """
     print("\n" + "="*60)
     print("WEEKLY ANALYTICS REPORT")
     print("="*60 + "\n")
 
     # Fetch current metrics
-    current_metrics = fetch_current_metrics()
+    current_metrics = fetch_current_metrics(providers)
 
-    # Load historical data
-    history = load_analytics_history()
+    # Rank issues from ingested engagement events when the week has any
+    ranked = top_performing(start=(datetime.now() - timedelta(days=7)).date().isoformat())
+    if ranked:
+        current_metrics['top_performing'] = ranked
 
     # Calculate week-over-week changes
     report = {
@@ -143,33 +1860,61 @@ def generate_weekly_report(compare=False):
         'changes': {}
     }
 
-    if compare and history['newsletter']['metrics']:
-        # Get last week's metrics
-        previous = history['newsletter']['metrics'][-1]
+    # Last week's metrics, read through the date index
+    previous_metrics = query_metrics(last=1) if compare else []
+
+    if previous_metrics:
+        previous = previous_metrics[0]
+
+        def pair(section, field):
+            """This and last week's value, or None if either is unreported"""
+            now = current_metrics.get(section, {}).get(field)
+            before = previous.get(section, {}).get(field)
+            return None if now is None or before is None else (now, before)
 
-        # Calculate changes
+        # Calculate changes; unreported fields have no change
+        subscribers = pair('subscribers', 'total')
+        open_rate = pair('engagement', 'open_rate')
+        ctr = pair('engagement', 'click_through_rate')
         report['changes'] = {
-            'subscriber_growth': calculate_growth_rate(
-                current_metrics['subscribers']['total'],
-                previous['subscribers']['total']
-            ),
-            'open_rate_change': current_metrics['engagement']['open_rate'] -
-                                previous['engagement']['open_rate'],
-            'ctr_change': current_metrics['engagement']['click_through_rate'] -
-                         previous['engagement']['click_through_rate']
+            'subscriber_growth': calculate_growth_rate(*subscribers) if subscribers else None,
+            'open_rate_change': open_rate[0] - open_rate[1] if open_rate else None,
+            'ctr_change': ctr[0] - ctr[1] if ctr else None
         }
 
-    # Save current metrics to history
-    history['newsletter']['metrics'].append(current_metrics)
-    save_analytics_history(history)
+    # Append current metrics to the store
+    if 'partial' in current_metrics:
+        print("⚠ Partial metrics not saved to history")
+    else:
+        append_metrics(current_metrics)
 
     return report
 
 
-def generate_monthly_report():
+def _summary_report(period, frame, start=None, end=None):
+    """Build a summary report dict from a metrics window"""
+    summary, trends = summarize_metrics(frame)
+    report = {
+        'period': period,
+        'date': datetime.now().isoformat(),
+        'summary': summary,
+        'trends': trends
+    }
+    if start is not None:
+        report['range'] = {'start': start, 'end': end}
+    return report
+
+
+def generate_monthly_report(month=None):
     """
     Generate monthly analytics report
 
+    The month is a calendar month selected by date, so missed or repeated
+    weekly runs cannot shift the window.
+
+    Args:
+        month (str): Month as YYYY-MM (defaults to the month of the latest record)
+
     Returns:
         dict: Monthly report
     """
@@ -177,37 +1922,133 @@ def generate_monthly_report():
     print("MONTHLY ANALYTICS REPORT")
     print("="*60 + "\n")
 
-    history = load_analytics_history()
-
-    # Get last 4 weeks of data
-    recent_metrics = history['newsletter']['metrics'][-4:]
+    anchor = datetime.strptime(month, '%Y-%m') if month else latest_metrics_date()
+    report = _calendar_report('month', anchor) if anchor else None
 
-    if not recent_metrics:
+    if report is None:
         print("⚠ Insufficient data for monthly report")
-        return None
+    return report
+
+
+def _calendar_report(period, anchor):
+    """
+    Summary report for the calendar month, quarter or year of ``anchor``
 
-    # Calculate monthly averages
-    avg_open_rate = sum(m['engagement']['open_rate'] for m in recent_metrics) / len(recent_metrics)
-    avg_ctr = sum(m['engagement']['click_through_rate'] for m in recent_metrics) / len(recent_metrics)
+    Totals, averages, growth and trends come from the precomputed rollup,
+    as does the comparison with the previous period. Only the percentile
+    and EWMA figures read the period's records, through the date index.
 
-    total_new_subscribers = sum(m['subscribers']['new_this_week'] for m in recent_metrics)
+    Returns:
+        dict | None: Report, or None when the period has no data
+    """
+    current = read_rollup(period, rollup_key(period, anchor))
+    if current is None:
+        return None
+
+    start, end = period_bounds(period, anchor)
+    summary, trends = rollup_summary(current)
+    summary.update(distribution_stats(one_per_week(load_metrics_frame(start=start, end=end))))
+    summary.update(_unique_reader_stats(start, end))
 
     report = {
-        'period': 'month',
+        'period': period,
         'date': datetime.now().isoformat(),
-        'summary': {
-            'avg_open_rate': round(avg_open_rate, 2),
-            'avg_click_through_rate': round(avg_ctr, 2),
-            'total_new_subscribers': total_new_subscribers,
-            'total_revenue': sum(m['revenue']['total'] for m in recent_metrics)
-        },
-        'trends': {
-            'open_rate_trend': 'increasing' if recent_metrics[-1]['engagement']['open_rate'] >
-                                              recent_metrics[0]['engagement']['open_rate'] else 'decreasing',
-            'subscriber_trend': 'growing' if total_new_subscribers > 0 else 'stable'
+        'summary': summary,
+        'trends': trends,
+        'range': {
+            'start': start,
+            'end': (datetime.fromisoformat(end) - timedelta(days=1)).date().isoformat()
         }
     }
 
+    previous_start = (pd.Period(anchor, freq=PERIOD_FREQUENCIES[period]) - 1).start_time
+    previous = read_rollup(period, rollup_key(period, previous_start))
+    if previous is not None:
+        report['comparison'] = compare_rollups(current, previous)
+    return report
+
+
+def one_per_week(frame):
+    """
+    Keep only the latest record of each calendar week
+
+    Weekly runs repeated within a week would otherwise be counted twice.
+
+    Args:
+        frame (pandas.DataFrame): From load_metrics_frame()
+
+    Returns:
+        pandas.DataFrame: At most one row per week, in date order
+    """
+    if frame.empty:
+        return frame
+    weeks = frame.index.to_period('W')
+    return frame[~weeks.duplicated(keep='last')]
+
+
+def latest_metrics_date():
+    """
+    Date of the most recent metrics record
+
+    Returns:
+        datetime | None: Latest record date, or None for an empty store
+    """
+    with contextlib.closing(open_analytics_store()) as conn:
+        latest = conn.execute("SELECT MAX(date) FROM metrics").fetchone()[0]
+    return datetime.fromisoformat(latest) if latest else None
+
+
+def period_bounds(period, anchor):
+    """
+    Calendar bounds of the month, quarter or year containing ``anchor``
+
+    Args:
+        period (str): 'month', 'quarter' or 'year'
+        anchor (datetime): Any moment inside the period
+
+    Returns:
+        tuple: (start, end) ISO dates, end exclusive
+    """
+    span = pd.Period(anchor, freq=PERIOD_FREQUENCIES[period])
+    return span.start_time.date().isoformat(), (span + 1).start_time.date().isoformat()
+
+
+def generate_period_report(period, start=None, end=None):
+    """
+    Generate a quarterly, yearly or custom-range analytics report
+
+    Quarter and year cover the calendar period of the latest record and
+    are read from rollups. A custom range needs ``start`` and ``end`` and
+    is summarized from its records.
+
+    Args:
+        period (str): 'quarter', 'year' or 'custom'
+        start (str): First ISO date of a custom range
+        end (str): Last ISO date of a custom range (inclusive)
+
+    Returns:
+        dict: Period report, or None when the period has no data
+    """
+    title = PERIOD_TITLES[period]
+    print("\n" + "="*60)
+    print(f"{title.upper()} ANALYTICS REPORT")
+    print("="*60 + "\n")
+
+    if period == 'custom':
+        if not (start and end):
+            raise ValueError("A custom period needs both start and end dates")
+        end = (datetime.fromisoformat(end) + timedelta(days=1)).date().isoformat()
+        frame = one_per_week(load_metrics_frame(start=start, end=end))
+        last_day = (datetime.fromisoformat(end) - timedelta(days=1)).date().isoformat()
+        report = None if frame.empty else _summary_report(period, frame, start, last_day)
+        if report is not None:
+            report['summary'].update(_unique_reader_stats(start, end))
+    else:
+        anchor = latest_metrics_date()
+        report = _calendar_report(period, anchor) if anchor else None
+
+    if report is None:
+        print(f"⚠ Insufficient data for {title.lower()} report")
     return report
 
 
@@ -221,54 +2062,109 @@ def format_report_markdown(report):
     Returns:
         str: Markdown formatted report
     """
-    period = report['period'].upper()
-    md = [f"# {period}LY NEWSLETTER ANALYTICS\n"]
+    title = PERIOD_TITLES[report['period']]
+    md = [f"# {title.upper()} NEWSLETTER ANALYTICS\n"]
     md.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+    if 'range' in report:
+        md.append(f"**Period:** {report['range']['start']} to {report['range']['end']}\n")
     md.append("---\n")
 
-    if period == "WEEK":
-        # Weekly report format
+    if report['period'] == 'week':
+        # Weekly report format; fields no provider reported show as n/a
+        def figure(value, spec='', unit='', currency=''):
+            return "n/a" if value is None else f"{currency}{value:{spec}}{unit}"
+
         current = report['current']
+        if current.get('partial'):
+            md.append(f"**Partial:** no data from {', '.join(current['partial'])}; "
+                      "totals undercount and were not saved\n")
 
+        subscribers = current['subscribers']
         md.append("## Subscribers")
-        md.append(f"- **Total:** {current['subscribers']['total']:,}")
-        md.append(f"- **New this week:** {current['subscribers']['new_this_week']}")
-        md.append(f"- **Unsubscribed:** {current['subscribers']['unsubscribed']}")
-        md.append(f"- **Net growth:** {current['subscribers']['net_growth']}\n")
+        md.append(f"- **Total:** {figure(subscribers['total'], ',')}")
+        md.append(f"- **New this week:** {figure(subscribers['new_this_week'])}")
+        md.append(f"- **Unsubscribed:** {figure(subscribers['unsubscribed'])}")
+        md.append(f"- **Net growth:** {figure(subscribers['net_growth'])}\n")
 
+        engagement = current['engagement']
         md.append("## Engagement")
-        md.append(f"- **Open rate:** {current['engagement']['open_rate']}%")
-        md.append(f"- **Click-through rate:** {current['engagement']['click_through_rate']}%")
-        md.append(f"- **Total opens:** {current['engagement']['total_opens']:,}")
-        md.append(f"- **Total clicks:** {current['engagement']['total_clicks']}\n")
+        md.append(f"- **Open rate:** {figure(engagement['open_rate'], unit='%')}")
+        md.append(f"- **Click-through rate:** {figure(engagement['click_through_rate'], unit='%')}")
+        md.append(f"- **Total opens:** {figure(engagement['total_opens'], ',')}")
+        md.append(f"- **Total clicks:** {figure(engagement['total_clicks'])}\n")
 
         md.append("## Top Performing")
-        md.append(f"- **Most opened:** {current['top_performing']['most_opened']}")
-        md.append(f"- **Most clicked:** {current['top_performing']['most_clicked']}")
-        md.append(f"- **Avg read time:** {current['top_performing']['avg_read_time']}\n")
+        top = current['top_performing']
+        md.append(f"- **Most opened:** {top.get('most_opened', 'n/a')}")
+        md.append(f"- **Most clicked:** {top.get('most_clicked', 'n/a')}")
+        md.append(f"- **Avg read time:** {top.get('avg_read_time', 'n/a')}\n")
 
+        revenue = current['revenue']
         md.append("## Revenue")
-        md.append(f"- **Monthly recurring:** ${current['revenue']['monthly_recurring']:,}")
-        md.append(f"- **Sponsors:** ${current['revenue']['sponsors']:,}")
-        md.append(f"- **Total:** ${current['revenue']['total']:,}\n")
+        recurring = figure(revenue['monthly_recurring'], ',', currency='$')
+        md.append(f"- **Monthly recurring:** {recurring}")
+        md.append(f"- **Sponsors:** {figure(revenue['sponsors'], ',', currency='$')}")
+        md.append(f"- **Total:** {figure(revenue['total'], ',', currency='$')}\n")
 
         # Week-over-week changes
         if 'changes' in report and report['changes']:
             md.append("## Week-over-Week Changes")
             changes = report['changes']
-            md.append(f"- **Subscriber growth:** {changes['subscriber_growth']:+.1f}%")
-            md.append(f"- **Open rate change:** {changes['open_rate_change']:+.1f}%")
-            md.append(f"- **CTR change:** {changes['ctr_change']:+.1f}%\n")
+            growth, open_change = changes['subscriber_growth'], changes['open_rate_change']
+            md.append(f"- **Subscriber growth:** {figure(growth, '+.1f', '%')}")
+            md.append(f"- **Open rate change:** {figure(open_change, '+.1f', '%')}")
+            md.append(f"- **CTR change:** {figure(changes['ctr_change'], '+.1f', '%')}\n")
+
+    elif report['period'] == 'cohort':
+        # Retention matrix: one row per weekly cohort, one column per week of age
+        def cell(value):
+            return "" if value is None else f"{value:.0f}%"
+
+        ages = len(report['average_retention'])
+        md.append("## Retention by Weekly Cohort")
+        md.append("| Cohort | Size | " + " | ".join(f"W{k}" for k in range(ages)) + " |")
+        md.append("|---|---:|" + "---:|" * ages)
+        for cohort in report['cohorts']:
+            cells = " | ".join(cell(value) for value in cohort['retention'])
+            md.append(f"| {cohort['week']} | {cohort['size']:,} | {cells} |")
+        averages = " | ".join(cell(value) for value in report['average_retention'])
+        md.append(f"| **Average** | | {averages} |\n")
 
     else:
-        # Monthly report format
+        # Summary report format (month, quarter, year, custom)
         summary = report['summary']
 
-        md.append("## Monthly Summary")
+        md.append(f"## {title} Summary")
         md.append(f"- **Avg open rate:** {summary['avg_open_rate']}%")
         md.append(f"- **Avg click-through rate:** {summary['avg_click_through_rate']}%")
         md.append(f"- **Total new subscribers:** {summary['total_new_subscribers']}")
-        md.append(f"- **Total revenue:** ${summary['total_revenue']:,}\n")
+        md.append(f"- **Total revenue:** ${summary['total_revenue']:,}")
+        if summary.get('open_rate_p50') is not None:
+            md.append(f"- **Open rate p50 / p90:** {summary['open_rate_p50']}%"
+                      f" / {summary['open_rate_p90']}%")
+            md.append(f"- **Open rate EWMA:** {summary['open_rate_ewma']}%")
+        rolling = []
+        if summary.get('rolling_open_rate') is not None:
+            rolling.append(f"{summary['rolling_open_rate']}% open rate")
+        if summary.get('rolling_new_subscribers') is not None:
+            rolling.append(f"{summary['rolling_new_subscribers']:,} new subscribers")
+        if rolling:
+            md.append(f"- **Last {ROLLING_WINDOW} weeks:** {', '.join(rolling)}")
+        if summary.get('subscriber_growth') is not None:
+            md.append(f"- **Subscriber growth:** {summary['subscriber_growth']:+.1f}%")
+        if summary.get('unique_openers') is not None:
+            md.append(f"- **Unique openers / clickers:** ~{summary['unique_openers']:,}"
+                      f" / ~{summary['unique_clickers']:,}")
+        md.append("")
+
+        if 'comparison' in report:
+            comparison = report['comparison']
+            md.append(f"## vs {comparison['previous']}")
+            md.append(f"- **New subscribers:** {comparison['new_subscribers_growth']:+.1f}%")
+            md.append(f"- **Revenue:** {comparison['revenue_growth']:+.1f}%")
+            if comparison['open_rate_change'] is not None:
+                md.append(f"- **Open rate change:** {comparison['open_rate_change']:+.1f}%")
+            md.append("")
 
         md.append("## Trends")
         trends = report['trends']
@@ -281,6 +2177,220 @@ def format_report_markdown(report):
     return "\n".join(md)
 
 
+def iter_export_rows(table='metrics', start=None, end=None, batch_rows=EXPORT_BATCH_ROWS):
+    """
+    Stream rows of an EXPORT_TABLES table in date order, in batches
+
+    Rows come from a cursor ``batch_rows`` at a time, so exports of the
+    full history run in constant memory.
+
+    Args:
+        table (str): EXPORT_TABLES key
+        start (str): Earliest ISO date to include
+        end (str): ISO date to stop before (exclusive)
+        batch_rows (int): Rows per batch
+
+    Yields:
+        list: Row tuples in EXPORT_TABLES column order
+    """
+    source, date_column, columns = EXPORT_TABLES[table]
+    clauses, params = [], []
+    if start is not None:
+        clauses.append(f"{date_column} >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append(f"{date_column} < ?")
+        params.append(end)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    with contextlib.closing(open_analytics_store()) as conn:
+        cursor = conn.execute(
+            f"SELECT {', '.join(name for name, _ in columns)} FROM {source} {where} "
+            f"ORDER BY {date_column}, rowid",
+            params
+        )
+        while batch := cursor.fetchmany(batch_rows):
+            yield batch
+
+
+@contextlib.contextmanager
+def _replacing(path):
+    """
+    Temporary path that replaces ``path`` only once the block completes
+
+    Exporters write here, so a failure mid-stream leaves any previous
+    export in place instead of a truncated file.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def export_csv(path, table='metrics', start=None, end=None):
+    """Write an EXPORT_TABLES table as CSV; returns the number of rows"""
+    rows = 0
+    with _replacing(path) as tmp_path, open(tmp_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(name for name, _ in EXPORT_TABLES[table][2])
+        for batch in iter_export_rows(table, start, end):
+            writer.writerows(batch)
+            rows += len(batch)
+    return rows
+
+
+def export_html(path, table='metrics', start=None, end=None):
+    """Write an EXPORT_TABLES table as a standalone HTML table; returns the number of rows"""
+    rows = 0
+    columns = [name for name, _ in EXPORT_TABLES[table][2]]
+    with _replacing(path) as tmp_path, open(tmp_path, 'w') as f:
+        f.write(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>Newsletter analytics: {table}</title>\n</head>\n<body>\n<table>\n"
+        )
+        f.write("<thead><tr>" + "".join(f"<th>{name}</th>" for name in columns) + "</tr></thead>\n")
+        f.write("<tbody>\n")
+        for batch in iter_export_rows(table, start, end):
+            f.writelines(
+                "<tr>" + "".join(
+                    f"<td>{'' if value is None else html.escape(str(value))}</td>" for value in row
+                ) + "</tr>\n"
+                for row in batch
+            )
+            rows += len(batch)
+        f.write("</tbody>\n</table>\n</body>\n</html>\n")
+    return rows
+
+
+def export_parquet(path, table='metrics', start=None, end=None):
+    """
+    Write an EXPORT_TABLES table as Parquet; returns the number of rows
+
+    Each streamed batch becomes one row group. Needs the optional
+    ``pyarrow`` dependency (``pip install -e ".[parquet]"``).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError(
+            'Parquet export needs pyarrow: uv pip install -e ".[parquet]"'
+        ) from e
+
+    columns = EXPORT_TABLES[table][2]
+    schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in columns])
+    rows = 0
+    with _replacing(path) as tmp_path, pq.ParquetWriter(tmp_path, schema) as writer:
+        for batch in iter_export_rows(table, start, end):
+            arrays = [
+                pa.array([row[i] for row in batch], type=schema.field(i).type)
+                for i in range(len(columns))
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            rows += len(batch)
+    return rows
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'html': export_html,
+    'parquet': export_parquet,
+}
+
+
+def generate_report(period, month=None, start=None, end=None):
+    """
+    Generate the report for any stored-data period (everything but 'week')
+
+    Returns:
+        dict | None: Report, or None when the period has no data
+    """
+    if period == 'month':
+        return generate_monthly_report(month)
+    if period == 'cohort':
+        return generate_cohort_report()
+    return generate_period_report(period, start, end)
+
+
+def _mark_cached(rendered, output):
+    """
+    Label a cached render, whose timestamp is from when it was first built
+
+    Markdown gets a note on its **Generated:** line; JSON gets
+    ``"cached": true`` next to its ``date``.
+    """
+    if output == 'json':
+        report = json.loads(rendered)
+        report['cached'] = True
+        return json.dumps(report, indent=2)
+
+    marker = "**Generated:** "
+    at = rendered.find(marker)
+    if at == -1:
+        return rendered
+    line_end = rendered.find("\n", at)
+    line_end = len(rendered) if line_end == -1 else line_end
+    return rendered[:line_end] + CACHED_NOTE + rendered[line_end:]
+
+
+def render_report(period, output='markdown', month=None, start=None, end=None):
+    """
+    Rendered report text, cached by period, range and data version
+
+    Every write to the store advances ``data_version`` in its meta table,
+    so a cached render is reused until the underlying data changes (or
+    REPORT_RENDER_VERSION does). A reused render keeps its original
+    generation time and is labelled as cached (see _mark_cached()).
+    Weekly reports fetch live metrics and append them, so they are never
+    cached.
+
+    Args:
+        period (str): Any PERIOD_TITLES key except 'week'
+        output (str): 'markdown' or 'json'
+        month (str): YYYY-MM for a monthly report
+        start (str): First ISO date of a custom range
+        end (str): Last ISO date of a custom range (inclusive)
+
+    Returns:
+        str | None: Rendered report, or None when the period has no data
+    """
+    if period == 'week':
+        raise ValueError("Weekly reports fetch live metrics and are not cached")
+    range_key = {'month': month or '', 'custom': f"{start}..{end}"}.get(period, '')
+    key = (period, range_key, output)
+
+    with contextlib.closing(open_analytics_store()) as conn:
+        version = _get_meta(conn, 'data_version') or '0'
+        row = conn.execute(
+            """
+            SELECT rendered FROM report_cache
+            WHERE period = ? AND range = ? AND output = ?
+                AND data_version = ? AND render_version = ?
+            """,
+            (*key, version, REPORT_RENDER_VERSION)
+        ).fetchone()
+    if row:
+        return _mark_cached(row[0], output)
+
+    report = generate_report(period, month, start, end)
+    if report is None:
+        return None
+    rendered = (
+        format_report_markdown(report) if output == 'markdown' else json.dumps(report, indent=2)
+    )
+
+    # Keyed by the version read before generating: a concurrent write only costs a re-render
+    with contextlib.closing(open_analytics_store()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO report_cache VALUES (?, ?, ?, ?, ?, ?)",
+            (*key, version, REPORT_RENDER_VERSION, rendered)
+        )
+    return rendered
+
+
 def main():
     """Main entry point for analytics_report script"""
     parser = argparse.ArgumentParser(
@@ -288,46 +2398,159 @@ def main():
     )
     parser.add_argument(
         '--period',
-        choices=['week', 'month'],
+        choices=list(PERIOD_TITLES),
         default='week',
         help='Report period'
     )
+    parser.add_argument(
+        '--month',
+        help='Month (YYYY-MM) for --period=month (default: month of the latest record)'
+    )
+    parser.add_argument(
+        '--start',
+        help='First date (YYYY-MM-DD) for --period=custom'
+    )
+    parser.add_argument(
+        '--end',
+        help='Last date (YYYY-MM-DD, inclusive) for --period=custom'
+    )
     parser.add_argument(
         '--output',
-        choices=['json', 'markdown'],
+        choices=['json', 'markdown', *EXPORTERS],
         default='markdown',
-        help='Output format'
+        help='Output format; csv, html and parquet export stored rows '
+             '(--start/--end or the full history)'
+    )
+    parser.add_argument(
+        '--table',
+        choices=list(EXPORT_TABLES),
+        default='metrics',
+        help='Table for csv/html/parquet exports'
+    )
+    parser.add_argument(
+        '--file',
+        help='Write the report or export to this path (markdown defaults to a dated '
+             'file in the data directory, json to stdout)'
     )
     parser.add_argument(
         '--compare',
         action='store_true',
         help='Compare with previous period'
     )
+    parser.add_argument(
+        '--ingest',
+        action='append',
+        metavar='PATH',
+        help='Ingest an open/click event export (.csv or .jsonl) and exit (repeatable)'
+    )
+    parser.add_argument(
+        '--ingest-subscribers',
+        action='append',
+        metavar='PATH',
+        help='Ingest a subscribe/unsubscribe event export (.csv or .jsonl) and exit (repeatable)'
+    )
+    parser.add_argument(
+        '--fixture',
+        action='append',
+        help='Replay a recorded provider payload instead of calling APIs (repeatable)'
+    )
 
     args = parser.parse_args()
 
+    # Normalize dates up front so a typo is a usage error, not a traceback
+    for flag in ('start', 'end'):
+        value = getattr(args, flag)
+        if value:
+            try:
+                setattr(args, flag, date.fromisoformat(value).isoformat())
+            except ValueError:
+                parser.error(f"--{flag} must be a date (YYYY-MM-DD), got {value!r}")
+    if args.start and args.end and args.start > args.end:
+        parser.error("--start must not be after --end")
+    if args.month:
+        try:
+            args.month = datetime.strptime(args.month, '%Y-%m').strftime('%Y-%m')
+        except ValueError:
+            parser.error(f"--month must be a month (YYYY-MM), got {args.month!r}")
+
+    try:
+        from dotenv import load_dotenv
+        load_dotenv('.env.local')
+    except ImportError:
+        pass
+
+    for path in args.ingest or []:
+        stats = ingest_events(path)
+        if stats['duplicate']:
+            print(f"⚠ {path}: already ingested")
+        else:
+            print(f"✓ {path}: {stats['events']:,} events ({stats['skipped']:,} skipped)")
+    for path in args.ingest_subscribers or []:
+        stats = ingest_subscriber_events(path)
+        print(f"✓ {path}: {stats['events']:,} events ({stats['skipped']:,} skipped)")
+    if args.ingest or args.ingest_subscribers:
+        return
+
+    if args.fixture and (args.period != 'week' or args.output in EXPORTERS):
+        parser.error("--fixture only applies to --period=week reports")
+
+    if args.output in EXPORTERS:
+        end = args.end and (date.fromisoformat(args.end) + timedelta(days=1)).isoformat()
+        export_file = Path(args.file) if args.file else (
+            DATA_DIR / f"analytics_{args.table}_{datetime.now().strftime('%Y%m%d')}.{args.output}"
+        )
+        try:
+            rows = EXPORTERS[args.output](export_file, args.table, args.start, end)
+        except RuntimeError as e:
+            parser.error(str(e))
+        print(f"✓ Exported {rows:,} rows to: {export_file}")
+        return
+
     # Generate report
+    if args.period == 'custom' and not (args.start and args.end):
+        parser.error("--period=custom requires --start and --end")
+
     if args.period == 'week':
-        report = generate_weekly_report(compare=args.compare)
+        providers = [FixtureProvider(path) for path in args.fixture] if args.fixture else None
+        try:
+            report = generate_weekly_report(compare=args.compare, providers=providers)
+        except MetricsUnavailableError as e:
+            parser.exit(1, f"✗ {e}\n")
+        if not report:
+            return
+        rendered = (
+            format_report_markdown(report) if args.output == 'markdown'
+            else json.dumps(report, indent=2)
+        )
     else:
-        report = generate_monthly_report()
-
-    if not report:
-        return
+        rendered = render_report(args.period, args.output, args.month, args.start, args.end)
+        if rendered is None:
+            return
 
     # Output report
     if args.output == 'markdown':
-        markdown_report = format_report_markdown(report)
-        print("\n" + markdown_report)
-
-        # Save to file
-        report_file = DATA_DIR / f"analytics_report_{args.period}_{datetime.now().strftime('%Y%m%d')}.md"
-        with open(report_file, 'w') as f:
-            f.write(markdown_report)
-        print(f"\n✓ Report saved to: {report_file}")
+        print("\n" + rendered)
+
+        # Save to file, unless an identical (cached) render is already there;
+        # files always hold the render without the cached note
+        report_file = Path(args.file) if args.file else (
+            DATA_DIR / f"analytics_report_{args.period}_{datetime.now().strftime('%Y%m%d')}.md"
+        )
+        saved = rendered.replace(CACHED_NOTE, "", 1)
+        if report_file.exists() and report_file.read_text() == saved:
+            print(f"\n✓ Report unchanged: {report_file}")
+        else:
+            with open(report_file, 'w') as f:
+                f.write(saved)
+            print(f"\n✓ Report saved to: {report_file}")
+
+    elif args.file:
+        with open(args.file, 'w') as f:
+            f.write(rendered)
+        print(f"✓ Report saved to: {args.file}")
 
     else:
-        print(json.dumps(report, indent=2))
+        print(rendered)
 
 
 if __name__ == '__main__':
@@ -4,19 +4,467 @@ fact_check.py - Validate claims against sources
 
 Usage:
     python fact_check.py --draft=content/drafts/essay.md --strict
+    python fact_check.py --drafts-dir=content/drafts
+    python fact_check.py --draft=content/drafts/essay.md --profile --profile-dump=fact_check.prof
+    python fact_check.py --drafts-dir=content/drafts --log-json=fact_check.log.jsonl
     python fact_check.py --claim="GPT-4 has 1.7T parameters"
+    python fact_check.py --compile
+    python fact_check.py --sweep --max-age-days=180 --workers=8
 """
 
 import argparse
+import cProfile
+import hashlib
 import json
+import logging
+import math
+import mmap
+import os
 import re
+import struct
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+import requests
+
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / "data"
 FACT_CHECK_LIBRARY = DATA_DIR / "fact_check_library.json"
 
+# All output goes through this logger; main() attaches the console and JSON
+# handlers. Per-claim lines are DEBUG so batch runs can drop them cheaply.
+logger = logging.getLogger("fact_check")
+logger.addHandler(logging.NullHandler())
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+
+# Compiled snapshot layout (little-endian):
+#   header  - magic, format version, field count, entry count,
+#             source size, source mtime_ns, source sha256, reserved
+#   records - one row per entry: (offset, length) per string field + confidence
+#   index   - (hash, entry) pairs sorted by hash of the lowercased claim
+#   strings - UTF-8 string table, field-major so claim scans stay contiguous
+SNAPSHOT_SUFFIX = ".bin"
+SNAPSHOT_MAGIC = b"FCLB"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FIELDS = ('claim_lower', 'claim', 'source_url', 'verification_date', 'context', 'category')
+SNAPSHOT_HEADER = struct.Struct('<4sHHIqq32sI')
+SNAPSHOT_RECORD = struct.Struct('<' + 'II' * len(SNAPSHOT_FIELDS) + 'd')
+SNAPSHOT_INDEX = struct.Struct('<QI')
+SNAPSHOT_ABSENT = 0xFFFFFFFF
+
+# Shared verification cache, stored alongside the library it was built from
+CLAIM_CACHE_NAME = "claim_cache.json"
+# Bump when cache keys change meaning; caches in another format are discarded
+CLAIM_CACHE_FORMAT = 2
+
+# Staleness sweep settings
+SWEEP_CHECKPOINT = DATA_DIR / "fact_check_sweep.jsonl"
+SWEEP_MAX_AGE_DAYS = 180
+SWEEP_WORKERS = 8
+SWEEP_TIMEOUT = 10
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    One JSON object per record: timestamp, level, message and event fields
+
+    Event fields sit at the top level, except ones that would overwrite
+    the record's own keys; those are kept under ``fields`` instead.
+    """
+
+    RESERVED = ('ts', 'level', 'logger', 'message', 'fields')
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage().strip()
+        }
+        clashing = {}
+        for key, value in getattr(record, 'fields', {}).items():
+            (clashing if key in self.RESERVED else entry)[key] = value
+        if clashing:
+            entry['fields'] = clashing
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level='INFO', json_path=None, stream=None):
+    """
+    Configure fact_check output
+
+    Args:
+        level (str): Minimum level for console and JSON output
+        json_path (str): Optional JSON-lines log file
+        stream: Console stream (defaults to stdout)
+    """
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    console = logging.StreamHandler(stream or sys.stdout)
+    console.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(console)
+
+    if json_path:
+        json_handler = logging.FileHandler(json_path, mode='a', encoding='utf-8')
+        json_handler.setFormatter(JsonLogFormatter())
+        # Decorative console lines carry no event fields; keep them out of the sink
+        json_handler.addFilter(lambda record: bool(getattr(record, 'fields', None)))
+        logger.addHandler(json_handler)
+
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def _log(level, message, /, *args, **fields):
+    """Log a message with structured fields for the JSON sink"""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, *args, extra={'fields': fields})
+
+
+def _claim_hash(claim_lower):
+    """Stable 64-bit hash of a lowercased claim for the snapshot index"""
+    digest = hashlib.blake2b(claim_lower.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class LibrarySnapshot:
+    """
+    Read-only, memory-mapped view of a compiled fact-check library
+
+    Only the pages touched by a lookup are read from disk: the sorted hash
+    index locates an exact match, and substring matches scan the contiguous
+    block of lowercased claims up to it.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (magic, version, field_count, count, self.source_size, self.source_mtime_ns,
+             digest, _) = SNAPSHOT_HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"Truncated fact-check snapshot: {path}") from None
+
+        if (magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION
+                or field_count != len(SNAPSHOT_FIELDS)):
+            self._mm.close()
+            raise ValueError(f"Unsupported fact-check snapshot: {path}")
+
+        self.count = count
+        self.source_digest = digest.hex()
+        self._records_offset = SNAPSHOT_HEADER.size
+        self._index_offset = self._records_offset + count * SNAPSHOT_RECORD.size
+        self._strings_offset = self._index_offset + count * SNAPSHOT_INDEX.size
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+    def __getitem__(self, i):
+        """Return entry ``i`` as a library dict"""
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+
+        record = self._record(i)
+        entry = {}
+        for slot, field in enumerate(SNAPSHOT_FIELDS[1:], 1):
+            value = self._string(record, slot)
+            if value is not None:
+                entry[field] = value
+        if not math.isnan(record[-1]):
+            entry['confidence'] = record[-1]
+        return entry
+
+    def _record(self, i):
+        return SNAPSHOT_RECORD.unpack_from(
+            self._mm, self._records_offset + i * SNAPSHOT_RECORD.size
+        )
+
+    def _index_entry(self, position):
+        """(claim hash, entry index) at a position of the sorted hash index"""
+        return SNAPSHOT_INDEX.unpack_from(
+            self._mm, self._index_offset + position * SNAPSHOT_INDEX.size
+        )
+
+    def _string(self, record, slot):
+        offset, length = record[2 * slot], record[2 * slot + 1]
+        if length == SNAPSHOT_ABSENT:
+            return None
+        start = self._strings_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def claim_lower(self, i):
+        return self._string(self._record(i), 0)
+
+    def find_exact(self, claim_lower):
+        """Binary-search the hash index for an exact (lowercased) claim"""
+        target = _claim_hash(claim_lower)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            h, _ = self._index_entry(mid)
+            if h < target:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        while lo < self.count:
+            h, i = self._index_entry(lo)
+            if h != target:
+                break
+            if self.claim_lower(i) == claim_lower:
+                return i
+            lo += 1
+        return None
+
+    def find(self, claim_lower):
+        """
+        Find the library entry matching a claim
+
+        Returns the first entry, in library order, that contains or is
+        contained in the claim, exactly as find_verified_claim() scans the
+        JSON list. An exact match is itself such an entry, so it only
+        bounds the scan to the entries before it.
+
+        Returns:
+            tuple: (entry index or None, number of entries compared)
+        """
+        exact = self.find_exact(claim_lower)
+        for i in range(self.count if exact is None else exact):
+            verified_lower = self.claim_lower(i)
+            if claim_lower in verified_lower or verified_lower in claim_lower:
+                return i, i + 1
+        if exact is not None:
+            return exact, exact + 1
+        return None, self.count
+
+    def close(self):
+        """Unmap the snapshot (safe to call more than once)"""
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def snapshot_path_for(library_path):
+    """Compiled snapshot location for a JSON library (stored alongside it)"""
+    return Path(library_path).with_suffix(SNAPSHOT_SUFFIX)
+
+
+def load_library():
+    """
+    Load the editable JSON fact-check library
+
+    Returns:
+        dict: Library with a ``verified_claims`` list
+    """
+    if FACT_CHECK_LIBRARY.exists():
+        with open(FACT_CHECK_LIBRARY, 'r') as f:
+            return json.load(f)
+    return {'verified_claims': []}
+
+
+def compile_library(library_path=None, snapshot_path=None):
+    """
+    Compile the JSON library into a memory-mappable binary snapshot
+
+    Args:
+        library_path (Path): JSON library (defaults to FACT_CHECK_LIBRARY)
+        snapshot_path (Path): Output file (defaults to alongside the library)
+
+    Returns:
+        Path: Path of the written snapshot
+    """
+    library_path = Path(library_path or FACT_CHECK_LIBRARY)
+    snapshot_path = Path(snapshot_path or snapshot_path_for(library_path))
+
+    raw = library_path.read_bytes()
+    stat = library_path.stat()
+    claims = json.loads(raw).get('verified_claims', [])
+
+    # Field-major string table: every claim_lower first, then every claim, ...
+    strings = bytearray()
+    slots = [[None] * len(SNAPSHOT_FIELDS) for _ in claims]
+    for slot, field in enumerate(SNAPSHOT_FIELDS):
+        for i, entry in enumerate(claims):
+            value = entry['claim'].lower() if field == 'claim_lower' else entry.get(field)
+            if value is None:
+                slots[i][slot] = (0, SNAPSHOT_ABSENT)
+                continue
+            encoded = str(value).encode('utf-8')
+            slots[i][slot] = (len(strings), len(encoded))
+            strings += encoded
+
+    records = bytearray()
+    for entry, entry_slots in zip(claims, slots, strict=True):
+        flat = [n for pair in entry_slots for n in pair]
+        confidence = entry.get('confidence')
+        confidence = float('nan') if confidence is None else float(confidence)
+        records += SNAPSHOT_RECORD.pack(*flat, confidence)
+
+    index = bytearray()
+    for h, i in sorted((_claim_hash(entry['claim'].lower()), i) for i, entry in enumerate(claims)):
+        index += SNAPSHOT_INDEX.pack(h, i)
+
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(SNAPSHOT_FIELDS), len(claims),
+        stat.st_size, stat.st_mtime_ns, hashlib.sha256(raw).digest(), 0
+    )
+
+    # Write to a sibling temp file and rename so readers never map a partial file
+    tmp_path = snapshot_path.with_name(snapshot_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(header + records + index + strings)
+    os.replace(tmp_path, snapshot_path)
+
+    _log(logging.INFO, "✓ Compiled %d claims to: %s", len(claims), snapshot_path,
+         event='library_compiled', claims=len(claims), path=str(snapshot_path))
+    return snapshot_path
+
+
+def open_library_snapshot():
+    """
+    Open the compiled snapshot for FACT_CHECK_LIBRARY if it is up to date
+
+    Returns:
+        LibrarySnapshot: Mapped snapshot, or None if missing, stale or unreadable
+    """
+    snapshot_path = snapshot_path_for(FACT_CHECK_LIBRARY)
+    if not snapshot_path.exists() or not FACT_CHECK_LIBRARY.exists():
+        return None
+
+    try:
+        snapshot = LibrarySnapshot(snapshot_path)
+    except (OSError, ValueError):
+        return None
+
+    # Fast path: unchanged size and mtime. A touched or re-checked-out
+    # library with the same size is still current if its content hash matches.
+    stat = FACT_CHECK_LIBRARY.stat()
+    if snapshot.source_size != stat.st_size or (
+        snapshot.source_mtime_ns != stat.st_mtime_ns
+        and hashlib.sha256(FACT_CHECK_LIBRARY.read_bytes()).hexdigest() != snapshot.source_digest
+    ):
+        snapshot.close()
+        return None
+
+    return snapshot
+
+
+@contextmanager
+def load_library_claims():
+    """
+    Load verified claims for lookups, preferring the compiled snapshot
+
+    A snapshot is unmapped when the ``with`` block exits.
+
+    Yields:
+        LibrarySnapshot or list: Snapshot view, or the JSON ``verified_claims`` list
+    """
+    snapshot = open_library_snapshot()
+    if snapshot is None:
+        yield load_library()['verified_claims']
+        return
+    with snapshot:
+        yield snapshot
+
+
+def find_verified_claim(claim_text, claims, profile=None):
+    """
+    Find the library entry matching a claim
+
+    Args:
+        claim_text (str): Claim to look up
+        claims (LibrarySnapshot or list): Claims from load_library_claims()
+        profile (dict): Profile to count scanned library entries into
+
+    Returns:
+        dict: Matching library entry, or None
+    """
+    claim_lower = claim_text.lower()
+
+    if isinstance(claims, LibrarySnapshot):
+        i, scanned = claims.find(claim_lower)
+        _count(profile, 'library_entries_scanned', scanned)
+        return claims[i] if i is not None else None
+
+    for scanned, verified in enumerate(claims, 1):
+        if claim_lower in verified['claim'].lower() or \
+           verified['claim'].lower() in claim_lower:
+            _count(profile, 'library_entries_scanned', scanned)
+            return verified
+
+    _count(profile, 'library_entries_scanned', len(claims))
+    return None
+
+
+def new_profile():
+    """Empty profile: per-stage wall time (seconds) and counters"""
+    return {'stages': {}, 'counts': {}}
+
+
+@contextmanager
+def _timed(profile, stage):
+    """Add the wall time of the block to ``profile['stages'][stage]``"""
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = profile['stages']
+        stages[stage] = stages.get(stage, 0.0) + time.perf_counter() - start
+
+
+def _count(profile, counter, n=1):
+    if profile is not None:
+        profile['counts'][counter] = profile['counts'].get(counter, 0) + n
+
+
+def format_profile(profile):
+    """Profile as report JSON: stage times in milliseconds plus counters"""
+    return {
+        'stages_ms': {
+            stage: round(seconds * 1000, 3) for stage, seconds in profile['stages'].items()
+        },
+        'counts': dict(profile['counts'])
+    }
+
+
+def read_draft(draft_path):
+    """
+    Read a draft file
+
+    Args:
+        draft_path (str): Path to draft markdown file
+
+    Returns:
+        str: Draft content, or None if the file does not exist
+    """
+    draft_file = Path(draft_path)
+    if not draft_file.exists():
+        _log(logging.ERROR, "Error: Draft file not found: %s", draft_path,
+             event='draft_missing', draft=str(draft_path))
+        return None
+
+    with open(draft_file, 'r') as f:
+        return f.read()
+
 
 def extract_claims_from_draft(draft_path):
     """
@@ -28,16 +476,26 @@ def extract_claims_from_draft(draft_path):
     Returns:
         list: Extracted claims with context
     """
-    print(f"Extracting claims from: {draft_path}")
+    _log(logging.DEBUG, "Extracting claims from: %s", draft_path,
+         event='extract', draft=str(draft_path))
 
-    draft_file = Path(draft_path)
-    if not draft_file.exists():
-        print(f"Error: Draft file not found: {draft_path}")
+    content = read_draft(draft_path)
+    if content is None:
         return []
 
-    with open(draft_file, 'r') as f:
-        content = f.read()
+    return extract_claims(content)
 
+
+def extract_claims(content):
+    """
+    Extract factual claims from draft text
+
+    Args:
+        content (str): Draft markdown
+
+    Returns:
+        list: Extracted claims with context
+    """
     # Extract claims (simple heuristic - look for sentences with numbers or statistics)
     claims = []
 
@@ -55,46 +513,50 @@ def extract_claims_from_draft(draft_path):
     citation_pattern = r'[^.!?]*\[([^\]]+)\]\(([^)]+)\)[^.!?]*[.!?]'
     cited_sentences = re.findall(citation_pattern, content)
 
-    print(f"Found {len(claims)} potential factual claims")
-    print(f"Found {len(cited_sentences)} citations")
+    _log(logging.DEBUG, "Found %d potential factual claims\nFound %d citations",
+         len(claims), len(cited_sentences),
+         event='claims_extracted', claims=len(claims), citations=len(cited_sentences))
 
     return claims
 
 
-def verify_claim(claim_text, strict=True):
+def verify_claim(claim_text, strict=True, claims=None, profile=None):
     """
     Verify a specific claim against fact-check library
 
     Args:
         claim_text (str): Claim to verify
         strict (bool): If True, require exact source match
+        claims (LibrarySnapshot or list): Preloaded library claims
+            (loaded from disk when omitted)
+        profile (dict): Profile to record library scan counts into
 
     Returns:
         dict: Verification result with confidence score
     """
-    print(f"Verifying claim: {claim_text[:100]}...")
+    _log(logging.DEBUG, "Verifying claim: %s...", claim_text[:100],
+         event='verify', claim=claim_text)
 
-    # Load fact-check library
-    if FACT_CHECK_LIBRARY.exists():
-        with open(FACT_CHECK_LIBRARY, 'r') as f:
-            library = json.load(f)
-    else:
-        library = {'verified_claims': []}
+    if claims is None:
+        with load_library_claims() as library_claims:
+            return verify_claim(claim_text, strict, library_claims, profile)
 
     # Check if claim exists in library
-    for verified in library['verified_claims']:
-        if claim_text.lower() in verified['claim'].lower() or \
-           verified['claim'].lower() in claim_text.lower():
-            print(f"✓ Claim found in library (verified: {verified['verification_date']})")
-            return {
-                'verified': True,
-                'confidence': 0.95,
-                'source': verified.get('source_url', 'Unknown'),
-                'verification_date': verified['verification_date']
-            }
+    verified = find_verified_claim(claim_text, claims, profile)
+    if verified is not None:
+        _log(logging.DEBUG, "✓ Claim found in library (verified: %s)",
+             verified['verification_date'],
+             event='claim_verified', claim=claim_text, source=verified.get('source_url'))
+        return {
+            'verified': True,
+            'confidence': 0.95,
+            'source': verified.get('source_url', 'Unknown'),
+            'verification_date': verified['verification_date']
+        }
 
     # Claim not in library - needs manual verification
-    print(f"⚠ Claim not in fact-check library - manual verification required")
+    _log(logging.DEBUG, "⚠ Claim not in fact-check library - manual verification required",
+         event='claim_unverified', claim=claim_text)
 
     if strict:
         return {
@@ -112,71 +574,259 @@ def verify_claim(claim_text, strict=True):
         }
 
 
-def check_draft(draft_path, strict=True):
+def library_version():
+    """
+    Content hash of the current fact-check library
+
+    Uses the digest recorded in a fresh compiled snapshot when available,
+    otherwise hashes the JSON file.
+
+    Returns:
+        str: Hex digest ('empty' when no library exists)
+    """
+    snapshot = open_library_snapshot()
+    if snapshot is not None:
+        with snapshot:
+            return snapshot.source_digest
+
+    if not FACT_CHECK_LIBRARY.exists():
+        return 'empty'
+    return hashlib.sha256(FACT_CHECK_LIBRARY.read_bytes()).hexdigest()
+
+
+def normalize_claim(claim_text):
+    """
+    Normalize claim text for cache lookups
+
+    Only lowercases, exactly as find_verified_claim() does before matching,
+    so two claims share a cache entry only if they would match the same way.
+    """
+    return claim_text.lower()
+
+
+def claim_cache_path():
+    """Location of the shared claim cache for the current library"""
+    return FACT_CHECK_LIBRARY.parent / CLAIM_CACHE_NAME
+
+
+def load_claim_cache():
+    """
+    Load the repository-wide claim cache for the current library version
+
+    The cache only holds results for a single library version; a cache
+    built against an older library is discarded.
+
+    Returns:
+        dict: Cache with ``library_version`` and ``entries``
+    """
+    version = library_version()
+    cache_path = claim_cache_path()
+
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'r') as f:
+                cache = json.load(f)
+            if (cache.get('format') == CLAIM_CACHE_FORMAT
+                    and cache.get('library_version') == version):
+                cache['dirty'] = False
+                return cache
+        except (json.JSONDecodeError, OSError):
+            pass
+
+    return {'library_version': version, 'entries': {}, 'dirty': True}
+
+
+def save_claim_cache(cache):
+    """
+    Save the claim cache if it changed
+
+    Args:
+        cache (dict): Cache from load_claim_cache()
+    """
+    if not cache.get('dirty'):
+        return
+
+    cache_path = claim_cache_path()
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'format': CLAIM_CACHE_FORMAT,
+            'library_version': cache['library_version'],
+            'updated': datetime.now().isoformat(),
+            'entries': cache['entries']
+        }, f, indent=2)
+    os.replace(tmp_path, cache_path)
+    cache['dirty'] = False
+
+
+def check_draft(draft_path, strict=True, cache=None, profile=False):
     """
     Run comprehensive fact-check on a draft essay
 
     Args:
         draft_path (str): Path to draft file
         strict (bool): Strict verification mode
+        cache (dict): Shared claim cache (loaded and saved here when omitted)
+        profile (bool): Record per-stage wall time and counters in
+            ``report['profile']``
 
     Returns:
         dict: Fact-check report
     """
-    print(f"\n{'='*60}")
-    print(f"FACT-CHECK REPORT: {draft_path}")
-    print(f"{'='*60}\n")
+    _log(logging.INFO, "\n%s\nFACT-CHECK REPORT: %s\n%s\n", '='*60, draft_path, '='*60,
+         event='draft_start', draft=str(draft_path))
 
-    claims = extract_claims_from_draft(draft_path)
+    stats = new_profile() if profile else None
+    started = time.perf_counter()
 
-    report = {
-        'draft': draft_path,
-        'check_date': datetime.now().isoformat(),
-        'total_claims': len(claims),
-        'verified': 0,
-        'unverified': 0,
-        'failed': 0,
-        'details': []
-    }
+    _log(logging.DEBUG, "Extracting claims from: %s", draft_path,
+         event='extract', draft=str(draft_path))
+    with _timed(stats, 'read'):
+        content = read_draft(draft_path)
+    with _timed(stats, 'extract'):
+        claims = extract_claims(content) if content is not None else []
+    _count(stats, 'claims_extracted', len(claims))
 
-    for claim in claims:
-        result = verify_claim(claim['claim'], strict)
+    with ExitStack() as library:
+        with _timed(stats, 'library_load'):
+            library_claims = library.enter_context(load_library_claims())
 
-        claim_report = {
-            'claim': claim['claim'],
-            'type': claim['type'],
-            'verification': result
+        owns_cache = cache is None
+        if owns_cache:
+            with _timed(stats, 'cache_load'):
+                cache = load_claim_cache()
+
+        report = {
+            'draft': draft_path,
+            'check_date': datetime.now().isoformat(),
+            'total_claims': len(claims),
+            'verified': 0,
+            'unverified': 0,
+            'failed': 0,
+            'cache_hits': 0,
+            'details': []
         }
 
-        if result['verified'] is True:
-            report['verified'] += 1
-        elif result['verified'] is False:
-            report['failed'] += 1
-        else:
-            report['unverified'] += 1
+        mode = 'strict' if strict else 'relaxed'
+        match_started = time.perf_counter()
+        for claim in claims:
+            cache_key = f"{mode}:{normalize_claim(claim['claim'])}"
+            result = cache['entries'].get(cache_key)
+
+            if result is not None:
+                report['cache_hits'] += 1
+            else:
+                result = verify_claim(claim['claim'], strict, library_claims, stats)
+                cache['entries'][cache_key] = result
+                cache['dirty'] = True
+
+            claim_report = {
+                'claim': claim['claim'],
+                'type': claim['type'],
+                'verification': result
+            }
 
-        report['details'].append(claim_report)
+            if result['verified'] is True:
+                report['verified'] += 1
+            elif result['verified'] is False:
+                report['failed'] += 1
+            else:
+                report['unverified'] += 1
+
+            report['details'].append(claim_report)
+
+    if stats is not None:
+        stats['stages']['match'] = time.perf_counter() - match_started
+        _count(stats, 'cache_hits', report['cache_hits'])
+        _count(stats, 'cache_misses', len(claims) - report['cache_hits'])
+
+    if owns_cache:
+        with _timed(stats, 'cache_save'):
+            save_claim_cache(cache)
+
+    if stats is not None:
+        stats['stages']['total'] = time.perf_counter() - started
+        report['profile'] = format_profile(stats)
 
     # Print summary
-    print(f"\nFACT-CHECK SUMMARY:")
-    print(f"Total claims analyzed: {report['total_claims']}")
-    print(f"✓ Verified: {report['verified']}")
-    print(f"⚠ Unverified: {report['unverified']}")
-    print(f"✗ Failed: {report['failed']}")
+    _log(logging.INFO,
+         "\nFACT-CHECK SUMMARY:\nTotal claims analyzed: %d\nCached results reused: %d\n"
+         "✓ Verified: %d\n⚠ Unverified: %d\n✗ Failed: %d",
+         report['total_claims'], report['cache_hits'],
+         report['verified'], report['unverified'], report['failed'],
+         event='draft_summary', draft=str(draft_path), total_claims=report['total_claims'],
+         cache_hits=report['cache_hits'], verified=report['verified'],
+         unverified=report['unverified'], failed=report['failed'])
+
+    if 'profile' in report:
+        timings = ", ".join(
+            f"{stage} {ms:.1f}ms" for stage, ms in report['profile']['stages_ms'].items()
+        )
+        _log(logging.INFO, "Profile: %s", timings,
+             event='profile', draft=str(draft_path), **report['profile'])
 
     if strict and report['failed'] > 0:
-        print(f"\n⚠ STRICT MODE: {report['failed']} claims failed verification")
-        print("Cannot proceed to publication until all claims are verified")
+        _log(logging.WARNING,
+             "\n⚠ STRICT MODE: %d claims failed verification\n"
+             "Cannot proceed to publication until all claims are verified",
+             report['failed'],
+             event='strict_failure', draft=str(draft_path), failed=report['failed'])
         return report
 
     if report['unverified'] > 0:
-        print(f"\n⚠ Warning: {report['unverified']} claims need manual verification")
+        _log(logging.WARNING, "\n⚠ Warning: %d claims need manual verification",
+             report['unverified'],
+             event='needs_review', draft=str(draft_path), unverified=report['unverified'])
 
-    print(f"\n{'='*60}\n")
+    _log(logging.INFO, "\n%s\n", '='*60)
 
     return report
 
 
+def save_report(report):
+    """
+    Save a fact-check report next to its draft
+
+    Args:
+        report (dict): Report from check_draft()
+
+    Returns:
+        Path: Path of the written ``<draft>_factcheck.json``
+    """
+    draft = Path(report['draft'])
+    report_path = draft.parent / f"{draft.stem}_factcheck.json"
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return report_path
+
+
+def check_drafts(draft_paths, strict=True, profile=False):
+    """
+    Fact-check several drafts against one shared claim cache
+
+    Claims repeated across drafts are verified once; the cache is saved
+    after the whole batch.
+
+    Args:
+        draft_paths (list): Draft file paths
+        strict (bool): Strict verification mode
+        profile (bool): Include a timing breakdown in each report
+
+    Returns:
+        list: One fact-check report per draft
+    """
+    cache = load_claim_cache()
+    reports = []
+
+    try:
+        for draft_path in draft_paths:
+            reports.append(check_draft(str(draft_path), strict, cache, profile))
+    finally:
+        save_claim_cache(cache)
+
+    return reports
+
+
 def add_to_library(claim, source_url, context=""):
     """
     Add a verified claim to the fact-check library
@@ -187,11 +837,7 @@ def add_to_library(claim, source_url, context=""):
         context (str): Additional context
     """
     # Load existing library
-    if FACT_CHECK_LIBRARY.exists():
-        with open(FACT_CHECK_LIBRARY, 'r') as f:
-            library = json.load(f)
-    else:
-        library = {'verified_claims': []}
+    library = load_library()
 
     # Add new verified claim
     new_entry = {
@@ -207,7 +853,207 @@ def add_to_library(claim, source_url, context=""):
     with open(FACT_CHECK_LIBRARY, 'w') as f:
         json.dump(library, f, indent=2)
 
-    print(f"✓ Added claim to fact-check library")
+    _log(logging.INFO, "✓ Added claim to fact-check library", event='claim_added', claim=claim)
+
+    # Keep an existing compiled snapshot in step with the JSON source
+    if snapshot_path_for(FACT_CHECK_LIBRARY).exists():
+        compile_library()
+
+
+def claim_key(entry):
+    """Stable identifier for a library entry (claim text + source URL)"""
+    text = f"{entry['claim']}\n{entry.get('source_url', '')}"
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def find_stale_claims(claims, max_age_days=SWEEP_MAX_AGE_DAYS, now=None):
+    """
+    Find library entries whose verification is older than max_age_days
+
+    Entries with a missing or unparseable verification date are treated
+    as stale.
+
+    Args:
+        claims (LibrarySnapshot or list): Library claims
+        max_age_days (int): Maximum verification age before an entry is stale
+        now (datetime): Reference time (defaults to now)
+
+    Returns:
+        list: Stale entries with key, claim, source_url and age_days
+    """
+    now = now or datetime.now()
+    stale = []
+
+    for entry in claims:
+        try:
+            verified_on = datetime.fromisoformat(entry['verification_date'])
+            age_days = (now - verified_on.replace(tzinfo=None)).days
+        except (KeyError, TypeError, ValueError):
+            age_days = None
+
+        if age_days is None or age_days > max_age_days:
+            stale.append({
+                'key': claim_key(entry),
+                'claim': entry['claim'],
+                'source_url': entry.get('source_url'),
+                'verification_date': entry.get('verification_date'),
+                'age_days': age_days
+            })
+
+    return stale
+
+
+def check_source_url(url, timeout=SWEEP_TIMEOUT):
+    """
+    Check that a claim's source URL still resolves
+
+    Args:
+        url (str): Source URL
+        timeout (int): Request timeout in seconds
+
+    Returns:
+        dict: status ('ok', 'broken' or 'error') and http_status
+    """
+    if not url:
+        return {'status': 'error', 'http_status': None, 'error': 'No source URL'}
+
+    try:
+        response = requests.head(url, timeout=timeout, allow_redirects=True)
+        # Some sites reject HEAD; retry those with a streamed GET
+        if response.status_code in (403, 405):
+            response = requests.get(url, timeout=timeout, allow_redirects=True, stream=True)
+            response.close()
+    except requests.RequestException as e:
+        return {'status': 'error', 'http_status': None, 'error': str(e)}
+
+    status = 'ok' if response.status_code < 400 else 'broken'
+    return {'status': status, 'http_status': response.status_code}
+
+
+def load_sweep_checkpoint(checkpoint_path, max_age_days):
+    """
+    Load results recorded by an interrupted sweep
+
+    A checkpoint is reused only if it was not completed and was started
+    with the same max_age_days.
+
+    Returns:
+        dict: Recorded results keyed by claim key (empty for a fresh sweep)
+    """
+    if not checkpoint_path.exists():
+        return {}
+
+    results = {}
+    with open(checkpoint_path, 'r') as f:
+        lines = [line for line in f if line.strip()]
+
+    try:
+        header = json.loads(lines[0]) if lines else {}
+    except json.JSONDecodeError:
+        return {}
+
+    if header.get('max_age_days') != max_age_days:
+        return {}
+
+    for line in lines[1:]:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A torn final line from an interrupted write
+            continue
+        if 'completed' in record:
+            return {}
+        results[record['key']] = record
+
+    return results
+
+
+def _trim_torn_line(checkpoint_path):
+    """Drop a final line cut short by an interrupted write, so appends start on a fresh line"""
+    with open(checkpoint_path, 'r+b') as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def sweep_library(max_age_days=SWEEP_MAX_AGE_DAYS, workers=SWEEP_WORKERS,
+                  checkpoint_path=None, timeout=SWEEP_TIMEOUT):
+    """
+    Re-check the sources of stale library entries
+
+    Sources are checked concurrently with a bounded thread pool. Each
+    result is appended to a JSONL checkpoint as soon as it arrives, so an
+    interrupted sweep resumes where it stopped instead of starting over.
+
+    Args:
+        max_age_days (int): Verification age that marks an entry stale
+        workers (int): Maximum concurrent source checks
+        checkpoint_path (Path): JSONL checkpoint (defaults to SWEEP_CHECKPOINT)
+        timeout (int): Per-request timeout in seconds
+
+    Returns:
+        dict: Sweep summary with per-entry results
+    """
+    checkpoint_path = Path(checkpoint_path or SWEEP_CHECKPOINT)
+    _log(logging.INFO, "Sweeping fact-check library for entries older than %d days...",
+         max_age_days, event='sweep_start', max_age_days=max_age_days)
+
+    with load_library_claims() as claims:
+        stale = find_stale_claims(claims, max_age_days)
+    results = load_sweep_checkpoint(checkpoint_path, max_age_days)
+    resumed = len(results)
+    pending = [entry for entry in stale if entry['key'] not in results]
+
+    if resumed:
+        _log(logging.INFO, "Resuming sweep: %d entries already checked", resumed,
+             event='sweep_resume', resumed=resumed)
+        _trim_torn_line(checkpoint_path)
+
+    _log(logging.INFO, "Found %d stale entries (%d to check)", len(stale), len(pending),
+         event='sweep_pending', stale=len(stale), pending=len(pending))
+
+    with open(checkpoint_path, 'a' if resumed else 'w') as checkpoint, \
+            ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        if not resumed:
+            checkpoint.write(json.dumps({
+                'started': datetime.now().isoformat(),
+                'max_age_days': max_age_days
+            }) + "\n")
+            checkpoint.flush()
+
+        futures = {
+            pool.submit(check_source_url, entry['source_url'], timeout): entry
+            for entry in pending
+        }
+        for future in as_completed(futures):
+            record = dict(futures[future], **future.result())
+            record['checked_at'] = datetime.now().isoformat()
+            results[record['key']] = record
+
+            checkpoint.write(json.dumps(record) + "\n")
+            checkpoint.flush()
+            _log(logging.DEBUG, "%s %s", record['status'], record['source_url'],
+                 event='source_checked', **record)
+
+        checkpoint.write(json.dumps({'completed': datetime.now().isoformat()}) + "\n")
+
+    ordered = [results[entry['key']] for entry in stale if entry['key'] in results]
+    summary = {
+        'max_age_days': max_age_days,
+        'stale': len(stale),
+        'resumed': resumed,
+        'ok': sum(1 for r in ordered if r['status'] == 'ok'),
+        'broken': sum(1 for r in ordered if r['status'] == 'broken'),
+        'error': sum(1 for r in ordered if r['status'] == 'error'),
+        'results': ordered
+    }
+
+    _log(logging.INFO, "✓ Sweep complete: %d ok, %d broken, %d errors\nResults recorded in: %s",
+         summary['ok'], summary['broken'], summary['error'], checkpoint_path,
+         event='sweep_complete', ok=summary['ok'], broken=summary['broken'],
+         error=summary['error'], checkpoint=str(checkpoint_path))
+
+    return summary
 
 
 def main():
@@ -219,6 +1065,10 @@ def main():
         '--draft',
         help='Path to draft file to fact-check'
     )
+    parser.add_argument(
+        '--drafts-dir',
+        help='Fact-check every markdown draft in a directory'
+    )
     parser.add_argument(
         '--claim',
         help='Single claim to verify'
@@ -237,27 +1087,116 @@ def main():
         '--source',
         help='Source URL for claim verification'
     )
+    parser.add_argument(
+        '--compile',
+        action='store_true',
+        help='Compile the JSON library into a memory-mapped binary snapshot'
+    )
+    parser.add_argument(
+        '--sweep',
+        action='store_true',
+        help='Re-check sources of library entries older than --max-age-days'
+    )
+    parser.add_argument(
+        '--max-age-days',
+        type=int,
+        default=SWEEP_MAX_AGE_DAYS,
+        help=f'Verification age that marks an entry stale (default: {SWEEP_MAX_AGE_DAYS})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=SWEEP_WORKERS,
+        help=f'Concurrent source checks during a sweep (default: {SWEEP_WORKERS})'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        help='Sweep checkpoint file (default: data/fact_check_sweep.jsonl)'
+    )
+    parser.add_argument(
+        '--log-level',
+        choices=LOG_LEVELS,
+        help='Output level (default: INFO for --drafts-dir batches, DEBUG otherwise)'
+    )
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Only show warnings and errors (same as --log-level=WARNING)'
+    )
+    parser.add_argument(
+        '--log-json',
+        help='Also write structured JSON-lines logs to this file'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Record per-stage timings and counters in the fact-check report'
+    )
+    parser.add_argument(
+        '--profile-dump',
+        help='Also write cProfile stats to this file (implies --profile)'
+    )
 
     args = parser.parse_args()
+    profile = args.profile or bool(args.profile_dump)
+
+    # Per-claim lines are off by default in batch mode
+    if args.quiet:
+        log_level = 'WARNING'
+    else:
+        log_level = args.log_level or ('INFO' if args.drafts_dir else 'DEBUG')
+    configure_logging(log_level, args.log_json)
+
+    profiler = cProfile.Profile() if args.profile_dump else None
+    if profiler:
+        profiler.enable()
+
+    if args.compile:
+        compile_library()
 
-    if args.draft:
-        report = check_draft(args.draft, args.strict)
+    elif args.sweep:
+        sweep_library(args.max_age_days, args.workers, args.checkpoint)
+
+    elif args.draft:
+        report = check_draft(args.draft, args.strict, profile=profile)
         # Optionally save report to file
-        report_path = Path(args.draft).parent / f"{Path(args.draft).stem}_factcheck.json"
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2)
-        print(f"Report saved to: {report_path}")
+        report_path = save_report(report)
+        _log(logging.INFO, "Report saved to: %s", report_path,
+             event='report_saved', path=str(report_path))
+
+    elif args.drafts_dir:
+        draft_paths = sorted(Path(args.drafts_dir).glob('*.md'))
+        reports = check_drafts(draft_paths, args.strict, profile)
+        for report in reports:
+            save_report(report)
+
+        total = sum(r['total_claims'] for r in reports)
+        hits = sum(r['cache_hits'] for r in reports)
+        failed = sum(r['failed'] for r in reports)
+        unverified = sum(r['unverified'] for r in reports)
+        _log(logging.INFO,
+             "✓ Checked %d drafts: %d claims, %d served from cache\nFailed: %d, unverified: %d",
+             len(reports), total, hits, failed, unverified,
+             event='batch_summary', drafts=len(reports), total_claims=total,
+             cache_hits=hits, failed=failed, unverified=unverified)
 
     elif args.claim:
         if args.add and args.source:
             add_to_library(args.claim, args.source)
         else:
             result = verify_claim(args.claim, args.strict)
-            print(f"\nVerification result: {json.dumps(result, indent=2)}")
+            _log(logging.INFO, "\nVerification result: %s", json.dumps(result, indent=2),
+                 event='claim_result', claim=args.claim, **result)
 
     else:
         parser.print_help()
 
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile_dump)
+        _log(logging.INFO, "cProfile stats saved to: %s", args.profile_dump,
+             event='cprofile_saved', path=args.profile_dump)
+
 
 if __name__ == '__main__':
     main()
@@ -5,34 +5,288 @@ social_repurpose.py - Generate social posts from newsletter essays
 Usage:
     python social_repurpose.py --essay=content/essays/ai_regulation.md --formats=all
     python social_repurpose.py --essay=content/essays/ai_regulation.md --formats=twitter
+    python social_repurpose.py --essays-dir=content/essays --formats=all --workers=4
+    python social_repurpose.py --essays-dir=content/essays --force
+    python social_repurpose.py --essays-dir=content/essays --lengths
+    python social_repurpose.py --status
 """
 
 import argparse
+import contextlib
+import hashlib
+import heapq
+import io
 import json
+import logging
+import math
+import os
 import re
+import shutil
+import sys
+import unicodedata
+import uuid
+from collections.abc import Mapping
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
+if sys.platform != 'win32':  # Windows: index updates are not locked
+    import fcntl
+
 
 # Configuration
 CONTENT_DIR = Path(__file__).parent.parent / "content"
 SOCIAL_DIR = CONTENT_DIR / "social_posts"
+TEMPLATES_DIR = CONTENT_DIR / "templates" / "social"
+INDEX_FILENAME = "index.json"
+INDEX_LOCK_FILENAME = ".index.lock"
 
 # Social media constraints
 TWITTER_MAX_LENGTH = 280
 TWITTER_THREAD_MAX = 10
 LINKEDIN_OPTIMAL = 1300
 
+# Output formats by name, filled in by @register_format
+FORMATS: dict[str, dict] = {}
+
+# Bump whenever generated output changes for the same essay (templates,
+# limits, parsing) so batch runs regenerate everything once
+GENERATOR_VERSION = "3"
+
+# Failures one essay can cause (unreadable files, bad templates, a dead
+# worker pool); anything else is a bug and is logged with its traceback
+ESSAY_ERRORS = (OSError, ValueError, KeyError, BrokenProcessPool, CancelledError)
+
+logger = logging.getLogger("social_repurpose")
+
+
+# Key-point ranking: words of 3+ characters are terms; title overlap
+# dominates, then essay-wide term frequency, then length and position
+TERM_PATTERN = re.compile(r"[a-z0-9][a-z0-9'-]{2,}")
+STOPWORDS = frozenset({
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'any', 'can', 'had', 'her', 'was',
+    'one', 'our', 'out', 'has', 'have', 'this', 'that', 'with', 'from', 'they', 'will', 'would',
+    'there', 'their', 'what', 'when', 'which', 'who', 'how', 'its', 'into', 'more', 'than', 'then',
+    'them', 'these', 'those', 'been', 'were', 'also', 'just', 'over', 'such', 'only', 'other',
+    'some', 'very', 'about', 'most'
+})
+TITLE_TERM_WEIGHT = 2.0
+POSITION_WEIGHT = 0.5
+IDEAL_POINT_WORDS = (6, 30)
+
+# Inline markdown links: [text](url)
+LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)')
+
+# Twitter weighting: code points in these ranges count 1, everything else 2,
+# and every URL counts as a fixed t.co length regardless of its own length
+TWITTER_LIGHT_RANGES = ((0x0000, 0x10FF), (0x2000, 0x200D), (0x2010, 0x201F), (0x2032, 0x2037))
+TWITTER_URL_WEIGHT = 23
+URL_PATTERN = re.compile(r'https?://[^\s)\]]+')
+ELLIPSIS = "…"
+ZWJ = "\u200d"
+
+# Template tags: {{name}}, {{name|limit:N}}, {{.}}, {{#if name}}, {{#each name}}, {{/if}}, {{/each}}
+TAG_PATTERN = re.compile(r'\{\{\s*(.*?)\s*\}\}')
+# Block tags alone on a line take the whole line with them
+STANDALONE_BLOCK_PATTERN = re.compile(r'^[ \t]*(\{\{\s*[#/][^}]*\}\})[ \t]*(?:\n|\Z)', re.MULTILINE)
+TEMPLATE_FILTERS = {
+    'limit': lambda value, n: value[:int(n)],
+}
+
+
+def _scan_lines(lines, headings=None, bullets=None):
+    """
+    Walk essay lines once for title, hook, headings and bullets
+
+    Headings and bullet texts are appended to ``headings`` and ``bullets``
+    when lists are given. Without them the walk stops as soon as title and
+    hook are known, so callers streaming a file never read past what they
+    need.
+
+    Returns:
+        tuple: (title, hook) - either may be None
+    """
+    title = None
+    hook = None
+    paragraph = []
+    head_only = headings is None and bullets is None
+
+    for line in lines:
+        if not line or line.isspace():
+            # Blank line closes a paragraph; the first one that does not
+            # open with a heading becomes the hook
+            if hook is None and paragraph and paragraph[0][0] != '#':
+                hook = '\n'.join(paragraph).strip()
+            paragraph = []
+            if head_only and title is not None and hook is not None:
+                break
+            continue
+
+        if hook is None:
+            paragraph.append(line)
+
+        first = line[0]
+        if first == '#':
+            level = len(line) - len(line.lstrip('#'))
+            text = line[level:].strip()
+            if text and line[level] in ' \t':
+                if headings is not None:
+                    headings.append({'level': level, 'text': text})
+                if title is None and level == 1:
+                    title = line[1:].lstrip(' \t').rstrip('\r')
+        elif bullets is not None and (first == '-' or first == '*') and line[1:2] in (' ', '\t'):
+            point = line[2:].lstrip(' \t').rstrip('\r')
+            if point:
+                bullets.append(point)
+
+    if hook is None and paragraph and paragraph[0][0] != '#':
+        hook = '\n'.join(paragraph).strip()
+
+    return title, hook
+
+
+def _terms(text):
+    """Lower-cased content terms of ``text``"""
+    return [term for term in TERM_PATTERN.findall(text.lower()) if term not in STOPWORDS]
+
+
+def rank_key_points(bullets, title, content, k=5):
+    """
+    Pick the ``k`` most informative bullets
+
+    Each bullet is scored once: terms shared with the title count most,
+    then how often its terms recur across the essay's sentences and
+    bullets (log-damped, normalized by bullet length), plus a length fit
+    and a small bonus for appearing early. The top ``k`` come from a heap
+    and are returned in document order.
+
+    Args:
+        bullets (list): Every bullet point text, in document order
+        title (str): Essay title
+        content (str): Full essay markdown, for term frequencies
+        k (int): Number of key points to keep
+
+    Returns:
+        list: Selected bullets, in document order
+    """
+    if len(bullets) <= k:
+        return list(bullets)
+
+    frequency = {}
+    for term in _terms(content):
+        frequency[term] = frequency.get(term, 0) + 1
+    title_terms = set(_terms(title or ""))
+
+    low, high = IDEAL_POINT_WORDS
+    n = len(bullets)
+    scores = []
+    for i, bullet in enumerate(bullets):
+        terms = set(_terms(bullet))
+        words = len(bullet.split())
+        salience = sum(math.log1p(frequency.get(term, 0)) for term in terms)
+        salience /= math.sqrt(len(terms) or 1)
+        salience += TITLE_TERM_WEIGHT * len(terms & title_terms)
+        fit = min(words / low, 1.0) * min(high / words, 1.0) if words else 0.0
+        scores.append(salience * fit + POSITION_WEIGHT * (1 - i / n))
+
+    return [bullets[i] for i in sorted(heapq.nlargest(k, range(n), key=scores.__getitem__))]
+
+
+def parse_essay(content, max_key_points=5):
+    """
+    Parse essay markdown in a single walk over its lines
+
+    Title, hook, bullets and headings are collected in one pass; bullets
+    are then ranked for key points, and links and word count come from
+    C-level scans of the same buffer.
+
+    Args:
+        content (str): Essay markdown
+        max_key_points (int): Number of bullet points to keep
+
+    Returns:
+        dict: title, hook, key_points, headings, links and word_count
+    """
+    headings = []
+    bullets = []
+    title, hook = _scan_lines(content.split('\n'), headings, bullets)
+
+    return {
+        'title': title or "Untitled Essay",
+        'hook': hook or "",
+        'key_points': rank_key_points(bullets, title, content, max_key_points),
+        'headings': headings,
+        'links': [{'text': text, 'url': url} for text, url in LINK_PATTERN.findall(content)],
+        'word_count': len(content.split())
+    }
+
+
+class Essay(Mapping):
+    """
+    Lazily parsed essay, read-only mapping over its fields
+
+    ``title`` and ``hook`` are parsed by streaming the file only as far as
+    needed. ``key_points`` (ranked over every bullet), ``headings``,
+    ``links`` and ``word_count`` trigger one full parse. The body is never
+    kept: ``content`` re-reads the file on each access, so memory stays
+    proportional to the fields the output formats actually use.
+    """
+
+    HEAD_FIELDS = ('title', 'hook')
+    BODY_FIELDS = ('key_points', 'headings', 'links', 'word_count')
+    FIELDS = HEAD_FIELDS + BODY_FIELDS + ('content',)
+
+    __slots__ = ('_fields', 'path')
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._fields = {}
+
+    def __getitem__(self, key):
+        if key == 'content':
+            return self.path.read_text()
+
+        if key not in self._fields:
+            if key in self.HEAD_FIELDS:
+                self._parse_head()
+            elif key in self.BODY_FIELDS:
+                self._parse_body()
+            else:
+                raise KeyError(key)
+
+        return self._fields[key]
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def _parse_head(self):
+        with open(self.path, 'r') as f:
+            title, hook = _scan_lines(line.rstrip('\n') for line in f)
+
+        self._fields.update(title=title or "Untitled Essay", hook=hook or "")
+
+    def _parse_body(self):
+        self._fields.update(parse_essay(self.path.read_text()))
+
 
 def read_essay(essay_path):
     """
-    Read and parse essay content
+    Open an essay for lazy parsing
 
     Args:
         essay_path (str): Path to essay markdown file
 
     Returns:
-        dict: Parsed essay with title, content, key points
+        Essay: Mapping with title, content, hook, key points (top 5),
+            headings, links and word count
     """
     essay_file = Path(essay_path)
 
@@ -40,30 +294,361 @@ def read_essay(essay_path):
         print(f"Error: Essay not found: {essay_path}")
         return None
 
-    with open(essay_file, 'r') as f:
-        content = f.read()
+    return Essay(essay_file)
+
+
+def _extends_grapheme(ch):
+    """Whether ``ch`` attaches to the preceding character (approximate)"""
+    cp = ord(ch)
+    return (
+        cp == 0x200D
+        or 0xFE00 <= cp <= 0xFE0F
+        or 0x1F3FB <= cp <= 0x1F3FF
+        or unicodedata.category(ch) in ('Mn', 'Mc', 'Me')
+    )
+
+
+def iter_graphemes(text):
+    """
+    Split text into approximate grapheme clusters
+
+    Combining marks, variation selectors, skin-tone modifiers and
+    ZWJ-joined sequences stay attached to their base character.
+
+    Args:
+        text (str): Text to split
+
+    Yields:
+        str: One cluster at a time
+    """
+    cluster = ""
+    joined = False
+    for ch in text:
+        if cluster and (joined or _extends_grapheme(ch)):
+            cluster += ch
+        else:
+            if cluster:
+                yield cluster
+            cluster = ch
+        joined = ch == ZWJ
+    if cluster:
+        yield cluster
+
+
+@lru_cache(maxsize=4096)
+def grapheme_weight(cluster):
+    """
+    Twitter weight of a single grapheme cluster
+
+    Args:
+        cluster (str): Cluster from iter_graphemes
+
+    Returns:
+        int: 1 for light code points, 2 otherwise (emoji sequences count once)
+    """
+    cp = ord(cluster[0])
+    for low, high in TWITTER_LIGHT_RANGES:
+        if low <= cp <= high:
+            return 1
+    return 2
+
+
+def tweet_weight(text):
+    """
+    Weighted length of text as Twitter counts it
+
+    Args:
+        text (str): Tweet text
+
+    Returns:
+        int: Weighted character count
+    """
+    weight = 0
+    pos = 0
+    for match in URL_PATTERN.finditer(text):
+        weight += sum(grapheme_weight(g) for g in iter_graphemes(text[pos:match.start()]))
+        weight += TWITTER_URL_WEIGHT
+        pos = match.end()
+    return weight + sum(grapheme_weight(g) for g in iter_graphemes(text[pos:]))
+
+
+def _split_word(word, limit):
+    """Hard-split a word that is heavier than ``limit`` on cluster boundaries"""
+    pieces = []
+    piece = ""
+    weight = 0
+    for g in iter_graphemes(word):
+        w = grapheme_weight(g)
+        if piece and weight + w > limit:
+            pieces.append((piece, weight))
+            piece, weight = "", 0
+        piece += g
+        weight += w
+    if piece:
+        pieces.append((piece, weight))
+    return pieces
+
+
+def pack_tweets(text, limit=TWITTER_MAX_LENGTH):
+    """
+    Greedily pack text into tweets on word boundaries
+
+    Each word is weighed once, so packing is linear in the length of the
+    text. Words heavier than a whole tweet are split between clusters.
+
+    Args:
+        text (str): Text to pack
+        limit (int): Maximum weighted length per tweet
+
+    Returns:
+        list: Tweets, each within ``limit``
+    """
+    tweets = []
+    current = []
+    used = 0
+    for word in text.split():
+        w = tweet_weight(word)
+        pieces = _split_word(word, limit) if w > limit else [(word, w)]
+        for piece, w in pieces:
+            if current and used + 1 + w > limit:
+                tweets.append(" ".join(current))
+                current, used = [], 0
+            used += w + (1 if current else 0)
+            current.append(piece)
+    if current:
+        tweets.append(" ".join(current))
+    return tweets
+
+
+def truncate_tweet(text, limit=TWITTER_MAX_LENGTH):
+    """
+    Cut text to fit ``limit`` on a word boundary, marking the cut
+
+    Args:
+        text (str): Text to shorten
+        limit (int): Maximum weighted length
+
+    Returns:
+        str: Text unchanged if it fits, else its first packed tweet plus an ellipsis
+    """
+    if tweet_weight(text) <= limit:
+        return text
+    return pack_tweets(text, limit - tweet_weight(ELLIPSIS))[0] + ELLIPSIS
+
+
+class TemplateError(ValueError):
+    """Raised when a social template cannot be compiled"""
+
+
+def _parse_expression(expr):
+    """Split ``name|filter:arg|...`` into the name and resolved filters"""
+    name, *specs = [part.strip() for part in expr.split('|')]
+    filters = []
+    for spec in specs:
+        filter_name, _, arg = spec.partition(':')
+        if filter_name not in TEMPLATE_FILTERS:
+            raise TemplateError(f"Unknown template filter: {filter_name}")
+        filters.append((TEMPLATE_FILTERS[filter_name], arg))
+    return name, tuple(filters)
+
+
+class Template:
+    """
+    Compiled social format template
+
+    Templates are parsed once into a tree of literal, variable, ``if`` and
+    ``each`` nodes. Rendering walks the tree against a view mapping (a dict
+    or an Essay); ``measure`` walks it the same way but only sums sizes,
+    with literal sizes computed once per measuring function.
+
+    Args:
+        source (str): Template text
+        name (str): Name used in error messages
+    """
+
+    def __init__(self, source, name="<template>"):
+        self.name = name
+        self.nodes = self._compile(STANDALONE_BLOCK_PATTERN.sub(r'\1', source))
+        self._literal_sizes = {}
+
+    def _compile(self, source):
+        root = []
+        stack = [('root', root)]
+
+        for i, part in enumerate(TAG_PATTERN.split(source)):
+            nodes = stack[-1][1]
+            if i % 2 == 0:
+                if part:
+                    nodes.append(('text', part))
+            elif part.startswith('#'):
+                kind, _, expr = part[1:].partition(' ')
+                if kind not in ('if', 'each'):
+                    raise TemplateError(f"{self.name}: unknown block '{kind}'")
+                children = []
+                nodes.append((kind, *_parse_expression(expr), children))
+                stack.append((kind, children))
+            elif part.startswith('/'):
+                if stack[-1][0] != part[1:]:
+                    raise TemplateError(f"{self.name}: unexpected '{{{{{part}}}}}'")
+                stack.pop()
+            else:
+                nodes.append(('var', *_parse_expression(part)))
+
+        if len(stack) > 1:
+            raise TemplateError(f"{self.name}: unclosed '{{{{#{stack[-1][0]}}}}}'")
+        return root
+
+    @staticmethod
+    def _resolve(name, filters, view, item):
+        value = item if name == '.' else view.get(name, "")
+        for func, arg in filters:
+            value = func(value, arg)
+        return value
+
+    def _walk(self, nodes, view, item, emit, emit_literal):
+        for node in nodes:
+            kind = node[0]
+            if kind == 'text':
+                emit_literal(node[1])
+            elif kind == 'var':
+                emit(str(self._resolve(node[1], node[2], view, item)))
+            elif kind == 'if':
+                if self._resolve(node[1], node[2], view, item):
+                    self._walk(node[3], view, item, emit, emit_literal)
+            else:
+                for child in self._resolve(node[1], node[2], view, item) or ():
+                    self._walk(node[3], view, child, emit, emit_literal)
+
+    def render(self, view):
+        """
+        Render the template
+
+        Args:
+            view (Mapping): Values for template variables
+
+        Returns:
+            str: Rendered text
+        """
+        out = []
+        self._walk(self.nodes, view, None, out.append, out.append)
+        return "".join(out)
+
+    def measure(self, view, size=len):
+        """
+        Size of the rendered template without building the text
+
+        Args:
+            view (Mapping): Values for template variables
+            size (callable): Measuring function, e.g. len or tweet_weight
+
+        Returns:
+            int: Sum of ``size`` over every rendered piece
+        """
+        sizes = self._literal_sizes.setdefault(size, {})
+        total = 0
+
+        def emit(text):
+            nonlocal total
+            total += size(text)
+
+        def emit_literal(text):
+            nonlocal total
+            if text not in sizes:
+                sizes[text] = size(text)
+            total += sizes[text]
+
+        self._walk(self.nodes, view, None, emit, emit_literal)
+        return total
+
+
+# Template path -> (file mtime_ns, compiled Template)
+_TEMPLATE_CACHE: dict[Path, tuple[int, Template]] = {}
+
+
+def load_template(name, templates_dir=None):
+    """
+    Load a compiled social template, recompiling only when the file changes
+
+    Args:
+        name (str): Template name (file stem under TEMPLATES_DIR)
+        templates_dir (Path): Template directory (defaults to TEMPLATES_DIR)
+
+    Returns:
+        Template: Compiled template
+    """
+    path = Path(templates_dir or TEMPLATES_DIR) / f"{name}.txt"
+    mtime_ns = path.stat().st_mtime_ns
+
+    cached = _TEMPLATE_CACHE.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    # Template files end with a newline; rendered posts do not
+    source = path.read_text(encoding='utf-8')
+    template = Template(source.removesuffix('\n'), name)
+    _TEMPLATE_CACHE[path] = (mtime_ns, template)
+    return template
+
+
+def templates_digest(templates_dir=None):
+    """
+    Hash of all social templates, so template edits invalidate saved posts
+
+    Args:
+        templates_dir (Path): Template directory (defaults to TEMPLATES_DIR)
+
+    Returns:
+        str: SHA-256 hex digest over template names and contents
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(templates_dir or TEMPLATES_DIR).glob("*.txt")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
 
-    # Extract title (first H1 heading)
-    title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-    title = title_match.group(1) if title_match else "Untitled Essay"
 
-    # Extract key points (look for bullet points or numbered lists)
-    bullet_pattern = r'^[-*]\s+(.+)$'
-    key_points = re.findall(bullet_pattern, content, re.MULTILINE)
+def measure_formats(essay):
+    """
+    Rendered sizes of the template-based formats against their limits
 
-    # Extract first paragraph as hook
-    paragraphs = [p.strip() for p in content.split('\n\n') if p.strip() and not p.startswith('#')]
-    hook = paragraphs[0] if paragraphs else ""
+    Args:
+        essay (Mapping): Parsed essay content
 
+    Returns:
+        dict: Format name -> {'size': int, 'limit': int}
+    """
     return {
-        'title': title,
-        'content': content,
-        'hook': hook,
-        'key_points': key_points[:5],  # Top 5 key points
-        'word_count': len(content.split())
+        'linkedin': {
+            'size': load_template('linkedin').measure(essay),
+            'limit': LINKEDIN_OPTIMAL,
+        },
+        'teaser': {
+            'size': load_template('teaser').measure(essay, tweet_weight),
+            'limit': TWITTER_MAX_LENGTH,
+        },
     }
 
 
+def register_format(name, inputs=('title', 'hook', 'key_points'), cost=1):
+    """
+    Register a generator as a social output format
+
+    Args:
+        name (str): Format name used on the command line and as the output file stem
+        inputs (tuple): Essay fields the generator reads; only these are
+            parsed and shipped to worker processes
+        cost (int): Relative generation cost; expensive formats are scheduled first
+
+    Returns:
+        callable: Decorator that registers and returns the generator
+    """
+    def decorator(generate):
+        FORMATS[name] = {'generate': generate, 'inputs': tuple(inputs), 'cost': cost}
+        return generate
+    return decorator
+
+
+@register_format('twitter', cost=3)
 def generate_twitter_thread(essay):
     """
     Generate Twitter thread from essay
@@ -76,35 +661,41 @@ def generate_twitter_thread(essay):
     """
     print("Generating Twitter thread...")
 
-    thread = []
-
     # Tweet 1: Hook + Title
     hook_tweet = f"{essay['title']}\n\nA thread 🧵👇"
-    if len(hook_tweet) <= TWITTER_MAX_LENGTH:
-        thread.append(hook_tweet)
-    else:
-        thread.append(f"{essay['title']}\n\n🧵👇")
+    if tweet_weight(hook_tweet) > TWITTER_MAX_LENGTH:
+        marker = "\n\n🧵👇"
+        title_room = TWITTER_MAX_LENGTH - tweet_weight(marker)
+        hook_tweet = truncate_tweet(essay['title'], title_room) + marker
+
+    # Hook and key points flow across as many tweets as they need. Key
+    # points win over the hook when the thread would run past the maximum,
+    # leaving room for the opening tweet and the CTA
+    budget = TWITTER_THREAD_MAX - 2
+    points = []
+    for i, point in enumerate(essay['key_points'][:5], 1):
+        points.extend(pack_tweets(f"{i}/ {point}"))
+    intro = pack_tweets(essay['hook']) if essay['hook'] else []
 
-    # Tweet 2: Hook/Introduction
-    if essay['hook']:
-        intro = essay['hook'][:TWITTER_MAX_LENGTH - 10] + "..."
-        thread.append(intro)
+    intro_budget = max(1, budget - len(points))
+    if len(intro) > intro_budget:
+        intro = intro[:intro_budget]
+        intro[-1] = truncate_tweet(intro[-1] + ELLIPSIS)
 
-    # Tweets 3-N: Key points
-    for i, point in enumerate(essay['key_points'][:5], 1):
-        tweet = f"{i}/ {point}"
-        if len(tweet) > TWITTER_MAX_LENGTH:
-            tweet = tweet[:TWITTER_MAX_LENGTH - 3] + "..."
-        thread.append(tweet)
+    body = intro + points
+    if len(body) > budget:
+        body = body[:budget]
+        body[-1] = truncate_tweet(body[-1] + ELLIPSIS)
 
     # Final tweet: CTA
-    cta = "Read the full analysis in my newsletter:\n[INSERT LINK]\n\nLike/RT if you found this useful!"
-    thread.append(cta)
+    cta = load_template('twitter_cta').render(essay)
+    thread = [hook_tweet, *body, cta]
 
     print(f"✓ Generated {len(thread)} tweets")
     return thread
 
 
+@register_format('linkedin')
 def generate_linkedin_post(essay):
     """
     Generate LinkedIn post from essay
@@ -118,33 +709,7 @@ def generate_linkedin_post(essay):
     print("Generating LinkedIn post...")
 
     # LinkedIn structure: Hook → Context → Key Insights → CTA
-    post_parts = []
-
-    # Hook (attention-grabbing first line)
-    post_parts.append(essay['title'])
-    post_parts.append("")
-
-    # Context (2-3 sentences)
-    if essay['hook']:
-        context = essay['hook'][:300]  # Keep it concise
-        post_parts.append(context)
-        post_parts.append("")
-
-    # Key insights (3-5 bullet points)
-    if essay['key_points']:
-        post_parts.append("Key insights:")
-        for point in essay['key_points'][:5]:
-            post_parts.append(f"• {point}")
-        post_parts.append("")
-
-    # CTA
-    post_parts.append("Read the full analysis in my newsletter (link in comments)")
-    post_parts.append("")
-    post_parts.append("What's your take? Share your thoughts below. 👇")
-    post_parts.append("")
-    post_parts.append("#TechStrategy #Innovation #Leadership")
-
-    linkedin_post = "\n".join(post_parts)
+    linkedin_post = load_template('linkedin').render(essay)
 
     # Ensure optimal length
     if len(linkedin_post) > LINKEDIN_OPTIMAL:
@@ -155,6 +720,7 @@ def generate_linkedin_post(essay):
     return linkedin_post
 
 
+@register_format('teaser', inputs=('title', 'hook'))
 def generate_newsletter_teaser(essay):
     """
     Generate short newsletter teaser for social sharing
@@ -167,61 +733,630 @@ def generate_newsletter_teaser(essay):
     """
     print("Generating newsletter teaser...")
 
-    teaser = f"""
-🚀 New Essay: {essay['title']}
+    teaser = load_template('teaser').render(essay).strip()
 
-{essay['hook'][:200]}...
+    return teaser
 
-Read the full essay: [INSERT NEWSLETTER LINK]
 
-Subscribe for weekly strategic tech insights 👉 [INSERT SUBSCRIBE LINK]
-    """.strip()
+def generate_formats(essay, formats):
+    """
+    Generate the requested social formats for an essay
 
-    return teaser
+    Args:
+        essay (dict): Parsed essay content
+        formats (list): Registered format names; unknown names are ignored
+
+    Returns:
+        dict: Generated content by format
+    """
+    return {name: FORMATS[name]['generate'](essay) for name in formats if name in FORMATS}
+
+
+def format_inputs(formats):
+    """
+    Essay fields needed by a set of formats
+
+    Args:
+        formats (list): Registered format names
+
+    Returns:
+        list: Field names, in first-use order
+    """
+    fields = {}
+    for name in formats:
+        fields.update(dict.fromkeys(FORMATS[name]['inputs']))
+    return list(fields)
+
+
+def _generate_format(name, view):
+    """Run one registered generator quietly (worker-process entry point)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return FORMATS[name]['generate'](view)
+
+
+def essay_content_hash(essay_path):
+    """
+    Content hash of an essay source file
+
+    Args:
+        essay_path (str): Path to essay markdown file
+
+    Returns:
+        str: SHA-256 hex digest of the file bytes
+    """
+    return hashlib.sha256(Path(essay_path).read_bytes()).hexdigest()
+
+
+def is_up_to_date(essay_name, source_hash, formats, social_dir=None, index=None,
+                  templates_hash=None):
+    """
+    Check whether saved social posts already match an essay
+
+    Posts are current when their record has the same source hash,
+    generator version and templates digest and includes every requested
+    format. The record comes from ``index`` when it lists the essay,
+    otherwise from the essay's metadata.json.
+
+    Args:
+        essay_name (str): Name of the essay (folder name)
+        source_hash (str): Current essay_content_hash()
+        formats (list): Requested format names
+        social_dir (Path): Output root (defaults to SOCIAL_DIR)
+        index (dict): Loaded social index, to avoid opening metadata files
+        templates_hash (str): templates_digest() computed once by batch
+            callers (computed here when omitted)
+
+    Returns:
+        bool: True if regeneration can be skipped
+    """
+    metadata = (index or {}).get('essays', {}).get(essay_name)
+
+    if metadata is None:
+        metadata_file = Path(social_dir or SOCIAL_DIR) / essay_name / "metadata.json"
+        if not metadata_file.exists():
+            return False
+
+        try:
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return False
+
+    return (
+        metadata.get('source_hash') == source_hash
+        and metadata.get('generator_version') == GENERATOR_VERSION
+        and metadata.get('templates_hash') == (templates_hash or templates_digest())
+        and set(formats) <= set(metadata.get('formats', []))
+    )
+
+
+def render_output(format_name, content):
+    """
+    Serialize generated content to the text saved for its format
+
+    Args:
+        format_name (str): Format name
+        content (str | list): Generated content; lists are Twitter threads
+
+    Returns:
+        str: File contents
+    """
+    if format_name == "twitter" and isinstance(content, list):
+        # Twitter thread with tweet numbers
+        separator = "\n\n" + "="*50 + "\n\n"
+        return "".join(
+            f"Tweet {i}/{len(content)}:\n{tweet}{separator}" for i, tweet in enumerate(content, 1)
+        )
+    return content
+
+
+def _replace_dir(staging, target):
+    """
+    Move a fully written staging directory into place
+
+    POSIX cannot rename over a non-empty directory, so an existing target
+    is first renamed aside and removed only after the swap. Readers never
+    see a mix of old and new files, but the folder is briefly missing
+    between the two renames; a crash there leaves the old folder under a
+    ``.old-*`` name, which _recover_dir() restores on the next save.
+    """
+    if not target.exists():
+        staging.rename(target)
+        return
+
+    retired = target.with_name(f".{target.name}.old-{uuid.uuid4().hex[:8]}")
+    target.rename(retired)
+    try:
+        staging.rename(target)
+    except OSError:
+        retired.rename(target)
+        raise
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def _recover_dir(target):
+    """
+    Clean up after a save that crashed inside _replace_dir()
+
+    The newest retired copy is renamed back if the target is missing;
+    any other retired copies are removed.
+    """
+    retired = sorted(target.parent.glob(f".{target.name}.old-*"),
+                     key=lambda path: path.stat().st_mtime_ns)
+    if retired and not target.exists():
+        retired.pop().rename(target)
+    for path in retired:
+        shutil.rmtree(path, ignore_errors=True)
 
 
-def save_social_content(essay_name, formats_content):
+def save_social_content(essay_name, formats_content, social_dir=None, source_hash=None,
+                        update_index=True, templates_hash=None):
     """
     Save generated social content to files
 
+    Every file is rendered in memory and written once into a hidden
+    staging folder next to the essay folder, which then replaces the old
+    folder. Files from earlier runs that are not regenerated are carried
+    over, so a crash never leaves a half-updated folder.
+
     Args:
         essay_name (str): Name of the essay (for filename)
         formats_content (dict): Generated content by format
+        social_dir (Path): Output root (defaults to SOCIAL_DIR)
+        source_hash (str): Essay content hash recorded for incremental runs
+        update_index (bool): Record the essay in the social index; batch
+            callers pass False and update the index once at the end
+        templates_hash (str): templates_digest() computed once by batch
+            callers (computed here when omitted)
+
+    Returns:
+        dict: The essay's index entry (its metadata plus character counts)
     """
-    # Create social_posts directory if it doesn't exist
-    SOCIAL_DIR.mkdir(parents=True, exist_ok=True)
-
-    # Create subfolder for this essay
-    essay_folder = SOCIAL_DIR / essay_name
-    essay_folder.mkdir(exist_ok=True)
-
-    # Save each format
-    for format_name, content in formats_content.items():
-        output_file = essay_folder / f"{format_name}.txt"
-
-        if format_name == "twitter" and isinstance(content, list):
-            # Save Twitter thread with tweet numbers
-            with open(output_file, 'w') as f:
-                for i, tweet in enumerate(content, 1):
-                    f.write(f"Tweet {i}/{len(content)}:\n")
-                    f.write(tweet)
-                    f.write("\n\n" + "="*50 + "\n\n")
-        else:
-            with open(output_file, 'w') as f:
-                f.write(content)
+    social_dir = Path(social_dir or SOCIAL_DIR)
 
-        print(f"✓ Saved {format_name} content to: {output_file}")
+    # Create social_posts directory if it doesn't exist
+    social_dir.mkdir(parents=True, exist_ok=True)
 
-    # Save metadata
+    essay_folder = social_dir / essay_name
+    _recover_dir(essay_folder)
     metadata = {
         'essay_name': essay_name,
         'generated_date': datetime.now().isoformat(),
-        'formats': list(formats_content.keys())
+        'formats': list(formats_content.keys()),
+        'source_hash': source_hash,
+        'generator_version': GENERATOR_VERSION,
+        'templates_hash': templates_hash or templates_digest()
+    }
+
+    outputs = {
+        f"{format_name}.txt": render_output(format_name, content)
+        for format_name, content in formats_content.items()
+    }
+    outputs["metadata.json"] = json.dumps(metadata, indent=2)
+
+    staging = social_dir / f".{essay_name}.tmp-{uuid.uuid4().hex[:8]}"
+    staging.mkdir()
+    try:
+        for filename, text in outputs.items():
+            (staging / filename).write_text(text)
+
+        if essay_folder.exists():
+            for existing in essay_folder.iterdir():
+                if existing.name in outputs:
+                    continue
+                if existing.is_dir():
+                    shutil.copytree(existing, staging / existing.name)
+                else:
+                    shutil.copy2(existing, staging / existing.name)
+
+        _replace_dir(staging, essay_folder)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    for format_name in formats_content:
+        print(f"✓ Saved {format_name} content to: {essay_folder / f'{format_name}.txt'}")
+
+    entry = dict(metadata, chars={
+        format_name: len(outputs[f"{format_name}.txt"]) for format_name in formats_content
+    })
+    if update_index:
+        update_social_index([entry], social_dir)
+    return entry
+
+
+def social_index_path(social_dir=None):
+    """Path of the social posts index inside ``social_dir``"""
+    return Path(social_dir or SOCIAL_DIR) / INDEX_FILENAME
+
+
+@contextlib.contextmanager
+def _index_lock(social_dir):
+    """Hold an exclusive lock on the index for a read-modify-write cycle"""
+    with open(Path(social_dir) / INDEX_LOCK_FILENAME, 'a') as lock_file:
+        if sys.platform != 'win32':
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def load_social_index(social_dir=None):
+    """
+    Load the social posts index
+
+    Args:
+        social_dir (Path): Output root (defaults to SOCIAL_DIR)
+
+    Returns:
+        dict: {'updated': str | None, 'essays': {essay_name: entry}}; empty
+        when the index is missing or unreadable
+    """
+    index_path = social_index_path(social_dir)
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'updated': None, 'essays': {}}
+    index.setdefault('essays', {})
+    return index
+
+
+def _write_social_index(index, social_dir):
+    index['updated'] = datetime.now().isoformat()
+    index_path = social_index_path(social_dir)
+    tmp_path = index_path.with_name(index_path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, index_path)
+
+
+def update_social_index(entries, social_dir=None):
+    """
+    Merge essay entries into the social posts index
+
+    Args:
+        entries (list): Entries returned by save_social_content()
+        social_dir (Path): Output root (defaults to SOCIAL_DIR)
+    """
+    if not entries:
+        return
+
+    social_dir = Path(social_dir or SOCIAL_DIR)
+    social_dir.mkdir(parents=True, exist_ok=True)
+    with _index_lock(social_dir):
+        index = load_social_index(social_dir)
+        for entry in entries:
+            index['essays'][entry['essay_name']] = entry
+        _write_social_index(index, social_dir)
+
+
+def rebuild_social_index(social_dir=None):
+    """
+    Rebuild the index from every essay folder's metadata.json
+
+    Used once for output trees that predate the index. Character counts
+    are taken from the saved files.
+
+    Args:
+        social_dir (Path): Output root (defaults to SOCIAL_DIR)
+
+    Returns:
+        dict: The rebuilt index
+    """
+    social_dir = Path(social_dir or SOCIAL_DIR)
+    index = {'updated': None, 'essays': {}}
+
+    for metadata_file in sorted(social_dir.glob("*/metadata.json")):
+        if metadata_file.parent.name.startswith('.'):
+            continue
+        try:
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            continue
+
+        essay_name = metadata.get('essay_name', metadata_file.parent.name)
+        chars = {}
+        for format_name in metadata.get('formats', []):
+            output_file = metadata_file.parent / f"{format_name}.txt"
+            if output_file.exists():
+                chars[format_name] = len(output_file.read_text())
+        index['essays'][essay_name] = dict(metadata, chars=chars)
+
+    social_dir.mkdir(parents=True, exist_ok=True)
+    with _index_lock(social_dir):
+        _write_social_index(index, social_dir)
+    return index
+
+
+def repurpose_essay(essay_path, formats=None, social_dir=None, force=False):
+    """
+    Read one essay, generate its formats and save them
+
+    Essays whose saved posts match their content hash and the current
+    generator version are skipped unless ``force`` is set. Per-essay
+    progress output is suppressed; callers print a summary.
+
+    Args:
+        essay_path (str): Path to essay markdown file
+        formats (list): Format names to generate (defaults to every registered format)
+        social_dir (Path): Output root (defaults to SOCIAL_DIR)
+        force (bool): Regenerate even if outputs are up to date
+
+    Returns:
+        dict: Summary with essay name, status and generated formats
+    """
+    essay_name = Path(essay_path).stem
+    formats = list(FORMATS) if formats is None else formats
+
+    try:
+        if not Path(essay_path).exists():
+            return {'essay': essay_name, 'status': 'error', 'error': 'Essay not found'}
+
+        source_hash = essay_content_hash(essay_path)
+        templates_hash = templates_digest()
+        if not force and is_up_to_date(essay_name, source_hash, formats, social_dir,
+                                       templates_hash=templates_hash):
+            return {'essay': essay_name, 'status': 'skipped', 'formats': list(formats)}
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            essay = read_essay(essay_path)
+            generated_content = generate_formats(essay, formats)
+            save_social_content(essay_name, generated_content, social_dir, source_hash,
+                                templates_hash=templates_hash)
+    except ESSAY_ERRORS as e:
+        return {'essay': essay_name, 'status': 'error', 'error': str(e)}
+    except Exception as e:
+        logger.exception("Unexpected error repurposing %s", essay_name)
+        return {'essay': essay_name, 'status': 'error', 'error': str(e)}
+
+    return {
+        'essay': essay_name,
+        'status': 'generated',
+        'title': essay['title'],
+        'formats': list(generated_content)
     }
 
-    metadata_file = essay_folder / "metadata.json"
-    with open(metadata_file, 'w') as f:
-        json.dump(metadata, f, indent=2)
+
+def repurpose_essays(essay_paths, formats=None, workers=None, social_dir=None, force=False):
+    """
+    Repurpose many essays in parallel
+
+    Up-to-date essays are skipped in the parent process (one hash per
+    file, no parsing). The rest are read once for just the fields their
+    formats declare, then every (essay, format) pair is generated as its
+    own task in a worker process, most expensive formats first. Each essay
+    is saved from a parent thread as soon as all of its formats finish.
+
+    Args:
+        essay_paths (list): Essay markdown files
+        formats (list): Format names to generate (defaults to every registered format)
+        workers (int): Worker processes (defaults to CPU count; 1 runs inline)
+        social_dir (Path): Output root (defaults to SOCIAL_DIR)
+        force (bool): Regenerate every essay regardless of content hashes
+
+    Returns:
+        list: One summary per essay, in input order
+    """
+    essay_paths = [str(path) for path in essay_paths]
+    social_dir = Path(social_dir or SOCIAL_DIR)
+    workers = workers or os.cpu_count() or 1
+    formats = list(FORMATS) if formats is None else [name for name in formats if name in FORMATS]
+    fields = format_inputs(formats)
+    index = load_social_index(social_dir)
+    templates_hash = templates_digest()
+
+    summaries = {}
+    pending = {}
+    for path in essay_paths:
+        essay_name = Path(path).stem
+        if not Path(path).exists():
+            summaries[path] = {'essay': essay_name, 'status': 'error', 'error': 'Essay not found'}
+            continue
+
+        try:
+            source_hash = essay_content_hash(path)
+            if not force and is_up_to_date(essay_name, source_hash, formats, social_dir, index,
+                                           templates_hash):
+                summaries[path] = {
+                    'essay': essay_name, 'status': 'skipped', 'formats': list(formats)
+                }
+                continue
+            essay = Essay(path)
+            view = {field: essay[field] for field in fields}
+        except ESSAY_ERRORS as e:
+            summaries[path] = {'essay': essay_name, 'status': 'error', 'error': str(e)}
+            continue
+        except Exception as e:
+            logger.exception("Unexpected error reading %s", essay_name)
+            summaries[path] = {'essay': essay_name, 'status': 'error', 'error': str(e)}
+            continue
+        pending[path] = {'name': essay_name, 'hash': source_hash, 'view': view, 'content': {}}
+
+    tasks = sorted(
+        ((path, name) for path in pending for name in formats),
+        key=lambda task: -FORMATS[task[1]]['cost']
+    )
+    remaining = {path: len(formats) for path in pending}
+
+    def save(path):
+        job = pending[path]
+        if 'error' not in job:
+            content = {name: job['content'][name] for name in formats}
+            with contextlib.redirect_stdout(io.StringIO()):
+                job['entry'] = save_social_content(
+                    job['name'], content, social_dir, job['hash'], update_index=False,
+                    templates_hash=templates_hash
+                )
+
+    def finish(path, name, result=None, error=None):
+        job = pending[path]
+        if error is not None:
+            job.setdefault('error', str(error))
+        else:
+            job['content'][name] = result
+        remaining[path] -= 1
+        if remaining[path] == 0:
+            saves[path] = savers.submit(save, path)
+
+    saves = {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(pending)) or 1) as savers:
+        if workers == 1 or len(tasks) <= 1:
+            for path, name in tasks:
+                try:
+                    finish(path, name, _generate_format(name, pending[path]['view']))
+                except ESSAY_ERRORS as e:
+                    finish(path, name, error=e)
+                except Exception as e:
+                    logger.exception("Unexpected error generating %s for %s", name, path)
+                    finish(path, name, error=e)
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                futures = {
+                    pool.submit(_generate_format, name, pending[path]['view']): (path, name)
+                    for path, name in tasks
+                }
+                for future in as_completed(futures):
+                    path, name = futures[future]
+                    try:
+                        finish(path, name, future.result())
+                    except ESSAY_ERRORS as e:
+                        finish(path, name, error=e)
+                    except Exception as e:
+                        logger.exception("Unexpected error generating %s for %s", name, path)
+                        finish(path, name, error=e)
+
+        for path in pending:
+            if not formats:
+                saves[path] = savers.submit(save, path)
+
+    for path, job in pending.items():
+        try:
+            saves[path].result()
+        except ESSAY_ERRORS as e:
+            job.setdefault('error', str(e))
+        except Exception as e:
+            logger.exception("Unexpected error saving %s", job['name'])
+            job.setdefault('error', str(e))
+
+        if 'error' in job:
+            summaries[path] = {'essay': job['name'], 'status': 'error', 'error': job['error']}
+        else:
+            summaries[path] = {
+                'essay': job['name'],
+                'status': 'generated',
+                'title': job['view'].get('title') or Essay(path)['title'],
+                'formats': list(formats)
+            }
+
+    update_social_index([job['entry'] for job in pending.values() if 'entry' in job], social_dir)
+    return [summaries[path] for path in essay_paths]
+
+
+def print_batch_summary(summaries):
+    """
+    Print one summary for a batch run
+
+    Args:
+        summaries (list): Results from repurpose_essays()
+    """
+    generated = [s for s in summaries if s['status'] == 'generated']
+    skipped = [s for s in summaries if s['status'] == 'skipped']
+    failed = [s for s in summaries if s['status'] == 'error']
+
+    print(f"\n{'='*60}")
+    print(f"SOCIAL REPURPOSE BATCH: {len(summaries)} essays")
+    print(f"{'='*60}\n")
+    print(f"✓ Generated: {len(generated)}")
+    print(f"↷ Up to date (skipped): {len(skipped)}")
+
+    if failed:
+        print(f"✗ Failed: {len(failed)}")
+        for summary in failed:
+            print(f"  - {summary['essay']}: {summary['error']}")
+
+    print(f"\nOutput directory: {SOCIAL_DIR}")
+
+
+def social_status(essays_dir=None, social_dir=None, pattern='*.md'):
+    """
+    Compare the social index with essay sources
+
+    Builds the index from metadata files first if it does not exist yet.
+
+    Args:
+        essays_dir (Path): Essay sources (defaults to CONTENT_DIR / "essays")
+        social_dir (Path): Output root (defaults to SOCIAL_DIR)
+        pattern (str): Essay filename pattern
+
+    Returns:
+        list: One row per essay, sorted by name, with essay, state
+        (current, stale, not generated or source missing), generated_date,
+        formats and chars
+    """
+    essays_dir = Path(essays_dir or CONTENT_DIR / "essays")
+    social_dir = Path(social_dir or SOCIAL_DIR)
+
+    if social_index_path(social_dir).exists():
+        index = load_social_index(social_dir)
+    else:
+        index = rebuild_social_index(social_dir)
+
+    sources = {path.stem: path for path in essays_dir.glob(pattern)}
+    templates_hash = templates_digest()
+    rows = []
+    for essay_name in sorted(set(sources) | set(index['essays'])):
+        entry = index['essays'].get(essay_name)
+        if entry is None:
+            state = 'not generated'
+        elif essay_name not in sources:
+            state = 'source missing'
+        elif is_up_to_date(essay_name, essay_content_hash(sources[essay_name]),
+                           entry.get('formats', []), social_dir, index, templates_hash):
+            state = 'current'
+        else:
+            state = 'stale'
+
+        entry = entry or {}
+        rows.append({
+            'essay': essay_name,
+            'state': state,
+            'generated_date': entry.get('generated_date'),
+            'formats': entry.get('formats', []),
+            'chars': entry.get('chars', {})
+        })
+    return rows
+
+
+def print_social_status(rows):
+    """
+    Print social_status() rows as a table
+
+    Args:
+        rows (list): Rows from social_status()
+    """
+    print(f"{'ESSAY':<36} {'STATE':<15} {'GENERATED':<17} FORMATS")
+    for row in rows:
+        generated = (row['generated_date'] or '-')[:16].replace('T', ' ')
+        formats = ", ".join(
+            f"{name} ({row['chars'].get(name, '?')})" for name in row['formats']
+        ) or '-'
+        print(f"{row['essay']:<36} {row['state']:<15} {generated:<17} {formats}")
+
+
+def print_format_lengths(essay_paths):
+    """
+    Print template-based format sizes per essay without saving anything
+
+    Args:
+        essay_paths (list): Essay markdown files
+    """
+    for essay_path in essay_paths:
+        essay = Essay(essay_path)
+        sizes = ", ".join(
+            f"{name} {m['size']}/{m['limit']}{' ⚠' if m['size'] > m['limit'] else ''}"
+            for name, m in measure_formats(essay).items()
+        )
+        print(f"{Path(essay_path).stem}: {sizes}")
 
 
 def main():
@@ -229,52 +1364,94 @@ def main():
     parser = argparse.ArgumentParser(
         description='Generate social media content from newsletter essays'
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
         '--essay',
-        required=True,
         help='Path to essay markdown file'
     )
+    source.add_argument(
+        '--essays-dir',
+        help='Directory of essays to repurpose in one batch'
+    )
+    parser.add_argument(
+        '--glob',
+        default='*.md',
+        help='Essay filename pattern for --essays-dir (default: *.md)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker processes for --essays-dir (default: CPU count)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate every essay in --essays-dir even if its posts are up to date'
+    )
     parser.add_argument(
         '--formats',
         default='all',
-        help='Formats to generate: all, twitter, linkedin, teaser (comma-separated)'
+        help=f"Formats to generate: all, {', '.join(FORMATS)} (comma-separated)"
+    )
+    parser.add_argument(
+        '--status',
+        action='store_true',
+        help='Show which essays have up-to-date posts, from the social index'
+    )
+    parser.add_argument(
+        '--lengths',
+        action='store_true',
+        help='Report LinkedIn and teaser sizes against their limits without generating'
     )
 
     args = parser.parse_args()
 
-    # Parse essay
-    essay = read_essay(args.essay)
-    if not essay:
+    if args.status:
+        if args.essay:
+            parser.error("--status works with --essays-dir, not --essay")
+        print_social_status(social_status(args.essays_dir, pattern=args.glob))
         return
 
-    print(f"\n{'='*60}")
-    print(f"SOCIAL REPURPOSE: {essay['title']}")
-    print(f"{'='*60}\n")
+    if not (args.essay or args.essays_dir):
+        parser.error("one of --essay, --essays-dir or --status is required")
 
     # Determine which formats to generate
     if args.formats == 'all':
-        formats = ['twitter', 'linkedin', 'teaser']
+        formats = list(FORMATS)
     else:
         formats = [f.strip() for f in args.formats.split(',')]
+        unknown = [f for f in formats if f not in FORMATS]
+        if unknown:
+            parser.error(f"unknown format(s): {', '.join(unknown)}")
+
+    if args.lengths:
+        print_format_lengths(
+            sorted(Path(args.essays_dir).glob(args.glob)) if args.essays_dir else [args.essay]
+        )
+        return
 
-    # Generate content
-    generated_content = {}
-
-    if 'twitter' in formats:
-        generated_content['twitter'] = generate_twitter_thread(essay)
+    if args.essays_dir:
+        essay_paths = sorted(Path(args.essays_dir).glob(args.glob))
+        summaries = repurpose_essays(essay_paths, formats, args.workers, force=args.force)
+        print_batch_summary(summaries)
+        return
 
-    if 'linkedin' in formats:
-        generated_content['linkedin'] = generate_linkedin_post(essay)
+    # A single essay is always regenerated
+    summary = repurpose_essay(args.essay, formats, force=True)
+    if summary['status'] == 'error':
+        print(f"Error: {summary['error']}: {args.essay}")
+        return
 
-    if 'teaser' in formats:
-        generated_content['teaser'] = generate_newsletter_teaser(essay)
+    print(f"\n{'='*60}")
+    print(f"SOCIAL REPURPOSE: {summary['title']}")
+    print(f"{'='*60}\n")
 
-    # Save all generated content
-    essay_name = Path(args.essay).stem
-    save_social_content(essay_name, generated_content)
+    for format_name in summary['formats']:
+        output_file = SOCIAL_DIR / summary['essay'] / f"{format_name}.txt"
+        print(f"✓ Saved {format_name} content to: {output_file}")
 
     print(f"\n{'='*60}")
-    print(f"✓ Social content generated and saved!")
+    print("✓ Social content generated and saved!")
     print(f"{'='*60}\n")
 
 
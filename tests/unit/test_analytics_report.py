@@ -3,16 +3,32 @@ Unit tests for analytics_report.py
 
 Tests analytics tracking and reporting including:
 - Analytics history loading and saving
+- Time-series metrics store
 - Metrics fetching (mocked API calls)
+- Pluggable providers: concurrent fetch, timeouts, caching, recorded fixtures
+- Streaming open/click event ingestion and per-issue aggregates
+- HyperLogLog unique-reader sketches
+- Weekly cohort retention
 - Growth rate calculations
 - Weekly and monthly report generation
+- Rolling-window statistics and quarter/year/custom periods
+- Date-based period selection
+- Incremental month/quarter/year rollups
 - Markdown report formatting
+- Report render cache keyed by data version
+- Streaming CSV/HTML/Parquet exporters
 """
 import pytest
+import contextlib
 import json
+import sqlite3
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 import sys
+import time
+
+import pandas as pd
+import requests
 
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
@@ -25,6 +41,38 @@ from analytics_report import (
     generate_weekly_report,
     generate_monthly_report,
     format_report_markdown,
+    append_metrics,
+    query_metrics,
+    open_analytics_store,
+    load_metrics_frame,
+    rolling_metrics,
+    summarize_metrics,
+    generate_period_report,
+    period_bounds,
+    one_per_week,
+    read_rollup,
+    rollup_summary,
+    MetricsProvider,
+    FixtureProvider,
+    GhostProvider,
+    configured_providers,
+    fetch_provider_metrics,
+    MetricsUnavailableError,
+    merge_metrics,
+    ingest_events,
+    issue_engagement,
+    top_links,
+    top_performing,
+    unique_readers,
+    HyperLogLog,
+    ingest_subscriber_events,
+    cohort_retention,
+    generate_cohort_report,
+    render_report,
+    iter_export_rows,
+    export_csv,
+    export_html,
+    export_parquet,
     ANALYTICS_FILE
 )
 
@@ -199,6 +247,64 @@ class TestSaveAnalyticsHistory:
             analytics_report.ANALYTICS_FILE = original_file
 
 
+class TestAnalyticsStore:
+    """Test the SQLite time-series metrics store"""
+
+    @pytest.fixture(autouse=True)
+    def analytics_file(self, temp_data_dir, monkeypatch):
+        """Point the store at a temporary history file"""
+        import analytics_report
+        analytics_file = temp_data_dir / "analytics_history.json"
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE', analytics_file)
+        return analytics_file
+
+    def _record(self, date, total=1000):
+        return {'date': date, 'subscribers': {'total': total}, 'engagement': {'open_rate': 40.0}}
+
+    def test_json_history_is_imported_once(self, analytics_file):
+        """A new store should import the JSON history, then ignore it"""
+        with open(analytics_file, 'w') as f:
+            json.dump({'newsletter': {'metrics': [self._record("2025-01-01")],
+                                      'last_updated': None}}, f)
+
+        assert len(query_metrics()) == 1
+
+        with open(analytics_file, 'w') as f:
+            json.dump({'newsletter': {'metrics': [], 'last_updated': None}}, f)
+
+        assert len(query_metrics()) == 1
+
+    def test_query_by_date_range_and_last(self):
+        """Queries should return only the requested window, oldest first"""
+        days = [("2025-01-15", 3), ("2025-01-01", 1), ("2025-01-08", 2), ("2025-02-01", 4)]
+        for day, total in days:
+            append_metrics(self._record(day, total))
+
+        january = query_metrics(start="2025-01-01", end="2025-02-01")
+        assert [m['subscribers']['total'] for m in january] == [1, 2, 3]
+        assert [m['subscribers']['total'] for m in query_metrics(last=2)] == [3, 4]
+
+    def test_metric_columns_are_flattened(self):
+        """Numeric fields should be queryable as columns; missing ones are NULL"""
+        append_metrics(self._record("2025-01-01", 1234))
+
+        with open_analytics_store() as conn:
+            row = conn.execute(
+                "SELECT subscribers_total, open_rate, revenue_total FROM metrics"
+            ).fetchone()
+        conn.close()
+
+        assert row == (1234, 40.0, None)
+
+    def test_weekly_report_appends_without_rewriting_json(self, analytics_file):
+        """Weekly runs should append to the store and leave the JSON file alone"""
+        generate_weekly_report(compare=False)
+        generate_weekly_report(compare=True)
+
+        assert not analytics_file.exists()
+        assert len(query_metrics()) == 2
+
+
 class TestFetchCurrentMetrics:
     """Test fetching current metrics from newsletter platform"""
 
@@ -254,6 +360,526 @@ class TestFetchCurrentMetrics:
         assert revenue['total'] >= 0
 
 
+class TestMetricsProviders:
+    """Test pluggable providers, concurrent fetch, caching and merging"""
+
+    FIXTURES = Path(__file__).parent.parent / "fixtures" / "metrics_providers"
+
+    @pytest.fixture(autouse=True)
+    def analytics_file(self, temp_data_dir, monkeypatch):
+        """Keep the provider cache in a temporary store"""
+        import analytics_report
+        analytics_file = temp_data_dir / "analytics_history.json"
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE', analytics_file)
+        return analytics_file
+
+    class _Stub(MetricsProvider):
+        """Provider returning a fixed subscriber total after an optional delay"""
+
+        def __init__(self, name, total, delay=0.0, timeout=5, cache_ttl=0, error=None):
+            self.name, self.total, self.delay, self.error = name, total, delay, error
+            self.timeout, self.cache_ttl = timeout, cache_ttl
+            self.requests = 0
+
+        def request(self):
+            self.requests += 1
+            time.sleep(self.delay)
+            if self.error:
+                raise self.error
+            return {'total': self.total}
+
+        @staticmethod
+        def parse(raw):
+            return {'subscribers': {'total': raw['total']}}
+
+    def test_recorded_fixtures_merge_into_schema(self):
+        """Fixture payloads should parse and merge into one metrics record"""
+        providers = [FixtureProvider(path) for path in sorted(self.FIXTURES.glob("*.json"))]
+
+        metrics = fetch_current_metrics(providers)
+
+        assert metrics['subscribers'] == {
+            'total': 1300, 'new_this_week': 17, 'unsubscribed': 2, 'net_growth': 15
+        }
+        # Only Beehiiv reports rates, so they are its rates unweighted by the others
+        assert metrics['engagement']['open_rate'] == 45.0
+        assert metrics['engagement']['total_clicks'] == 81
+        assert metrics['revenue']['total'] is None
+
+    def test_configured_providers_follow_environment(self):
+        """Providers should be enabled by their credentials, falling back to mock"""
+        assert [p.name for p in configured_providers({})] == ['mock']
+
+        env = {'BEEHIIV_API_KEY': 'key', 'BEEHIIV_PUBLICATION_ID': 'pub_1', 'GHOST_API_KEY': 'x'}
+        assert [p.name for p in configured_providers(env)] == ['beehiiv']
+
+    def test_rates_are_weighted_by_subscribers(self):
+        """Rates from several platforms should be averaged by audience size"""
+        merged = merge_metrics([
+            {'subscribers': {'total': 300}, 'engagement': {'open_rate': 40.0}},
+            {'subscribers': {'total': 100}, 'engagement': {'open_rate': 60.0}},
+        ])
+
+        assert merged['engagement']['open_rate'] == 45.0
+        assert merged['subscribers']['total'] == 400
+
+    def test_providers_are_fetched_concurrently(self):
+        """Slow providers should overlap rather than run back to back"""
+        providers = [self._Stub(f"slow{i}", 10, delay=0.3) for i in range(4)]
+
+        started = time.monotonic()
+        parts, _ = fetch_provider_metrics(providers)
+
+        assert time.monotonic() - started < 0.9
+        assert [part['subscribers']['total'] for part in parts] == [10] * 4
+
+    def test_timed_out_provider_is_skipped(self):
+        """A provider past its deadline should not hold up or break the merge"""
+        providers = [self._Stub("fast", 10), self._Stub("stuck", 99, delay=1.0, timeout=0.1)]
+
+        started = time.monotonic()
+        parts, skipped = fetch_provider_metrics(providers)
+
+        assert time.monotonic() - started < 0.8
+        assert [part['subscribers']['total'] for part in parts] == [10]
+        assert skipped == ['stuck']
+
+    def test_fresh_cache_skips_request(self):
+        """A payload within cache_ttl should be reused without a request"""
+        first = self._Stub("cached", 10, cache_ttl=60)
+        fetch_provider_metrics([first])
+
+        second = self._Stub("cached", 20, cache_ttl=60)
+        parts, _ = fetch_provider_metrics([second])
+
+        assert second.requests == 0
+        assert parts[0]['subscribers']['total'] == 10
+
+    def test_stale_cache_covers_failures(self):
+        """An expired payload should still stand in when the platform fails"""
+        fetch_provider_metrics([self._Stub("flaky", 10, cache_ttl=60)])
+
+        failing = self._Stub("flaky", 20, cache_ttl=1e-9, error=requests.HTTPError("HTTP 503"))
+        parts, skipped = fetch_provider_metrics([failing])
+
+        assert failing.requests == 1
+        assert parts[0]['subscribers']['total'] == 10
+        assert skipped == []
+
+    def test_all_providers_failing_records_nothing(self, analytics_file):
+        """With no data from any provider the weekly run should abort, not store zeros"""
+        failing = [self._Stub("down", 10, error=requests.HTTPError("HTTP 503"))]
+
+        with pytest.raises(MetricsUnavailableError):
+            generate_weekly_report(providers=failing)
+
+        assert query_metrics() == []
+
+    def test_partial_metrics_are_flagged_and_not_stored(self, analytics_file):
+        """A report missing a provider should say so and stay out of history"""
+        providers = [self._Stub("up", 10),
+                     self._Stub("down", 20, error=requests.HTTPError("HTTP 503"))]
+
+        report = generate_weekly_report(providers=providers)
+
+        assert report['current']['partial'] == ['down']
+        assert report['current']['subscribers']['total'] == 10
+        assert "no data from down" in format_report_markdown(report)
+        assert query_metrics() == []
+
+    def test_subscribers_only_provider_leaves_other_fields_unreported(self):
+        """Fields no provider reports should be stored as NULL, not as zero readings"""
+        report = generate_weekly_report(providers=[self._Stub("ghost", 500)])
+
+        current = report['current']
+        assert current['subscribers']['net_growth'] is None
+        assert current['engagement']['open_rate'] is None
+        assert current['revenue']['total'] is None
+        assert "- **Open rate:** n/a" in format_report_markdown(report)
+        with contextlib.closing(open_analytics_store()) as conn:
+            row = conn.execute(
+                "SELECT subscribers_total, open_rate, revenue_total FROM metrics"
+            ).fetchone()
+        assert row == (500, None, None)
+
+        report = generate_weekly_report(compare=True, providers=[self._Stub("ghost", 550)])
+
+        assert report['changes']['subscriber_growth'] == 10.0
+        assert report['changes']['open_rate_change'] is None
+        assert "- **Open rate change:** n/a" in format_report_markdown(report)
+
+    def test_provider_must_implement_request_and_parse(self):
+        """The provider base class should not be instantiable on its own"""
+        with pytest.raises(TypeError):
+            MetricsProvider()
+
+    def test_ghost_token_is_signed_admin_jwt(self):
+        """Ghost requests should carry an HS256 token signed with the key secret"""
+        import base64
+        import hashlib
+        import hmac
+
+        secret = "00" * 32
+        token = GhostProvider("https://example.ghost.io/", f"key123:{secret}")._token()
+        header, payload, signature = token.split('.')
+
+        def decode(part):
+            return base64.urlsafe_b64decode(part + '=' * (-len(part) % 4))
+
+        assert json.loads(decode(header)) == {'alg': 'HS256', 'kid': 'key123', 'typ': 'JWT'}
+        assert json.loads(decode(payload))['aud'] == '/admin/'
+        expected = hmac.new(bytes.fromhex(secret), f"{header}.{payload}".encode(), hashlib.sha256)
+        assert decode(signature) == expected.digest()
+
+
+class TestEventIngestion:
+    """Test streaming ingestion and aggregation of open/click events"""
+
+    @pytest.fixture(autouse=True)
+    def analytics_file(self, temp_data_dir, monkeypatch):
+        """Point the store at a temporary history file"""
+        import analytics_report
+        analytics_file = temp_data_dir / "analytics_history.json"
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE', analytics_file)
+        return analytics_file
+
+    EVENTS = (
+        {'type': 'open', 'issue': 'AI Regulation', 'timestamp': '2025-03-03T08:00:00Z',
+         'read_seconds': 300},
+        {'type': 'open', 'issue': 'AI Regulation', 'timestamp': '2025-03-03T09:00:00Z',
+         'read_seconds': 420},
+        {'type': 'open', 'issue': 'Remote Work', 'timestamp': '2025-03-04T08:00:00Z',
+         'read_seconds': 360},
+        {'type': 'click', 'issue': 'Remote Work', 'timestamp': '2025-03-04T08:05:00Z',
+         'url': 'https://a.example'},
+        {'type': 'click', 'issue': 'Remote Work', 'timestamp': '2025-03-05T10:00:00Z',
+         'url': 'https://a.example'},
+        {'type': 'click', 'issue': 'AI Regulation', 'timestamp': '2025-03-05T11:00:00Z',
+         'url': 'https://b.example'},
+        {'type': 'bounce', 'issue': 'Remote Work', 'timestamp': '2025-03-05T11:00:00Z'},
+        {'type': 'open', 'issue': 'Remote Work', 'timestamp': 'not a date'},
+    )
+
+    def _write_jsonl(self, path, events):
+        with open(path, 'w') as f:
+            f.writelines(json.dumps(event) + "\n" for event in events)
+        return path
+
+    def _write_csv(self, path, events):
+        import csv
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['type', 'issue', 'timestamp', 'url',
+                                                   'read_seconds', 'subscriber'])
+            writer.writeheader()
+            for event in events:
+                writer.writerow({**event, 'subscriber': 'reader@example.com'})
+        return path
+
+    def test_events_aggregate_per_issue_and_link(self, temp_data_dir):
+        """Opens, clicks, read time and link clicks should be summed per issue"""
+        path = self._write_jsonl(temp_data_dir / "events.jsonl", self.EVENTS)
+        stats = ingest_events(path, chunk_rows=3)
+
+        assert stats == {'events': 6, 'skipped': 2, 'duplicate': False}
+        by_issue = {row['issue']: row for row in issue_engagement()}
+        assert (by_issue['AI Regulation']['opens'], by_issue['AI Regulation']['clicks']) == (2, 1)
+        assert (by_issue['Remote Work']['opens'], by_issue['Remote Work']['clicks']) == (1, 2)
+        assert top_links() == [('https://a.example', 2), ('https://b.example', 1)]
+        assert top_links(issue='AI Regulation') == [('https://b.example', 1)]
+
+    def test_csv_and_jsonl_agree_across_chunk_sizes(self, temp_data_dir, monkeypatch):
+        """Chunking and file format should not change the aggregates"""
+        ingest_events(self._write_csv(temp_data_dir / "events.csv", self.EVENTS), chunk_rows=2)
+        from_csv = issue_engagement()
+
+        import analytics_report
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE', temp_data_dir / "other.json")
+        path = self._write_jsonl(temp_data_dir / "events.jsonl", self.EVENTS)
+        ingest_events(path, chunk_rows=100)
+
+        assert issue_engagement() == from_csv
+
+    def test_day_window_selects_events(self, temp_data_dir):
+        """Per-day aggregates should be selectable by an ISO day window"""
+        ingest_events(self._write_jsonl(temp_data_dir / "events.jsonl", self.EVENTS))
+
+        window = issue_engagement(start="2025-03-04", end="2025-03-05")
+        rows = [(row['issue'], row['opens'], row['clicks']) for row in window]
+        assert rows == [('Remote Work', 1, 1)]
+
+    def test_link_clicks_are_kept_per_day(self, temp_data_dir):
+        """Top links should be selectable by the same day window as engagement"""
+        ingest_events(self._write_jsonl(temp_data_dir / "events.jsonl", self.EVENTS))
+
+        assert top_links(start="2025-03-05") == [('https://a.example', 1), ('https://b.example', 1)]
+        assert top_links(end="2025-03-05") == [('https://a.example', 1)]
+
+    def test_numeric_issue_ids_keep_their_keys(self, temp_data_dir):
+        """Blank cells must not turn numeric ids into floats ("12.0" next to "12")"""
+        events = [
+            {'type': 'open', 'issue': 12, 'timestamp': '2025-03-03T08:00:00Z'},
+            {'type': 'open', 'issue': '', 'timestamp': '2025-03-03T08:00:00Z'},
+        ]
+        ingest_events(self._write_csv(temp_data_dir / "events.csv", events))
+        ingest_events(self._write_jsonl(temp_data_dir / "events.jsonl",
+                                        [events[0], {**events[1], 'issue': None}]))
+
+        assert [(row['issue'], row['opens']) for row in issue_engagement()] == [('12', 2)]
+
+    def test_reingesting_same_export_is_noop(self, temp_data_dir):
+        """Importing an export twice should not double its counts"""
+        path = self._write_jsonl(temp_data_dir / "events.jsonl", self.EVENTS)
+        ingest_events(path)
+
+        assert ingest_events(path)['duplicate'] is True
+        assert sum(row['opens'] for row in issue_engagement()) == 3
+
+    def test_missing_required_field_rolls_back(self, temp_data_dir):
+        """An export without required columns should fail without partial counts"""
+        path = self._write_jsonl(temp_data_dir / "events.jsonl", [{'type': 'open', 'issue': 'X'}])
+
+        with pytest.raises(ValueError, match="timestamp"):
+            ingest_events(path)
+        assert issue_engagement() == []
+
+    def test_top_performing_is_computed_from_events(self, temp_data_dir):
+        """The top_performing section should rank ingested issues"""
+        ingest_events(self._write_jsonl(temp_data_dir / "events.jsonl", self.EVENTS))
+
+        assert top_performing() == {
+            'most_opened': 'AI Regulation',
+            'most_clicked': 'Remote Work',
+            'avg_read_time': '6.0 minutes'
+        }
+        assert top_performing(start="2030-01-01") is None
+
+    def test_weekly_report_uses_recent_events(self, temp_data_dir):
+        """Events from the last week should replace provider top_performing"""
+        now = datetime.now().isoformat()
+        events = [
+            {'type': 'open', 'issue': 'This Week', 'timestamp': now, 'read_seconds': 120},
+            {'type': 'click', 'issue': 'This Week', 'timestamp': now, 'url': 'https://c.example'},
+        ]
+        ingest_events(self._write_jsonl(temp_data_dir / "events.jsonl", events))
+
+        top = generate_weekly_report()['current']['top_performing']
+
+        assert top['most_opened'] == 'This Week'
+        assert top['avg_read_time'] == '2.0 minutes'
+
+
+class TestUniqueReaders:
+    """Test HyperLogLog sketches of unique openers and clickers"""
+
+    @pytest.fixture(autouse=True)
+    def analytics_file(self, temp_data_dir, monkeypatch):
+        """Point the store at a temporary history file"""
+        import analytics_report
+        analytics_file = temp_data_dir / "analytics_history.json"
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE', analytics_file)
+        return analytics_file
+
+    def _write_events(self, path, events):
+        with open(path, 'w') as f:
+            f.writelines(json.dumps(event) + "\n" for event in events)
+        return path
+
+    def _opens(self, issue, day, readers, kind='open'):
+        return [
+            {'type': kind, 'issue': issue, 'timestamp': f"{day}T08:00:00Z",
+             'subscriber': f"reader{n}@example.com"}
+            for n in readers
+        ]
+
+    def test_sketch_estimates_large_cardinality(self):
+        """Estimates should be within a few percent of the true distinct count"""
+        sketch = HyperLogLog().add(f"reader{n}" for n in range(50_000))
+        sketch.add(f"reader{n}" for n in range(10_000))
+
+        assert abs(sketch.count() - 50_000) / 50_000 < 0.03
+
+    def test_small_counts_are_near_exact(self):
+        """Linear counting should make small sets almost exact"""
+        assert HyperLogLog().count() == 0
+        assert abs(HyperLogLog().add(range(100)).count() - 100) <= 1
+
+    def test_merge_is_union_and_round_trips(self):
+        """Merged sketches should count the union, also after serialization"""
+        first = HyperLogLog().add(range(20_000))
+        second = HyperLogLog.from_bytes(HyperLogLog().add(range(10_000, 30_000)).to_bytes())
+
+        union = first.merge(second).count()
+
+        assert abs(union - 30_000) / 30_000 < 0.03
+        assert HyperLogLog.from_bytes(first.to_bytes()).count() == union
+
+    def test_unique_readers_per_issue_day_and_window(self, temp_data_dir):
+        """Repeat opens should count once per window, across issues and days"""
+        events = (
+            self._opens('Issue 1', '2025-03-03', range(100))
+            + self._opens('Issue 1', '2025-03-04', range(50, 150))
+            + self._opens('Issue 2', '2025-04-07', range(100, 200))
+            + self._opens('Issue 2', '2025-04-07', range(10), kind='click')
+        )
+        ingest_events(self._write_events(temp_data_dir / "events.jsonl", events), chunk_rows=64)
+
+        assert abs(unique_readers(issue='Issue 1') - 150) <= 2
+        assert abs(unique_readers(start="2025-03-04", end="2025-03-05") - 100) <= 2
+        assert abs(unique_readers(start="2025-03-01", end="2025-04-01") - 150) <= 2
+        assert abs(unique_readers() - 200) <= 2
+        assert abs(unique_readers(kind='click') - 10) <= 1
+        assert unique_readers(start="2030-01-01") is None
+
+    def test_sketches_merge_across_imports(self, temp_data_dir):
+        """A reader seen in two exports of the same day should count once"""
+        for name, readers in (("a.jsonl", range(60)), ("b.jsonl", range(30, 90))):
+            events = self._opens('Issue 1', '2025-03-03', readers)
+            ingest_events(self._write_events(temp_data_dir / name, events))
+
+        assert abs(unique_readers() - 90) <= 2
+
+    def test_period_report_includes_unique_readers(self, temp_data_dir):
+        """Period summaries should carry unique reader estimates from sketches"""
+        append_metrics({'date': "2025-03-03", 'subscribers': {'total': 500},
+                        'engagement': {'open_rate': 40.0}})
+        events = self._opens('Issue 1', '2025-03-03', range(40))
+        ingest_events(self._write_events(temp_data_dir / "events.jsonl", events))
+
+        report = generate_period_report('custom', start="2025-03-01", end="2025-03-31")
+
+        assert abs(report['summary']['unique_openers'] - 40) <= 1
+        assert report['summary']['unique_clickers'] == 0
+        assert "Unique openers / clickers" in format_report_markdown(report)
+
+
+class TestCohortRetention:
+    """Test the incremental weekly cohort retention engine"""
+
+    @pytest.fixture(autouse=True)
+    def analytics_file(self, temp_data_dir, monkeypatch):
+        """Point the store at a temporary history file"""
+        import analytics_report
+        analytics_file = temp_data_dir / "analytics_history.json"
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE', analytics_file)
+        return analytics_file
+
+    def _write_events(self, path, events):
+        with open(path, 'w') as f:
+            f.write("type,subscriber,timestamp\n")
+            for kind, subscriber, when in events:
+                stamp = f"{when.isoformat()}Z" if isinstance(when, datetime) else when
+                f.write(f"{kind},{subscriber},{stamp}\n")
+        return path
+
+    def _monday(self, when):
+        return (when - timedelta(days=when.weekday())).date()
+
+    def test_matches_brute_force_across_chunks_and_imports(self, temp_data_dir):
+        """Out-of-order, chunked imports should give the exact retention matrix"""
+        import random
+        rng = random.Random(7)
+        base = datetime(2025, 1, 6)
+        events = []
+        for n in range(300):
+            joined = base + timedelta(days=rng.randint(0, 60), hours=rng.randint(0, 23))
+            events.append(('subscribe', f"s{n}", joined))
+            if rng.random() < 0.5:
+                events.append(('unsubscribe', f"s{n}", joined + timedelta(days=rng.randint(0, 50))))
+        events.sort(key=lambda event: event[2])
+
+        # Later weeks first, so merges must not depend on arrival order
+        half = len(events) // 2
+        for name, part, chunk_rows in (("late.csv", events[half:], 37),
+                                       ("early.csv", events[:half], 41)):
+            path = self._write_events(temp_data_dir / name, part)
+            ingest_subscriber_events(path, chunk_rows=chunk_rows)
+
+        state = {}
+        for kind, subscriber, when in events:
+            joins, leaves = state.setdefault(subscriber, ([], []))
+            (joins if kind == 'subscribe' else leaves).append(when)
+        latest = self._monday(events[-1][2])
+        expected = {}
+        for joins, leaves in state.values():
+            cohort = self._monday(min(joins))
+            left = leaves and max(leaves) >= max(joins)
+            exit_week = self._monday(max(leaves)) if left else None
+            expected.setdefault(cohort, []).append(exit_week)
+
+        sizes, retention = cohort_retention()
+
+        for cohort, exits in expected.items():
+            key = cohort.isoformat()
+            assert sizes[key] == len(exits)
+            for age in retention.columns:
+                week = cohort + timedelta(weeks=age)
+                if week > latest:
+                    assert pd.isna(retention.loc[key, age])
+                    continue
+                kept = sum(1 for exit_week in exits if exit_week is None or exit_week > week)
+                assert retention.loc[key, age] == round(kept / len(exits) * 100, 1)
+
+    def test_resubscribing_keeps_first_cohort(self, temp_data_dir):
+        """A subscriber who leaves and rejoins stays retained in their first cohort"""
+        events = [
+            ('subscribe', 'a', datetime(2025, 1, 6)),
+            ('unsubscribe', 'a', datetime(2025, 1, 14)),
+            ('subscribe', 'a', datetime(2025, 1, 22)),
+            ('subscribe', 'b', datetime(2025, 1, 7)),
+            ('unsubscribe', 'b', datetime(2025, 1, 21)),
+        ]
+        ingest_subscriber_events(self._write_events(temp_data_dir / "events.csv", events))
+
+        sizes, retention = cohort_retention()
+
+        assert sizes.to_dict() == {'2025-01-06': 2}
+        assert list(retention.loc['2025-01-06']) == [100.0, 100.0, 50.0]
+
+    def test_new_weeks_update_incrementally(self, temp_data_dir):
+        """A later import should extend the matrix and move changed subscribers"""
+        ingest_subscriber_events(self._write_events(temp_data_dir / "week1.csv", [
+            ('subscribe', 'a', datetime(2025, 1, 6)),
+            ('subscribe', 'b', datetime(2025, 1, 6)),
+        ]))
+        assert list(cohort_retention()[1].columns) == [0]
+
+        ingest_subscriber_events(self._write_events(temp_data_dir / "week2.csv", [
+            ('unsubscribe', 'b', datetime(2025, 1, 14)),
+            ('subscribe', 'c', datetime(2025, 1, 15)),
+        ]))
+        sizes, retention = cohort_retention()
+
+        assert sizes.to_dict() == {'2025-01-06': 2, '2025-01-13': 1}
+        assert list(retention.loc['2025-01-06']) == [100.0, 50.0]
+        assert retention.loc['2025-01-13', 0] == 100.0
+        assert pd.isna(retention.loc['2025-01-13', 1])
+
+    def test_cohort_report_and_markdown(self, temp_data_dir):
+        """The cohort report should list cohorts and a size-weighted average"""
+        ingest_subscriber_events(self._write_events(temp_data_dir / "events.csv", [
+            ('subscribe', 'a', datetime(2025, 1, 6)),
+            ('subscribe', 'b', datetime(2025, 1, 6)),
+            ('unsubscribe', 'b', datetime(2025, 1, 14)),
+            ('subscribe', 'c', datetime(2025, 1, 13)),
+            ('subscribe', 'bogus', 'not a date'),
+        ]))
+
+        report = generate_cohort_report(weeks=4)
+
+        assert report['range'] == {'start': '2025-01-06', 'end': '2025-01-19'}
+        assert [cohort['size'] for cohort in report['cohorts']] == [2, 1]
+        assert report['cohorts'][1]['retention'] == [100.0, None]
+        assert report['average_retention'] == [100.0, 50.0]
+
+        markdown = format_report_markdown(report)
+        assert "# COHORT RETENTION NEWSLETTER ANALYTICS" in markdown
+        assert "| 2025-01-06 | 2 | 100% | 50% |" in markdown
+
+    def test_cohort_report_without_events(self):
+        """Without subscriber events there is no cohort report"""
+        assert generate_cohort_report() is None
+
+
 class TestCalculateGrowthRate:
     """Test growth rate calculation"""
 
@@ -388,11 +1014,10 @@ class TestGenerateWeeklyReport:
             # Generate report (should save metrics)
             report = generate_weekly_report(compare=False)
 
-            # Verify history file exists and has data
-            assert analytics_file.exists()
+            # Verify the store exists and has data
+            assert analytics_report.analytics_store_path().exists()
 
-            with open(analytics_file, 'r') as f:
-                history = json.load(f)
+            history = load_analytics_history()
 
             assert len(history['newsletter']['metrics']) > 0
 
@@ -578,6 +1203,410 @@ class TestGenerateMonthlyReport:
             analytics_report.ANALYTICS_FILE = original_file
 
 
+class TestRollingAnalytics:
+    """Test the columnar rolling-window analytics engine"""
+
+    @pytest.fixture(autouse=True)
+    def weekly_history(self, temp_data_dir, monkeypatch):
+        """Store 26 weekly records spanning two quarters of 2025"""
+        import analytics_report
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE',
+                            temp_data_dir / "analytics_history.json")
+        start = datetime(2025, 1, 6)
+        for week in range(26):
+            append_metrics({
+                'date': (start + timedelta(weeks=week)).date().isoformat(),
+                'subscribers': {'total': 1000 + 10 * week, 'new_this_week': 10},
+                'engagement': {'open_rate': 40.0 + week % 4, 'click_through_rate': 8.0},
+                'revenue': {'total': 100}
+            })
+
+    def test_frame_is_columnar_and_date_ordered(self):
+        """The frame should hold numeric columns indexed by ascending date"""
+        frame = load_metrics_frame()
+
+        assert len(frame) == 26
+        assert frame.index.is_monotonic_increasing
+        assert frame['subscribers_total'].iloc[-1] == 1250
+
+    def test_rolling_metrics(self):
+        """Rolling windows should average, sum and track growth"""
+        rolling = rolling_metrics(load_metrics_frame(), window=4)
+
+        assert rolling['new_subscribers'].iloc[-1] == 40
+        assert rolling['avg_open_rate'].iloc[-1] == pytest.approx(41.5)
+        assert rolling['subscriber_growth'].iloc[1] == pytest.approx(1.0)
+        assert rolling['open_rate_ewma'].notna().all()
+
+    def test_summary_statistics(self):
+        """Summaries should include percentiles, EWMA and growth"""
+        summary, trends = summarize_metrics(load_metrics_frame())
+
+        assert summary['total_new_subscribers'] == 260
+        assert summary['open_rate_p50'] == 41.0
+        assert summary['subscriber_growth'] == 25.0
+        assert trends['subscriber_trend'] == 'growing'
+
+    def test_reports_include_trailing_rolling_window(self):
+        """Summary reports should carry the latest rolling window"""
+        report = generate_period_report('quarter')
+
+        assert report['summary']['rolling_new_subscribers'] == 40
+        assert report['summary']['rolling_open_rate'] == pytest.approx(41.5)
+        assert "**Last 4 weeks:** 41.5% open rate, 40 new subscribers" in \
+            format_report_markdown(report)
+
+    def test_quarter_report_covers_latest_calendar_quarter(self):
+        """A quarter report should cover the quarter of the latest record"""
+        report = generate_period_report('quarter')
+
+        assert report['range'] == {'start': '2025-04-01', 'end': '2025-06-30'}
+        assert report['summary']['weeks'] == 13
+
+    def test_custom_range_is_inclusive(self):
+        """Custom ranges should include both end dates"""
+        report = generate_period_report('custom', '2025-01-06', '2025-01-20')
+
+        assert report['summary']['weeks'] == 3
+        assert '# CUSTOM RANGE NEWSLETTER ANALYTICS' in format_report_markdown(report)
+
+    def test_period_bounds(self):
+        """Quarter and year bounds should be calendar aligned with exclusive ends"""
+        assert period_bounds('quarter', datetime(2024, 11, 5)) == ('2024-10-01', '2025-01-01')
+        assert period_bounds('year', datetime(2024, 11, 5)) == ('2024-01-01', '2025-01-01')
+
+
+class TestDatePeriodSelection:
+    """Test selecting report periods by date"""
+
+    @pytest.fixture(autouse=True)
+    def store(self, temp_data_dir, monkeypatch):
+        import analytics_report
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE',
+                            temp_data_dir / "analytics_history.json")
+
+    def _append(self, date, new=10, open_rate=40.0):
+        append_metrics({
+            'date': date,
+            'subscribers': {'total': 1000, 'new_this_week': new},
+            'engagement': {'open_rate': open_rate, 'click_through_rate': 8.0},
+            'revenue': {'total': 100}
+        })
+
+    def test_month_uses_calendar_dates_not_last_entries(self):
+        """A missed week must not pull in records from the previous month"""
+        for date in ["2025-01-27", "2025-02-03", "2025-02-17", "2025-02-24"]:
+            self._append(date)
+
+        report = generate_monthly_report()
+
+        assert report['range'] == {'start': '2025-02-01', 'end': '2025-02-28'}
+        assert report['summary']['weeks'] == 3
+        assert report['summary']['total_new_subscribers'] == 30
+
+    def test_repeated_run_counts_once(self):
+        """Two runs in the same week should count as one week"""
+        self._append("2025-03-03T09:00:00", open_rate=30.0)
+        self._append("2025-03-05T09:00:00", open_rate=50.0)
+        self._append("2025-03-10")
+
+        report = generate_monthly_report()
+
+        assert report['summary']['weeks'] == 2
+        assert report['summary']['avg_open_rate'] == 45.0
+
+    def test_historical_month(self):
+        """Any past month should be reportable"""
+        for date in ["2024-11-04", "2024-11-11", "2025-01-06"]:
+            self._append(date)
+
+        assert generate_monthly_report("2024-11")['summary']['weeks'] == 2
+        assert generate_monthly_report("2024-12") is None
+
+    def test_range_queries_use_date_index(self):
+        """Window queries should search the date index rather than scan"""
+        import analytics_report
+        sql, params = analytics_report._window_sql("record", "2025-01-01", "2025-02-01")
+
+        with open_analytics_store() as conn:
+            plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        conn.close()
+
+        assert "USING INDEX metrics_date" in plan
+
+    def test_one_per_week_keeps_latest(self):
+        """Deduplication should keep the latest record in each week"""
+        self._append("2025-03-03", new=1)
+        self._append("2025-03-04", new=2)
+
+        assert one_per_week(load_metrics_frame())['new_this_week'].tolist() == [2]
+
+
+class TestRollups:
+    """Test incrementally maintained rollup tables"""
+
+    @pytest.fixture(autouse=True)
+    def store(self, temp_data_dir, monkeypatch):
+        import analytics_report
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE',
+                            temp_data_dir / "analytics_history.json")
+
+    def _append(self, date, total, new, open_rate, revenue=100):
+        append_metrics({
+            'date': date,
+            'subscribers': {'total': total, 'new_this_week': new},
+            'engagement': {'open_rate': open_rate, 'click_through_rate': 8.0},
+            'revenue': {'total': revenue}
+        })
+
+    def test_rollups_match_raw_summaries(self):
+        """Rollups should agree with summaries computed from records"""
+        import random
+        rng = random.Random(7)
+        days = [datetime(2024, 10, 1) + timedelta(days=rng.randrange(200)) for _ in range(60)]
+        for i, day in enumerate(days):
+            self._append(day.isoformat(), 1000 + i, rng.randrange(20), 30 + rng.random() * 20,
+                         rng.randrange(500))
+
+        for period, key, start, end in [
+            ('month', '2024-12', '2024-12-01', '2025-01-01'),
+            ('quarter', '2025-Q1', '2025-01-01', '2025-04-01'),
+            ('year', '2024', '2024-01-01', '2025-01-01'),
+        ]:
+            from_rollup, rollup_trends = rollup_summary(read_rollup(period, key))
+            from_frame, frame_trends = summarize_metrics(
+                one_per_week(load_metrics_frame(start=start, end=end))
+            )
+            for field, value in from_rollup.items():
+                assert value == pytest.approx(from_frame[field]), (period, field)
+            assert rollup_trends == frame_trends
+
+    def test_later_record_in_same_week_replaces_contribution(self):
+        """A rerun in the same week should replace, not add to, the week"""
+        self._append("2025-03-03", 1000, 10, 40.0)
+        self._append("2025-03-05", 1010, 12, 50.0)
+        self._append("2025-03-04", 1005, 99, 10.0)  # older than the counted record
+
+        rollup = read_rollup('month', '2025-03')
+
+        assert rollup['weeks'] == 1
+        assert rollup['new_subscribers'] == 12
+        assert rollup['open_rate_sum'] == 50.0
+
+    def test_monthly_report_reads_rollups_and_compares(self, monkeypatch):
+        """Calendar reports should take totals from rollups and compare periods"""
+        import analytics_report
+        self._append("2025-01-06", 1000, 10, 40.0, revenue=100)
+        self._append("2025-02-03", 1020, 20, 44.0, revenue=150)
+        monkeypatch.setattr(analytics_report, 'summarize_metrics',
+                            lambda frame: pytest.fail("raw summary should not be used"))
+
+        report = generate_monthly_report()
+
+        assert report['summary']['total_new_subscribers'] == 20
+        assert report['comparison'] == {
+            'previous': '2025-01',
+            'new_subscribers_growth': 100.0,
+            'revenue_growth': 50.0,
+            'open_rate_change': 4.0
+        }
+        assert '## vs 2025-01' in format_report_markdown(report)
+
+
+class TestReportCache:
+    """Test cached report renders keyed by data version"""
+
+    @pytest.fixture(autouse=True)
+    def analytics_file(self, temp_data_dir, monkeypatch):
+        """Point the store at a temporary history file with a quarter of data"""
+        import analytics_report
+        analytics_file = temp_data_dir / "analytics_history.json"
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE', analytics_file)
+        for day, total in (("2025-01-06", 1000), ("2025-02-03", 1100), ("2025-03-03", 1200)):
+            append_metrics({'date': day, 'subscribers': {'total': total, 'new_this_week': 25},
+                            'engagement': {'open_rate': 40.0, 'click_through_rate': 8.0},
+                            'revenue': {'total': 100}})
+        return analytics_file
+
+    @pytest.fixture
+    def generations(self, monkeypatch):
+        """Count calls that actually build a report"""
+        import analytics_report
+        calls = []
+        original = analytics_report.generate_report
+
+        def counting(*args):
+            calls.append(args)
+            return original(*args)
+
+        monkeypatch.setattr(analytics_report, 'generate_report', counting)
+        return calls
+
+    def _data_version(self):
+        with contextlib.closing(open_analytics_store()) as conn:
+            return conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()[0]
+
+    def test_writes_advance_data_version(self, temp_data_dir):
+        """Appends and event imports should each advance the data version"""
+        before = int(self._data_version())
+        append_metrics({'date': "2025-03-10", 'subscribers': {'total': 1250}})
+        events = temp_data_dir / "events.csv"
+        events.write_text("type,issue,timestamp\nopen,Issue 1,2025-03-10T08:00:00Z\n")
+        ingest_events(events)
+
+        assert int(self._data_version()) == before + 2
+
+    def test_repeated_render_is_cached(self, generations):
+        """A second render with unchanged data should not rebuild the report"""
+        first = render_report('quarter')
+        second = render_report('quarter')
+
+        assert "QUARTERLY NEWSLETTER ANALYTICS" in first
+        assert len(generations) == 1
+        # Same report, but its (old) generation time is flagged as cached
+        generated = next(line for line in first.splitlines() if line.startswith("**Generated:**"))
+        assert second == first.replace(generated, generated + " (cached: no new data since)")
+        assert json.loads(render_report('quarter', output='json')).get('cached') is None
+        assert json.loads(render_report('quarter', output='json'))['cached'] is True
+
+    def test_stale_renders_are_pruned(self):
+        """Advancing the data version should drop renders keyed by older versions"""
+        render_report('quarter')
+        render_report('year')
+        append_metrics({'date': "2025-03-10", 'subscribers': {'total': 1300}})
+
+        with contextlib.closing(open_analytics_store()) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM report_cache").fetchone()[0] == 0
+
+    def test_new_data_invalidates_render(self, generations):
+        """Appending metrics should re-render on the next call"""
+        render_report('quarter', output='json')
+        append_metrics({'date': "2025-03-10", 'subscribers': {'total': 1300, 'new_this_week': 100},
+                        'engagement': {'open_rate': 50.0, 'click_through_rate': 9.0},
+                        'revenue': {'total': 100}})
+        rendered = json.loads(render_report('quarter', output='json'))
+
+        assert len(generations) == 2
+        assert rendered['summary']['total_new_subscribers'] == 175
+
+    def test_ranges_and_outputs_are_cached_separately(self, generations):
+        """Each (period, range, output) should have its own cache entry"""
+        january = render_report('custom', start="2025-01-01", end="2025-01-31")
+        february = render_report('custom', start="2025-02-01", end="2025-02-28")
+        render_report('custom', output='json', start="2025-01-01", end="2025-01-31")
+
+        assert january != february
+        assert "(cached" in render_report('custom', start="2025-01-01", end="2025-01-31")
+        assert len(generations) == 3
+
+    def test_weekly_reports_are_not_cached(self):
+        """Weekly reports fetch live data, so they cannot be cached"""
+        with pytest.raises(ValueError):
+            render_report('week')
+
+    def test_unchanged_report_file_is_not_rewritten(self, temp_data_dir, monkeypatch):
+        """Re-running with unchanged data should leave the saved report untouched"""
+        import os
+        import analytics_report
+        report_file = temp_data_dir / "quarter.md"
+        monkeypatch.setattr(sys, 'argv', ['analytics_report.py', '--period', 'quarter',
+                                          '--file', str(report_file)])
+        analytics_report.main()
+        saved = report_file.read_text()
+        os.utime(report_file, ns=(0, 0))
+
+        analytics_report.main()
+
+        assert report_file.stat().st_mtime_ns == 0
+        assert report_file.read_text() == saved
+        assert "(cached" not in saved
+
+
+class TestExporters:
+    """Test streaming CSV, HTML and Parquet exports from the store"""
+
+    @pytest.fixture(autouse=True)
+    def analytics_file(self, temp_data_dir, monkeypatch):
+        """Point the store at a temporary history file with a few records"""
+        import analytics_report
+        analytics_file = temp_data_dir / "analytics_history.json"
+        monkeypatch.setattr(analytics_report, 'ANALYTICS_FILE', analytics_file)
+        for day, total in (("2025-01-13", 1100), ("2025-01-06", 1000), ("2025-02-03", 1200)):
+            append_metrics({'date': day, 'subscribers': {'total': total},
+                            'engagement': {'open_rate': 40.0}})
+        return analytics_file
+
+    def test_rows_stream_in_batches_and_date_order(self):
+        """Rows should arrive in date order, at most batch_rows at a time"""
+        batches = list(iter_export_rows('metrics', batch_rows=2))
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        dates = [row[0] for batch in batches for row in batch]
+        assert dates == ["2025-01-06", "2025-01-13", "2025-02-03"]
+
+    def test_csv_export_with_window(self, temp_data_dir):
+        """CSV exports should carry a header and only the requested window"""
+        import csv
+        path = temp_data_dir / "metrics.csv"
+
+        assert export_csv(path, start="2025-01-01", end="2025-02-01") == 2
+
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert [row['date'] for row in rows] == ["2025-01-06", "2025-01-13"]
+        assert float(rows[1]['subscribers_total']) == 1100
+        assert rows[0]['revenue_total'] == ''
+
+    def test_html_export_escapes_values(self, temp_data_dir):
+        """HTML exports should be a complete table with escaped cells"""
+        events = temp_data_dir / "events.csv"
+        events.write_text("type,issue,timestamp\nopen,AI & <Robots>,2025-01-06T08:00:00Z\n")
+        ingest_events(events)
+        path = temp_data_dir / "issues.html"
+
+        assert export_html(path, table='issues') == 1
+
+        content = path.read_text()
+        assert content.startswith("<!DOCTYPE html>") and content.endswith("</html>\n")
+        assert "<th>opens</th>" in content
+        assert "<td>AI &amp; &lt;Robots&gt;</td>" in content
+
+    def test_failed_export_keeps_previous_file(self, temp_data_dir, monkeypatch):
+        """An export that fails mid-stream should leave no partial file behind"""
+        import analytics_report
+        path = temp_data_dir / "metrics.csv"
+        path.write_text("previous export\n")
+
+        def failing_rows(*args):
+            yield [("2025-01-06",) + (None,) * len(analytics_report.METRIC_COLUMNS)]
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(analytics_report, 'iter_export_rows', failing_rows)
+        with pytest.raises(sqlite3.OperationalError):
+            export_csv(path)
+
+        assert path.read_text() == "previous export\n"
+        assert sorted(p.name for p in temp_data_dir.iterdir() if p.suffix == '.tmp') == []
+
+    def test_parquet_export_round_trips(self, temp_data_dir):
+        """Parquet exports should keep column types and rows"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = temp_data_dir / "metrics.parquet"
+
+        assert export_parquet(path) == 3
+
+        table = pq.read_table(path)
+        assert table.column('date').to_pylist() == ["2025-01-06", "2025-01-13", "2025-02-03"]
+        assert table.column('subscribers_total').to_pylist() == [1000.0, 1100.0, 1200.0]
+
+    def test_parquet_without_pyarrow_explains_extra(self, temp_data_dir, monkeypatch):
+        """A missing pyarrow should raise a clear error naming the extra"""
+        monkeypatch.setitem(sys.modules, 'pyarrow', None)
+
+        with pytest.raises(RuntimeError, match=r"\[parquet\]"):
+            export_parquet(temp_data_dir / "metrics.parquet")
+
+
 class TestFormatReportMarkdown:
     """Test markdown report formatting"""
 
@@ -698,9 +1727,8 @@ class TestAnalyticsReportIntegration:
             assert len(weekly_md) > 0
             assert len(monthly_md) > 0
 
-            # Step 4: Verify history file has accumulated data
-            with open(analytics_file, 'r') as f:
-                history = json.load(f)
+            # Step 4: Verify the store has accumulated data
+            history = load_analytics_history()
 
             assert len(history['newsletter']['metrics']) == 4
 
@@ -6,9 +6,17 @@ Tests the fact-checking functionality including:
 - Verification against fact-check library
 - Draft validation in strict/relaxed modes
 - Adding verified claims to library
+- Compiled binary library snapshots
+- Staleness sweeps with resumable checkpoints
+- Shared claim cache across drafts
+- Profiling timing breakdowns
+- Structured logging levels and JSON sink
 """
 import pytest
+import io
 import json
+import logging
+from datetime import datetime
 from pathlib import Path
 import sys
 
@@ -20,6 +28,16 @@ from fact_check import (
     verify_claim,
     check_draft,
     add_to_library,
+    compile_library,
+    open_library_snapshot,
+    snapshot_path_for,
+    find_stale_claims,
+    sweep_library,
+    claim_key,
+    check_drafts,
+    normalize_claim,
+    claim_cache_path,
+    configure_logging,
     FACT_CHECK_LIBRARY
 )
 
@@ -284,6 +302,471 @@ class TestAddToLibrary:
             fact_check.FACT_CHECK_LIBRARY = original_lib
 
 
+class TestLibrarySnapshot:
+    """Test compiling and reading the binary library snapshot"""
+
+    def test_compile_library_round_trip(self, sample_fact_check_library_file,
+                                        sample_fact_check_library):
+        """Snapshot entries should match the JSON source"""
+        import fact_check
+        original_lib = fact_check.FACT_CHECK_LIBRARY
+        fact_check.FACT_CHECK_LIBRARY = sample_fact_check_library_file
+
+        try:
+            snapshot_path = compile_library()
+            assert snapshot_path == snapshot_path_for(sample_fact_check_library_file)
+
+            snapshot = open_library_snapshot()
+            assert snapshot is not None, "Fresh snapshot should open"
+            assert len(snapshot) == len(sample_fact_check_library['verified_claims'])
+            assert snapshot[0] == sample_fact_check_library['verified_claims'][0]
+            assert snapshot[1]['confidence'] == 0.92
+            snapshot.close()
+        finally:
+            fact_check.FACT_CHECK_LIBRARY = original_lib
+
+    def test_verify_claim_uses_snapshot(self, sample_fact_check_library_file):
+        """Exact and substring lookups should work against the snapshot"""
+        import fact_check
+        original_lib = fact_check.FACT_CHECK_LIBRARY
+        fact_check.FACT_CHECK_LIBRARY = sample_fact_check_library_file
+
+        try:
+            compile_library()
+
+            exact = verify_claim("67% of enterprises have implemented AI governance")
+            assert exact['verified'] is True
+            assert exact['source'] == "https://gartner.com/report"
+
+            partial = verify_claim(
+                "Reports say the AI industry is experiencing 45% year-over-year growth today"
+            )
+            assert partial['verified'] is True
+            assert partial['verification_date'] == "2024-12-15"
+
+            missing = verify_claim("Nothing about 12% here", strict=True)
+            assert missing['verified'] is False
+        finally:
+            fact_check.FACT_CHECK_LIBRARY = original_lib
+
+    def test_stale_snapshot_is_ignored(self, sample_fact_check_library_file):
+        """Editing the JSON should invalidate the snapshot until recompiled"""
+        import fact_check
+        original_lib = fact_check.FACT_CHECK_LIBRARY
+        fact_check.FACT_CHECK_LIBRARY = sample_fact_check_library_file
+
+        try:
+            compile_library()
+
+            with open(sample_fact_check_library_file, 'w') as f:
+                json.dump({"verified_claims": []}, f)
+
+            assert open_library_snapshot() is None, "Stale snapshot should not be used"
+            result = verify_claim("67% of enterprises have implemented AI governance")
+            assert result['verified'] is False, "JSON source of truth should win"
+        finally:
+            fact_check.FACT_CHECK_LIBRARY = original_lib
+
+    def test_add_to_library_recompiles_existing_snapshot(self, sample_fact_check_library_file):
+        """Adding a claim should refresh an existing snapshot"""
+        import fact_check
+        original_lib = fact_check.FACT_CHECK_LIBRARY
+        fact_check.FACT_CHECK_LIBRARY = sample_fact_check_library_file
+
+        try:
+            compile_library()
+            add_to_library("Edge inference grew 30% in 2024", "https://example.com/edge")
+
+            snapshot = open_library_snapshot()
+            assert snapshot is not None, "Snapshot should be recompiled"
+            assert len(snapshot) == 3
+            assert snapshot[2]['claim'] == "Edge inference grew 30% in 2024"
+            snapshot.close()
+        finally:
+            fact_check.FACT_CHECK_LIBRARY = original_lib
+
+    def test_snapshot_checks_content_hash_when_mtime_changes(self, sample_fact_check_library_file,
+                                                              monkeypatch):
+        """A touched library keeps its snapshot; same-size edits invalidate it"""
+        import os
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+        compile_library()
+        stat = sample_fact_check_library_file.stat()
+
+        os.utime(sample_fact_check_library_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with open_library_snapshot() as snapshot:
+            assert len(snapshot) == 2
+
+        raw = sample_fact_check_library_file.read_bytes()
+        sample_fact_check_library_file.write_bytes(raw.replace(b"67%", b"76%"))
+        os.utime(sample_fact_check_library_file,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+        assert open_library_snapshot() is None
+
+    def test_library_claims_unmaps_snapshot(self, sample_fact_check_library_file, monkeypatch):
+        """load_library_claims() should close the snapshot when the block exits"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+        compile_library()
+
+        with fact_check.load_library_claims() as claims:
+            assert isinstance(claims, fact_check.LibrarySnapshot)
+            assert len(claims) == 2
+
+        assert claims._mm.closed
+
+    def test_snapshot_matches_json_for_overlapping_claims(self, temp_data_dir, monkeypatch):
+        """The snapshot should return the same entry as the JSON scan, not an exact match"""
+        import fact_check
+        library_file = temp_data_dir / "fact_check_library.json"
+        library_file.write_text(json.dumps({"verified_claims": [
+            {"claim": "AI grew 45% in 2024 across enterprises", "source_url": "https://a.example",
+             "verification_date": "2025-01-01"},
+            {"claim": "AI grew 45% in 2024", "source_url": "https://b.example",
+             "verification_date": "2025-01-02"},
+        ]}))
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', library_file)
+
+        from_json = verify_claim("AI grew 45% in 2024")
+        compile_library()
+        from_snapshot = verify_claim("AI grew 45% in 2024")
+
+        assert from_json['source'] == from_snapshot['source'] == "https://a.example"
+
+    def test_corrupt_snapshot_falls_back_to_json(self, sample_fact_check_library_file):
+        """Unreadable snapshot files should be ignored"""
+        import fact_check
+        original_lib = fact_check.FACT_CHECK_LIBRARY
+        fact_check.FACT_CHECK_LIBRARY = sample_fact_check_library_file
+
+        try:
+            snapshot_path_for(sample_fact_check_library_file).write_bytes(b"not a snapshot")
+
+            assert open_library_snapshot() is None
+            result = verify_claim("67% of enterprises have implemented AI governance")
+            assert result['verified'] is True
+        finally:
+            fact_check.FACT_CHECK_LIBRARY = original_lib
+
+
+class TestClaimCache:
+    """Test the repository-wide claim cache"""
+
+    def test_normalize_claim(self):
+        """Should fold case only, like the library matcher"""
+        assert normalize_claim("67% of Enterprises use AI.") == "67% of enterprises use ai."
+        assert normalize_claim("Revenue grew 45%.") != normalize_claim("Revenue grew 45%")
+
+    def test_old_cache_format_is_discarded(self, sample_essay_file, sample_fact_check_library_file,
+                                           monkeypatch):
+        """Caches keyed by an older normalization should not be reused"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+
+        check_draft(str(sample_essay_file), strict=True)
+        with open(claim_cache_path(), 'r') as f:
+            cache = json.load(f)
+        del cache['format']
+        with open(claim_cache_path(), 'w') as f:
+            json.dump(cache, f)
+
+        report = check_draft(str(sample_essay_file), strict=True)
+
+        assert report['cache_hits'] == 0
+
+    def test_repeated_claims_verified_once(self, temp_data_dir, sample_essay_content,
+                                           sample_fact_check_library_file, monkeypatch):
+        """Claims shared across drafts should come from the cache"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+
+        drafts = []
+        for name in ("first.md", "second.md"):
+            draft = temp_data_dir / name
+            draft.write_text(sample_essay_content)
+            drafts.append(draft)
+
+        first, second = check_drafts(drafts, strict=True)
+
+        assert first['cache_hits'] == 0
+        assert second['cache_hits'] == second['total_claims'] > 0
+        assert second['verified'] == first['verified']
+        assert claim_cache_path().exists(), "Cache should be saved after the batch"
+
+    def test_cache_persists_between_runs(self, sample_essay_file, sample_fact_check_library_file,
+                                         monkeypatch):
+        """A second check of the same draft should reuse the saved cache"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+
+        check_draft(str(sample_essay_file), strict=True)
+        report = check_draft(str(sample_essay_file), strict=True)
+
+        assert report['cache_hits'] == report['total_claims']
+
+    def test_cache_keyed_by_mode(self, sample_essay_file, sample_fact_check_library_file,
+                                 monkeypatch):
+        """Strict and relaxed results should not be shared"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+
+        check_draft(str(sample_essay_file), strict=True)
+        report = check_draft(str(sample_essay_file), strict=False)
+
+        assert report['cache_hits'] == 0
+        assert report['failed'] == 0
+
+    def test_library_change_invalidates_cache(self, sample_essay_file,
+                                              sample_fact_check_library_file, monkeypatch):
+        """Adding to the library should start a fresh cache"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+
+        check_draft(str(sample_essay_file), strict=True)
+        add_to_library("Investment reached $50,000,000 in Q4 2024", "https://example.com/q4")
+        report = check_draft(str(sample_essay_file), strict=True)
+
+        assert report['cache_hits'] == 0
+
+        with open(claim_cache_path(), 'r') as f:
+            cache = json.load(f)
+        assert cache['library_version'] == fact_check.library_version()
+
+
+class TestProfiling:
+    """Test the --profile timing breakdown"""
+
+    def test_check_draft_profile_breakdown(self, sample_essay_file, sample_fact_check_library_file,
+                                           monkeypatch):
+        """Should record stage timings and counters in the report"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+
+        report = check_draft(str(sample_essay_file), strict=True, profile=True)
+
+        profile = report['profile']
+        for stage in ('read', 'extract', 'library_load', 'match', 'total'):
+            assert profile['stages_ms'][stage] >= 0, f"Should time the {stage} stage"
+        assert profile['counts']['claims_extracted'] == report['total_claims']
+        assert profile['counts']['library_entries_scanned'] > 0
+        assert profile['counts']['cache_hits'] == 0
+        json.dumps(report)  # Profile must be serializable with the report
+
+    def test_profile_counts_cache_hits(self, sample_essay_file, sample_fact_check_library_file,
+                                       monkeypatch):
+        """Cached claims should not scan the library"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+
+        check_draft(str(sample_essay_file), strict=True)
+        report = check_draft(str(sample_essay_file), strict=True, profile=True)
+
+        counts = report['profile']['counts']
+        assert counts['cache_hits'] == report['total_claims']
+        assert counts.get('library_entries_scanned', 0) == 0
+
+    def test_profile_disabled_by_default(self, sample_essay_file, sample_fact_check_library_file,
+                                         monkeypatch):
+        """Reports should not carry profile data unless requested"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+
+        report = check_draft(str(sample_essay_file), strict=True)
+
+        assert 'profile' not in report
+
+
+class TestLogging:
+    """Test structured logging output"""
+
+    @pytest.fixture(autouse=True)
+    def restore_logger(self):
+        """Leave the fact_check logger unconfigured after each test"""
+        import fact_check
+        yield
+        for handler in list(fact_check.logger.handlers):
+            fact_check.logger.removeHandler(handler)
+            handler.close()
+        fact_check.logger.addHandler(logging.NullHandler())
+        fact_check.logger.setLevel(logging.NOTSET)
+
+    def test_info_level_hides_per_claim_lines(self, sample_essay_file,
+                                              sample_fact_check_library_file, monkeypatch):
+        """Batch (INFO) output should keep summaries but drop per-claim lines"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+        stream = io.StringIO()
+        configure_logging('INFO', stream=stream)
+
+        check_draft(str(sample_essay_file), strict=True)
+
+        output = stream.getvalue()
+        assert 'FACT-CHECK SUMMARY' in output
+        assert 'Verifying claim' not in output
+
+    def test_debug_level_shows_per_claim_lines(self, sample_essay_file,
+                                               sample_fact_check_library_file, monkeypatch):
+        """DEBUG output should include each claim"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+        stream = io.StringIO()
+        configure_logging('DEBUG', stream=stream)
+
+        check_draft(str(sample_essay_file), strict=True)
+
+        assert 'Verifying claim' in stream.getvalue()
+
+    def test_json_sink_records_events(self, temp_data_dir, sample_essay_file,
+                                      sample_fact_check_library_file, monkeypatch):
+        """JSON sink should write one parseable event per line"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+        log_path = temp_data_dir / "fact_check.jsonl"
+        configure_logging('DEBUG', json_path=str(log_path), stream=io.StringIO())
+
+        report = check_draft(str(sample_essay_file), strict=True)
+
+        records = [json.loads(line) for line in log_path.read_text().splitlines()]
+        events = [r['event'] for r in records]
+        assert 'draft_start' in events
+        assert events.count('verify') == report['total_claims']
+
+        summary = next(r for r in records if r['event'] == 'draft_summary')
+        assert summary['level'] == 'INFO'
+        assert summary['verified'] == report['verified']
+        assert summary['failed'] == report['failed']
+
+    def test_json_sink_keeps_reserved_keys(self, temp_data_dir):
+        """Event fields named like record keys should not overwrite them"""
+        import logging
+        import fact_check
+        log_path = temp_data_dir / "fact_check.jsonl"
+        configure_logging('INFO', json_path=str(log_path), stream=io.StringIO())
+
+        fact_check._log(logging.WARNING, "Source check failed", event='checked',
+                        message='HTTP 503', level='bogus')
+
+        entry = json.loads(log_path.read_text())
+        assert entry['message'] == "Source check failed"
+        assert entry['level'] == 'WARNING'
+        assert entry['event'] == 'checked'
+        assert entry['fields'] == {'message': 'HTTP 503', 'level': 'bogus'}
+
+
+class TestSweepLibrary:
+    """Test the staleness sweep over library entries"""
+
+    def test_find_stale_claims_by_age(self, sample_fact_check_library):
+        """Should flag only entries older than the cutoff"""
+        claims = sample_fact_check_library['verified_claims']
+        stale = find_stale_claims(claims, max_age_days=30, now=datetime(2025, 1, 20))
+
+        # 2024-12-15 is 36 days old, 2025-01-10 is 10 days old
+        assert [s['claim'] for s in stale] == [claims[0]['claim']]
+        assert stale[0]['age_days'] == 36
+
+    def test_find_stale_claims_missing_date(self):
+        """Entries without a usable date should be treated as stale"""
+        claims = [{'claim': 'Undated claim', 'source_url': 'https://example.com'}]
+        stale = find_stale_claims(claims, max_age_days=30)
+
+        assert len(stale) == 1
+        assert stale[0]['age_days'] is None
+
+    def test_sweep_records_results(self, temp_data_dir, sample_fact_check_library_file,
+                                   monkeypatch):
+        """Should check every stale source and record the results"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+        monkeypatch.setattr(
+            fact_check, 'check_source_url',
+            lambda url, timeout: {
+                'status': 'broken' if 'gartner' in url else 'ok', 'http_status': 200
+            }
+        )
+        checkpoint = temp_data_dir / "sweep.jsonl"
+
+        summary = sweep_library(max_age_days=0, workers=2, checkpoint_path=checkpoint)
+
+        assert summary['stale'] == 2
+        assert summary['ok'] == 1
+        assert summary['broken'] == 1
+        lines = [json.loads(line) for line in checkpoint.read_text().splitlines()]
+        assert lines[0]['max_age_days'] == 0
+        assert 'completed' in lines[-1]
+
+    def test_sweep_resumes_from_checkpoint(self, temp_data_dir, sample_fact_check_library_file,
+                                           sample_fact_check_library, monkeypatch):
+        """An interrupted sweep should skip entries it already checked"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+        checked = []
+        monkeypatch.setattr(
+            fact_check, 'check_source_url',
+            lambda url, timeout: checked.append(url) or {'status': 'ok', 'http_status': 200}
+        )
+
+        first = sample_fact_check_library['verified_claims'][0]
+        checkpoint = temp_data_dir / "sweep.jsonl"
+        checkpoint.write_text(
+            json.dumps({'started': '2025-01-20T00:00:00', 'max_age_days': 0}) + "\n" +
+            json.dumps({'key': claim_key(first), 'claim': first['claim'],
+                        'source_url': first['source_url'], 'status': 'ok',
+                        'http_status': 200}) + "\n"
+        )
+
+        summary = sweep_library(max_age_days=0, workers=2, checkpoint_path=checkpoint)
+
+        assert checked == ["https://gartner.com/report"], "Should only check the remaining entry"
+        assert summary['resumed'] == 1
+        assert summary['ok'] == 2
+
+    def test_resume_after_torn_line_keeps_checkpoint_valid(self, temp_data_dir,
+                                                           sample_fact_check_library_file,
+                                                           sample_fact_check_library, monkeypatch):
+        """Records appended after a torn final line should start on their own line"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+        monkeypatch.setattr(
+            fact_check, 'check_source_url',
+            lambda url, timeout: {'status': 'ok', 'http_status': 200}
+        )
+
+        first = sample_fact_check_library['verified_claims'][0]
+        checkpoint = temp_data_dir / "sweep.jsonl"
+        checkpoint.write_text(
+            json.dumps({'started': '2025-01-20T00:00:00', 'max_age_days': 0}) + "\n" +
+            json.dumps({'key': claim_key(first), 'claim': first['claim'],
+                        'source_url': first['source_url'], 'status': 'ok',
+                        'http_status': 200}) + "\n" +
+            '{"key": "torn'
+        )
+
+        sweep_library(max_age_days=0, checkpoint_path=checkpoint)
+
+        lines = [json.loads(line) for line in checkpoint.read_text().splitlines()]
+        assert len(lines) == 4
+        assert 'completed' in lines[-1]
+
+    def test_completed_checkpoint_starts_fresh(self, temp_data_dir, sample_fact_check_library_file,
+                                               monkeypatch):
+        """A finished sweep should not be resumed"""
+        import fact_check
+        monkeypatch.setattr(fact_check, 'FACT_CHECK_LIBRARY', sample_fact_check_library_file)
+        monkeypatch.setattr(
+            fact_check, 'check_source_url',
+            lambda url, timeout: {'status': 'ok', 'http_status': 200}
+        )
+        checkpoint = temp_data_dir / "sweep.jsonl"
+
+        sweep_library(max_age_days=0, checkpoint_path=checkpoint)
+        summary = sweep_library(max_age_days=0, checkpoint_path=checkpoint)
+
+        assert summary['resumed'] == 0
+        assert summary['ok'] == 2
+
+
 @pytest.mark.integration
 class TestFactCheckIntegration:
     """Integration tests for fact-checking workflow"""
@@ -2,14 +2,19 @@
 Unit tests for social_repurpose.py
 
 Tests social media content generation including:
-- Essay parsing and key point extraction
+- Essay parsing, lazy loading and key point extraction
 - Twitter thread generation with character limits
 - LinkedIn post optimization
 - Newsletter teaser creation
+- Template compilation, rendering and measurement
 - Content saving and organization
+- Batch repurposing across essays
+- Output-format registry
+- Social posts index and status
 """
 import pytest
 import json
+import re
 from pathlib import Path
 import sys
 
@@ -18,11 +23,34 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
 
 from social_repurpose import (
     read_essay,
+    parse_essay,
+    rank_key_points,
+    Essay,
     generate_twitter_thread,
     generate_linkedin_post,
     generate_newsletter_teaser,
     save_social_content,
+    repurpose_essay,
+    repurpose_essays,
+    essay_content_hash,
+    is_up_to_date,
+    GENERATOR_VERSION,
     TWITTER_MAX_LENGTH,
+    TWITTER_THREAD_MAX,
+    tweet_weight,
+    pack_tweets,
+    iter_graphemes,
+    Template,
+    TemplateError,
+    load_template,
+    measure_formats,
+    FORMATS,
+    register_format,
+    generate_formats,
+    format_inputs,
+    load_social_index,
+    rebuild_social_index,
+    social_status,
     LINKEDIN_OPTIMAL,
     SOCIAL_DIR
 )
@@ -109,6 +137,135 @@ class TestReadEssay:
         assert essay['word_count'] == 11
 
 
+class TestParseEssay:
+    """Test the single-pass markdown parser"""
+
+    def test_parse_essay_headings_and_links(self, sample_essay_content):
+        """Should collect headings and inline links in the same pass"""
+        essay = parse_essay(sample_essay_content)
+
+        assert essay['headings'][0] == {'level': 1, 'text': 'The Future of AI Regulation'}
+        assert {'level': 2, 'text': 'Key Insights'} in essay['headings']
+        assert essay['links'] == [
+            {'text': 'McKinsey 2024', 'url': 'https://example.com/mckinsey-report'},
+            {'text': "Gartner's 2024 report", 'url': 'https://gartner.com/report'}
+        ]
+
+    def test_parse_essay_ignores_non_markers(self):
+        """Hashtags and horizontal rules are not headings or bullets"""
+        essay = parse_essay("#hashtag line\n\n---\n\n# Real Title\n\n-not a bullet\n- Bullet")
+
+        assert essay['title'] == "Real Title"
+        assert essay['key_points'] == ["Bullet"]
+        assert essay['hook'] == "---"
+
+    def test_parse_essay_limits_key_points(self):
+        """Should keep at most max_key_points bullets"""
+        content = "# T\n\n" + "\n".join(f"- Point {i}" for i in range(8))
+
+        assert len(parse_essay(content)['key_points']) == 5
+        assert len(parse_essay(content, max_key_points=8)['key_points']) == 8
+
+    @pytest.mark.slow
+    def test_parse_essay_matches_regex_parsing_on_archive(self):
+        """Single-pass results should match the regex-based extraction on real essays
+
+        Key points are ranked, so they only need to be bullets kept in
+        document order.
+        """
+        essays = sorted((Path(__file__).parent.parent.parent / "content" / "essays").glob("*.md"))
+        assert essays, "Archive essays should exist"
+
+        for path in essays:
+            content = path.read_text()
+            essay = parse_essay(content)
+
+            title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+            paragraphs = [p.strip() for p in content.split('\n\n')
+                          if p.strip() and not p.startswith('#')]
+
+            assert essay['title'] == title_match.group(1), path.name
+            bullets = re.findall(r'^[-*]\s+(.+)$', content, re.MULTILINE)
+            positions = [bullets.index(point) for point in essay['key_points']]
+            assert len(positions) == min(5, len(bullets)), path.name
+            assert positions == sorted(positions), path.name
+            assert essay['hook'] == paragraphs[0], path.name
+            assert essay['word_count'] == len(content.split()), path.name
+
+
+class TestRankKeyPoints:
+    """Test key-point ranking"""
+
+    def test_short_lists_are_kept_as_is(self):
+        """Essays with k or fewer bullets keep all of them in order"""
+        assert rank_key_points(["b", "a"], "Title", "- b\n- a", k=5) == ["b", "a"]
+
+    def test_title_relevant_bullets_beat_setup(self):
+        """Bullets about the title's subject should outrank early setup bullets"""
+        bullets = [f"Background item {i}" for i in range(6)] + [
+            "Postgres connection pooling cuts database connections from thousands to a hundred"
+        ]
+        content = "# Postgres Connection Pooling\n\n" + "\n".join(f"- {b}" for b in bullets)
+
+        ranked = rank_key_points(bullets, "Postgres Connection Pooling", content, k=3)
+
+        assert len(ranked) == 3
+        assert bullets[-1] in ranked
+
+    def test_selected_points_keep_document_order(self):
+        """The top k should be returned in the order they appear"""
+        bullets = [f"Point {i} about caching and latency in production systems" for i in range(10)]
+        content = "\n".join(f"- {b}" for b in bullets)
+
+        ranked = rank_key_points(bullets, "Caching", content, k=4)
+
+        assert ranked == sorted(ranked, key=bullets.index)
+
+
+class TestLazyEssay:
+    """Test lazy essay loading"""
+
+    def test_head_fields_do_not_parse_body(self, sample_essay_file):
+        """Title and hook should not trigger a full parse"""
+        essay = read_essay(str(sample_essay_file))
+
+        assert essay['title'] == "The Future of AI Regulation"
+        assert essay['hook'].startswith("The AI industry")
+        assert 'key_points' not in essay._fields, "Body fields should stay unparsed"
+        assert len(essay['key_points']) == 3
+
+    def test_head_fields_match_full_parse(self, temp_data_dir):
+        """Streamed head fields should match a full parse of the same essay"""
+        essay_path = temp_data_dir / "long.md"
+        bullets = "\n".join(f"- Point {i}" for i in range(8))
+        essay_path.write_text(f"# Title\n\nHook paragraph.\n\n{bullets}\n\n" + "Body text.\n" * 500)
+
+        essay = Essay(essay_path)
+        parsed = parse_essay(essay_path.read_text())
+
+        assert [essay[k] for k in Essay.HEAD_FIELDS] == [parsed[k] for k in Essay.HEAD_FIELDS]
+        assert len(essay['key_points']) == 5
+
+    def test_body_fields_and_content(self, sample_essay_file, sample_essay_content):
+        """Body fields parse on demand and content is read, not retained"""
+        essay = read_essay(str(sample_essay_file))
+
+        assert essay['word_count'] == len(sample_essay_content.split())
+        assert len(essay['links']) == 2
+        assert essay['content'] == sample_essay_content
+        assert 'content' not in essay._fields, "Full body should not be kept"
+
+    def test_essay_behaves_like_mapping(self, sample_essay_file):
+        """Essay should expose the same keys as the parsed dict"""
+        essay = read_essay(str(sample_essay_file))
+
+        assert set(essay) == {
+            'title', 'hook', 'key_points', 'headings', 'links', 'word_count', 'content'
+        }
+        assert dict(essay)['title'] == essay['title']
+        assert essay.get('missing') is None
+
+
 class TestGenerateTwitterThread:
     """Test Twitter thread generation"""
 
@@ -213,6 +370,133 @@ class TestGenerateTwitterThread:
         assert len(thread) >= 3
 
 
+class TestTweetPacking:
+    """Test weighted tweet packing"""
+
+    def test_tweet_weight_counts_wide_characters_double(self):
+        """Latin text counts 1 per character, CJK and emoji count 2"""
+        assert tweet_weight("hello") == 5
+        assert tweet_weight("日本") == 4
+        assert tweet_weight("🧵") == 2
+
+    def test_tweet_weight_counts_emoji_sequences_once(self):
+        """Skin tones and ZWJ sequences should weigh as a single emoji"""
+        assert tweet_weight("👍🏽") == 2
+        assert tweet_weight("👩\u200d💻") == 2
+        assert list(iter_graphemes("e\u0301x")) == ["e\u0301", "x"]
+
+    def test_tweet_weight_counts_urls_as_fixed_length(self):
+        """URLs should weigh 23 regardless of their length"""
+        url = "https://example.com/" + "a" * 100
+        assert tweet_weight(f"see {url}") == 4 + 23
+
+    def test_pack_tweets_breaks_on_word_boundaries(self):
+        """Packed tweets should never split a word that fits"""
+        text = " ".join(f"word{i}" for i in range(200))
+
+        tweets = pack_tweets(text, limit=50)
+
+        assert " ".join(tweets) == text
+        assert all(tweet_weight(t) <= 50 for t in tweets)
+
+    def test_pack_tweets_splits_oversized_words(self):
+        """A single word heavier than the limit should be split"""
+        tweets = pack_tweets("x" * 25, limit=10)
+
+        assert tweets == ["x" * 10, "x" * 10, "x" * 5]
+
+    def test_long_essay_fits_thread_maximum(self):
+        """Long hooks and points should be packed, not dropped, within the thread maximum"""
+        essay = {
+            'title': 'Long Essay',
+            'hook': "An opening sentence with plenty of words. " * 100,
+            'key_points': [f"Point {i} " + "detail " * 60 for i in range(5)]
+        }
+
+        thread = generate_twitter_thread(essay)
+
+        assert len(thread) <= TWITTER_THREAD_MAX
+        assert all(tweet_weight(t) <= TWITTER_MAX_LENGTH for t in thread)
+        assert any(t.startswith("1/ ") for t in thread), "Key points should survive a long hook"
+
+
+class TestTemplates:
+    """Test compiled social templates"""
+
+    def test_render_variables_blocks_and_filters(self):
+        """Variables, filters, if and each blocks should render"""
+        template = Template(
+            "{{title|limit:4}}\n{{#if points}}\nPoints:\n"
+            "{{#each points|limit:2}}\n- {{.}}\n{{/each}}\n{{/if}}\nEnd"
+        )
+
+        rendered = template.render({'title': 'Headline', 'points': ['a', 'b', 'c']})
+        assert rendered == "Head\nPoints:\n- a\n- b\nEnd"
+        assert template.render({'title': 'Headline', 'points': []}) == "Head\nEnd"
+
+    def test_measure_matches_rendered_size(self, sample_essay_file):
+        """measure() should agree with the rendered text for len and tweet weight"""
+        essay = read_essay(str(sample_essay_file))
+        linkedin = load_template('linkedin')
+        teaser = load_template('teaser')
+
+        assert linkedin.measure(essay) == len(linkedin.render(essay))
+        assert teaser.measure(essay, tweet_weight) == tweet_weight(teaser.render(essay))
+        assert measure_formats(essay)['linkedin'] == {
+            'size': len(generate_linkedin_post(essay)), 'limit': LINKEDIN_OPTIMAL
+        }
+
+    def test_unclosed_block_raises(self):
+        """Malformed templates should fail at compile time"""
+        with pytest.raises(TemplateError):
+            Template("{{#if hook}}never closed")
+        with pytest.raises(TemplateError):
+            Template("{{name|shout}}")
+
+    def test_compiled_template_is_cached_until_file_changes(self, temp_data_dir):
+        """Templates compile once and recompile after an edit"""
+        import os
+        path = temp_data_dir / "greeting.txt"
+        path.write_text("Hello {{name}}\n")
+
+        first = load_template('greeting', temp_data_dir)
+        assert load_template('greeting', temp_data_dir) is first
+
+        path.write_text("Hi {{name}}\n")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+        assert load_template('greeting', temp_data_dir).render({'name': 'Ada'}) == "Hi Ada"
+
+    def test_template_edit_invalidates_saved_posts(self, sample_essay_file, temp_data_dir,
+                                                    monkeypatch):
+        """Changing a template should make saved posts stale"""
+        import social_repurpose
+        templates_dir = temp_data_dir / "templates"
+        templates_dir.mkdir()
+        for path in social_repurpose.TEMPLATES_DIR.glob("*.txt"):
+            (templates_dir / path.name).write_text(path.read_text())
+        monkeypatch.setattr(social_repurpose, 'TEMPLATES_DIR', templates_dir)
+
+        repurpose_essay(str(sample_essay_file), ['teaser'], temp_data_dir)
+        source_hash = essay_content_hash(sample_essay_file)
+        assert is_up_to_date("sample_essay", source_hash, ['teaser'], temp_data_dir)
+
+        (templates_dir / "teaser.txt").write_text("{{title}}\n")
+        assert not is_up_to_date("sample_essay", source_hash, ['teaser'], temp_data_dir)
+
+    def test_batch_hashes_templates_once(self, sample_essay_file, temp_data_dir, monkeypatch):
+        """A batch run should compute the templates digest once, not per essay"""
+        import social_repurpose
+        calls = []
+        digest = social_repurpose.templates_digest
+        monkeypatch.setattr(social_repurpose, 'templates_digest',
+                            lambda *args: calls.append(args) or digest(*args))
+
+        repurpose_essays([sample_essay_file] * 3, ['teaser'], workers=1, social_dir=temp_data_dir)
+        repurpose_essays([sample_essay_file], ['teaser'], workers=1, social_dir=temp_data_dir)
+
+        assert len(calls) == 2
+
+
 class TestGenerateLinkedInPost:
     """Test LinkedIn post generation"""
 
@@ -522,6 +806,298 @@ class TestSaveSocialContent:
         finally:
             social_repurpose.SOCIAL_DIR = original_social_dir
 
+    def test_save_social_content_replaces_folder_atomically(self, temp_data_dir):
+        """Resaving should carry over untouched files and leave no staging folders"""
+        save_social_content("essay", {'twitter': ["Old tweet"], 'linkedin': "Old post"},
+                            temp_data_dir)
+        save_social_content("essay", {'twitter': ["New tweet"]}, temp_data_dir)
+
+        essay_folder = temp_data_dir / "essay"
+        assert "New tweet" in (essay_folder / "twitter.txt").read_text()
+        assert (essay_folder / "linkedin.txt").read_text() == "Old post"
+        assert sorted(p.name for p in temp_data_dir.iterdir() if p.is_dir()) == ["essay"]
+
+    def test_save_social_content_failure_keeps_previous_folder(self, temp_data_dir):
+        """A failed save should leave the previous outputs untouched"""
+        save_social_content("essay", {'teaser': "Old teaser"}, temp_data_dir)
+
+        with pytest.raises(TypeError):
+            save_social_content("essay", {'teaser': "New teaser", 'broken': 42}, temp_data_dir)
+
+        assert (temp_data_dir / "essay" / "teaser.txt").read_text() == "Old teaser"
+        assert sorted(p.name for p in temp_data_dir.iterdir() if p.is_dir()) == ["essay"]
+
+    def test_save_recovers_folder_left_by_crashed_swap(self, temp_data_dir):
+        """A folder left renamed aside by a crash should be restored, not orphaned"""
+        save_social_content("essay", {'teaser': "Old teaser", 'linkedin': "Old post"},
+                            temp_data_dir)
+        (temp_data_dir / "essay").rename(temp_data_dir / ".essay.old-deadbeef")
+
+        save_social_content("essay", {'teaser': "New teaser"}, temp_data_dir)
+
+        assert (temp_data_dir / "essay" / "teaser.txt").read_text() == "New teaser"
+        assert (temp_data_dir / "essay" / "linkedin.txt").read_text() == "Old post"
+        assert sorted(p.name for p in temp_data_dir.iterdir() if p.is_dir()) == ["essay"]
+
+
+class TestRepurposeEssays:
+    """Test batch repurposing of many essays"""
+
+    def _write_essays(self, directory, content, count):
+        paths = []
+        for i in range(count):
+            path = directory / f"essay_{i}.md"
+            path.write_text(content.replace("The Future of AI Regulation", f"Essay {i}"))
+            paths.append(path)
+        return paths
+
+    def test_repurpose_essay_generates_and_saves(self, sample_essay_file, temp_data_dir):
+        """Should generate every requested format for one essay"""
+        output_dir = temp_data_dir / "social"
+
+        summary = repurpose_essay(str(sample_essay_file), ['twitter', 'teaser'], output_dir)
+
+        assert summary['status'] == 'generated'
+        assert summary['formats'] == ['twitter', 'teaser']
+        assert (output_dir / "sample_essay" / "twitter.txt").exists()
+        assert not (output_dir / "sample_essay" / "linkedin.txt").exists()
+
+    def test_repurpose_essay_missing_file(self, temp_data_dir):
+        """Missing essays should be reported, not raised"""
+        summary = repurpose_essay("/nonexistent/essay.md", ['twitter'], temp_data_dir)
+
+        assert summary['status'] == 'error'
+        assert summary['essay'] == 'essay'
+
+    def test_repurpose_essays_in_parallel(self, temp_data_dir, sample_essay_content):
+        """Should process every essay with a worker pool"""
+        essays_dir = temp_data_dir / "essays"
+        essays_dir.mkdir()
+        paths = self._write_essays(essays_dir, sample_essay_content, 3)
+        output_dir = temp_data_dir / "social"
+
+        summaries = repurpose_essays(paths, ['twitter', 'linkedin', 'teaser'], workers=2,
+                                     social_dir=output_dir)
+
+        assert [s['essay'] for s in summaries] == ['essay_0', 'essay_1', 'essay_2']
+        assert all(s['status'] == 'generated' for s in summaries)
+        assert summaries[1]['title'] == "Essay 1"
+        for path in paths:
+            assert (output_dir / path.stem / "metadata.json").exists()
+
+    def test_repurpose_essays_inline_with_one_worker(self, temp_data_dir, sample_essay_content):
+        """A single worker should run without a process pool"""
+        paths = self._write_essays(temp_data_dir, sample_essay_content, 2)
+        output_dir = temp_data_dir / "social"
+
+        summaries = repurpose_essays(paths, ['teaser'], workers=1, social_dir=output_dir)
+
+        assert all(s['status'] == 'generated' for s in summaries)
+        assert (output_dir / "essay_1" / "teaser.txt").exists()
+
+
+class TestFormatRegistry:
+    """Test the pluggable output-format registry"""
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        """Restore FORMATS after a test registers its own formats"""
+        import social_repurpose
+        monkeypatch.setattr(social_repurpose, 'FORMATS', dict(FORMATS))
+        return social_repurpose.FORMATS
+
+    def test_builtin_formats_are_registered(self):
+        """twitter, linkedin and teaser should declare inputs and cost"""
+        assert {'twitter', 'linkedin', 'teaser'} <= set(FORMATS)
+        assert FORMATS['teaser']['inputs'] == ('title', 'hook')
+        assert FORMATS['twitter']['cost'] > FORMATS['teaser']['cost']
+
+    def test_registered_format_is_generated(self, registry):
+        """A newly registered format should be available without other changes"""
+        @register_format('mastodon', inputs=('title',))
+        def generate_mastodon(essay):
+            return f"🐘 {essay['title']}"
+
+        content = generate_formats({'title': 'Test', 'hook': '', 'key_points': []}, ['mastodon'])
+
+        assert content == {'mastodon': "🐘 Test"}
+        assert format_inputs(['teaser', 'mastodon']) == ['title', 'hook']
+
+    def test_default_formats_include_late_registrations(self, registry, sample_essay_file,
+                                                         temp_data_dir):
+        """Formats registered after import should be part of the default set"""
+        @register_format('mastodon', inputs=('title',))
+        def generate_mastodon(essay):
+            return essay['title']
+
+        summary = repurpose_essay(str(sample_essay_file), social_dir=temp_data_dir)
+
+        assert 'mastodon' in summary['formats']
+        assert (temp_data_dir / "sample_essay" / "mastodon.txt").exists()
+
+    def test_batch_ships_only_declared_inputs(self, registry, sample_essay_file, temp_data_dir):
+        """Generators should receive only the fields they declare"""
+        seen = []
+
+        @register_format('probe', inputs=('title',))
+        def generate_probe(essay):
+            seen.append(sorted(essay))
+            return "probe"
+
+        summaries = repurpose_essays([sample_essay_file], ['probe'], workers=1,
+                                     social_dir=temp_data_dir)
+
+        assert summaries[0]['status'] == 'generated'
+        assert seen == [['title']]
+        assert (temp_data_dir / "sample_essay" / "probe.txt").read_text() == "probe"
+
+    def test_failing_format_marks_essay_as_error(self, registry, sample_essay_file, temp_data_dir):
+        """A generator error should fail its essay without saving partial output"""
+        @register_format('broken')
+        def generate_broken(essay):
+            raise RuntimeError("boom")
+
+        summaries = repurpose_essays([sample_essay_file], ['teaser', 'broken'], workers=1,
+                                     social_dir=temp_data_dir)
+
+        assert summaries[0]['status'] == 'error'
+        assert summaries[0]['error'] == "boom"
+        assert not (temp_data_dir / "sample_essay").exists()
+
+    def test_unexpected_error_is_logged(self, registry, sample_essay_file, temp_data_dir, caplog):
+        """Only unexpected generator errors should log a traceback"""
+        @register_format('invalid')
+        def generate_invalid(essay):
+            raise ValueError("bad input")
+
+        @register_format('buggy')
+        def generate_buggy(essay):
+            raise RuntimeError("boom")
+
+        repurpose_essays([sample_essay_file], ['invalid'], workers=1, social_dir=temp_data_dir)
+        assert not caplog.records
+
+        repurpose_essays([sample_essay_file], ['buggy'], workers=1, social_dir=temp_data_dir)
+        assert caplog.records[0].exc_info[0] is RuntimeError
+
+
+class TestSocialIndex:
+    """Test the social posts manifest index"""
+
+    def test_save_updates_index(self, temp_data_dir):
+        """Each save should record formats, hash and character counts"""
+        save_social_content("essay", {'linkedin': "Post", 'teaser': "Teaser!"}, temp_data_dir,
+                            source_hash="abc")
+
+        entry = load_social_index(temp_data_dir)['essays']['essay']
+        assert entry['formats'] == ['linkedin', 'teaser']
+        assert entry['source_hash'] == "abc"
+        assert entry['chars'] == {'linkedin': 4, 'teaser': 7}
+        assert entry['generated_date']
+
+    def test_batch_run_records_every_essay(self, temp_data_dir, sample_essay_content):
+        """A batch run should add all generated essays to the index"""
+        paths = []
+        for i in range(3):
+            path = temp_data_dir / f"essay_{i}.md"
+            path.write_text(sample_essay_content)
+            paths.append(path)
+        output_dir = temp_data_dir / "social"
+
+        repurpose_essays(paths, ['teaser'], workers=1, social_dir=output_dir)
+
+        assert sorted(load_social_index(output_dir)['essays']) == ['essay_0', 'essay_1', 'essay_2']
+
+    def test_up_to_date_check_uses_index(self, sample_essay_file, temp_data_dir):
+        """Skipping should work from the index alone"""
+        repurpose_essay(str(sample_essay_file), ['teaser'], temp_data_dir)
+        (temp_data_dir / "sample_essay" / "metadata.json").unlink()
+        index = load_social_index(temp_data_dir)
+
+        assert is_up_to_date("sample_essay", essay_content_hash(sample_essay_file), ['teaser'],
+                             temp_data_dir, index)
+
+    def test_rebuild_index_from_metadata(self, temp_data_dir):
+        """Output trees without an index should be indexed from metadata files"""
+        save_social_content("essay", {'teaser': "Teaser!"}, temp_data_dir, update_index=False)
+
+        index = rebuild_social_index(temp_data_dir)
+
+        assert index['essays']['essay']['chars'] == {'teaser': 7}
+        assert load_social_index(temp_data_dir)['essays'].keys() == {'essay'}
+
+    def test_social_status_states(self, sample_essay_file, temp_data_dir):
+        """Status should flag current, stale, ungenerated and orphaned essays"""
+        essays_dir = sample_essay_file.parent
+        output_dir = temp_data_dir / "social"
+        (essays_dir / "fresh.md").write_text("# Fresh\n")
+        repurpose_essay(str(sample_essay_file), ['teaser'], output_dir)
+        save_social_content("orphan", {'teaser': "Gone"}, output_dir)
+
+        states = {row['essay']: row['state'] for row in social_status(essays_dir, output_dir)}
+        assert states == {
+            'sample_essay': 'current', 'fresh': 'not generated', 'orphan': 'source missing'
+        }
+
+        sample_essay_file.write_text(sample_essay_file.read_text() + "\nMore.\n")
+        states = {row['essay']: row['state'] for row in social_status(essays_dir, output_dir)}
+        assert states['sample_essay'] == 'stale'
+
+
+class TestIncrementalRegeneration:
+    """Test skipping essays whose content has not changed"""
+
+    def test_metadata_records_hash_and_version(self, sample_essay_file, temp_data_dir):
+        """Saved metadata should identify the source content and generator"""
+        repurpose_essay(str(sample_essay_file), ['teaser'], temp_data_dir)
+
+        with open(temp_data_dir / "sample_essay" / "metadata.json", 'r') as f:
+            metadata = json.load(f)
+
+        assert metadata['source_hash'] == essay_content_hash(sample_essay_file)
+        assert metadata['generator_version'] == GENERATOR_VERSION
+
+    def test_unchanged_essay_is_skipped(self, sample_essay_file, temp_data_dir):
+        """A second batch run should skip the unchanged essay"""
+        first = repurpose_essays([sample_essay_file], ['twitter'], workers=1,
+                                 social_dir=temp_data_dir)
+        second = repurpose_essays([sample_essay_file], ['twitter'], workers=1,
+                                  social_dir=temp_data_dir)
+
+        assert first[0]['status'] == 'generated'
+        assert second[0]['status'] == 'skipped'
+
+    def test_changed_essay_is_regenerated(self, sample_essay_file, temp_data_dir):
+        """Editing the essay should invalidate its posts"""
+        repurpose_essays([sample_essay_file], ['twitter'], workers=1, social_dir=temp_data_dir)
+        sample_essay_file.write_text(sample_essay_file.read_text() + "\n- A new insight\n")
+
+        summary = repurpose_essays([sample_essay_file], ['twitter'], workers=1,
+                                   social_dir=temp_data_dir)
+
+        assert summary[0]['status'] == 'generated'
+
+    def test_new_format_or_generator_version_regenerates(self, sample_essay_file, temp_data_dir,
+                                                         monkeypatch):
+        """Missing formats or a bumped generator version should regenerate"""
+        import social_repurpose
+        repurpose_essay(str(sample_essay_file), ['twitter'], temp_data_dir)
+        source_hash = essay_content_hash(sample_essay_file)
+
+        assert is_up_to_date("sample_essay", source_hash, ['twitter'], temp_data_dir)
+        assert not is_up_to_date("sample_essay", source_hash, ['twitter', 'teaser'], temp_data_dir)
+
+        monkeypatch.setattr(social_repurpose, 'GENERATOR_VERSION', "next")
+        assert not is_up_to_date("sample_essay", source_hash, ['twitter'], temp_data_dir)
+
+    def test_force_regenerates(self, sample_essay_file, temp_data_dir):
+        """force=True should ignore matching hashes"""
+        repurpose_essays([sample_essay_file], ['teaser'], workers=1, social_dir=temp_data_dir)
+        summary = repurpose_essays([sample_essay_file], ['teaser'], workers=1,
+                                   social_dir=temp_data_dir, force=True)
+
+        assert summary[0]['status'] == 'generated'
+
 
 @pytest.mark.integration
 class TestSocialRepurposeIntegration: